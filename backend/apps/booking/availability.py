@@ -0,0 +1,165 @@
+"""
+Slot availability engine for booking requests.
+
+Occupancy is indexed per day as a sorted list of merged (start, end) minute
+intervals built from pending/confirmed bookings. Each day's index is cached
+under a per-day version, which the booking signals replace whenever a
+booking on that day changes. A reader that built its index before the
+change therefore stores it under the old version, where it is never read.
+"""
+import time
+from bisect import bisect_right
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.utils import timezone
+
+from .models import BookingDay, BookingRequest
+
+CACHE_KEY_PREFIX = 'booking:occupancy'
+VERSION_KEY_PREFIX = 'booking:occupancy-version'
+CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def _version_key(day):
+    return f'{VERSION_KEY_PREFIX}:{day.isoformat()}'
+
+
+def _cache_key(day, version):
+    return f'{CACHE_KEY_PREFIX}:{day.isoformat()}:{version}'
+
+
+def _get_versions(days):
+    """Return {date: current cache version}, creating versions that are missing."""
+    keys = {_version_key(day): day for day in days}
+    versions = {keys[key]: version for key, version in cache.get_many(list(keys)).items()}
+    for day in days:
+        if day not in versions:
+            version = time.time_ns()
+            # add() so a concurrent invalidation isn't overwritten
+            if not cache.add(_version_key(day), version, None):
+                version = cache.get(_version_key(day), version)
+            versions[day] = version
+    return versions
+
+
+def _to_minutes(slot):
+    """Convert an 'HH:MM' slot into minutes since midnight."""
+    hours, minutes = slot.split(':')
+    return int(hours) * 60 + int(minutes)
+
+
+def _merge(intervals):
+    """Sort and merge overlapping (start, end) intervals."""
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start < merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def _overlaps(intervals, start, end):
+    """Check whether [start, end) intersects any merged interval."""
+    # Merged intervals are disjoint, so their end points are sorted too
+    index = bisect_right([interval_end for _, interval_end in intervals], start)
+    return index < len(intervals) and intervals[index][0] < end
+
+
+def invalidate_days(days):
+    """Invalidate cached occupancy for the given dates by replacing their versions."""
+    version = time.time_ns()
+    keys = {_version_key(day) for day in days if day}
+    if keys:
+        cache.set_many({key: version for key in keys}, None)
+
+
+def build_occupancy(days, exclude=None):
+    """
+    Build {date: merged intervals} straight from the database, bypassing the cache.
+
+    `exclude` is the pk of a booking to leave out, e.g. one being rescheduled.
+    """
+    intervals = {day: [] for day in days}
+    rows = BookingRequest.objects.filter(
+        preferred_date__in=list(intervals),
+        status__in=BookingRequest.ACTIVE_STATUSES,
+    )
+    if exclude is not None:
+        rows = rows.exclude(pk=exclude)
+    rows = rows.order_by().values_list('preferred_date', 'preferred_time', 'service__duration_minutes')
+
+    for day, slot, duration in rows:
+        start = _to_minutes(slot)
+        intervals[day].append((start, start + duration + BookingRequest.BUFFER_MINUTES))
+
+    return {day: _merge(day_intervals) for day, day_intervals in intervals.items()}
+
+
+def get_occupancy(days):
+    """
+    Return {date: merged intervals} for the given dates.
+
+    Cached days are served from the cache; all missing days are built from a
+    single query over pending/confirmed bookings.
+    """
+    days = list(days)
+    # Read the versions before querying so a concurrent invalidation can't be masked
+    versions = _get_versions(days)
+    keys = {_cache_key(day, versions[day]): day for day in days}
+    cached = cache.get_many(list(keys))
+    occupancy = {keys[key]: value for key, value in cached.items()}
+
+    missing = [day for day in days if day not in occupancy]
+    if missing:
+        built = build_occupancy(missing)
+        cache.set_many({_cache_key(day, versions[day]): value for day, value in built.items()}, CACHE_TIMEOUT)
+        occupancy.update(built)
+
+    return occupancy
+
+
+def lock_day(day):
+    """
+    Take a row lock on the BookingDay for a date.
+
+    Must be called inside transaction.atomic(); concurrent bookings for the same
+    date queue on this lock until the holding transaction commits.
+    """
+    BookingDay.objects.get_or_create(date=day)
+    return BookingDay.objects.select_for_update().get(date=day)
+
+
+def is_slot_free(service, day, slot, occupancy=None):
+    """Check whether a service can start at the given slot on the given day."""
+    if occupancy is None:
+        occupancy = get_occupancy([day])[day]
+    start = _to_minutes(slot)
+    end = start + service.duration_minutes + BookingRequest.BUFFER_MINUTES
+    return not _overlaps(occupancy, start, end)
+
+
+def free_slots(service, start_date=None, days=14):
+    """
+    Return free slots for a service over the next `days` days.
+
+    Result is a list of {'date': date, 'slots': ['09:00', ...]} dicts. Slots that
+    have already started today are excluded.
+    """
+    now = timezone.localtime()
+    start_date = start_date or now.date()
+    dates = [start_date + timedelta(days=offset) for offset in range(days)]
+    occupancy = get_occupancy(dates)
+    current_minutes = now.hour * 60 + now.minute
+
+    result = []
+    for day in dates:
+        slots = []
+        for slot, _label in BookingRequest.TIME_SLOTS:
+            if day == now.date() and _to_minutes(slot) <= current_minutes:
+                continue
+            if is_slot_free(service, day, slot, occupancy=occupancy[day]):
+                slots.append(slot)
+        result.append({'date': day, 'slots': slots})
+    return result
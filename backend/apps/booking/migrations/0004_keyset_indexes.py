@@ -0,0 +1,21 @@
+# Generated by Django 4.2.7 on 2026-10-18 09:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('booking', '0003_query_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='bookingrequest',
+            name='booking_created_idx',
+        ),
+        migrations.AddIndex(
+            model_name='bookingrequest',
+            index=models.Index(fields=['-created_at', '-id'], name='booking_keyset_idx'),
+        ),
+    ]
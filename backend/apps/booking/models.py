@@ -1,3 +1,5 @@
+from datetime import time
+
 from django.db import models
 from django.core.validators import RegexValidator
 from apps.services.models import Service
@@ -26,6 +28,9 @@ class BookingRequest(models.Model):
         ('18:00', '6:00 PM'),
     ]
     
+    ACTIVE_STATUSES = ['pending', 'confirmed']
+    BUFFER_MINUTES = 15
+    
     # Customer information
     customer_name = models.CharField(max_length=100, help_text="Customer's full name")
     customer_email = models.EmailField(help_text="Customer's email address")
@@ -53,6 +58,12 @@ class BookingRequest(models.Model):
         ordering = ['-created_at']
         verbose_name = "Booking Request"
         verbose_name_plural = "Booking Requests"
+        indexes = [
+            # Availability lookups by day
+            models.Index(fields=['preferred_date', 'preferred_time'], name='booking_slot_idx'),
+            # Newest first, and the key for the API's keyset pagination
+            models.Index(fields=['-created_at', '-id'], name='booking_keyset_idx'),
+        ]
     
     def __str__(self):
         return f"{self.customer_name} - {self.service.name} on {self.preferred_date}"
@@ -60,15 +71,29 @@ class BookingRequest(models.Model):
     @property
     def total_duration(self):
         """Calculate total appointment duration including buffer time."""
-        return self.service.duration_minutes + 15  # 15 min buffer
+        return self.service.duration_minutes + self.BUFFER_MINUTES
     
     @property
     def estimated_end_time(self):
         """Calculate estimated end time."""
-        from datetime import datetime, timedelta
-        
-        start_time = datetime.strptime(self.preferred_time, '%H:%M').time()
-        start_datetime = datetime.combine(self.preferred_date, start_time)
-        end_datetime = start_datetime + timedelta(minutes=self.total_duration)
-        
-        return end_datetime.time()
+        return self.end_time(self.preferred_time, self.service.duration_minutes)
+    
+    @classmethod
+    def end_time(cls, slot, duration_minutes):
+        """End time of a booking starting at an 'HH:MM' slot, buffer included (wraps past midnight)."""
+        hours, minutes = slot.split(':')
+        end = (int(hours) * 60 + int(minutes) + duration_minutes + cls.BUFFER_MINUTES) % (24 * 60)
+        return time(end // 60, end % 60)
+
+
+class BookingDay(models.Model):
+    """Per-day lock row used to serialize booking creation for a date."""
+    
+    date = models.DateField(unique=True)
+    
+    class Meta:
+        verbose_name = "Booking Day"
+        verbose_name_plural = "Booking Days"
+    
+    def __str__(self):
+        return str(self.date)
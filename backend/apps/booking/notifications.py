@@ -0,0 +1,47 @@
+"""
+Booking emails, queued through the notifications outbox.
+
+Call these inside the transaction that saves the booking so the email is
+only queued if the booking is committed.
+"""
+from apps.notifications.outbox import enqueue_email, enqueue_emails, get_admin_email
+from apps.notifications.rendering import render, render_many
+
+
+def _context(booking):
+    return {
+        'booking': booking,
+        'service': booking.service,
+    }
+
+
+def queue_booking_notification(booking):
+    """Queue the new-booking notification for the business owner."""
+    plain_message, html_message = render('booking_notification', _context(booking))
+    
+    return enqueue_email(
+        subject=f"New Booking Request - {booking.customer_name}",
+        body=plain_message,
+        html_body=html_message,
+        recipients=[get_admin_email()],  # Business owner email
+    )
+
+
+def queue_confirmation_email(booking):
+    """Queue the appointment confirmation for the customer."""
+    return queue_confirmation_emails([booking])[0]
+
+
+def queue_confirmation_emails(bookings):
+    """Queue confirmations for many bookings with a single outbox INSERT."""
+    rendered = render_many('booking_confirmation', [_context(booking) for booking in bookings])
+    
+    return enqueue_emails([
+        {
+            'subject': f"Appointment Confirmed - {booking.service.name}",
+            'body': plain_message,
+            'html_body': html_message,
+            'recipients': [booking.customer_email],
+        }
+        for booking, (plain_message, html_message) in zip(bookings, rendered)
+    ])
@@ -1,9 +1,10 @@
 from rest_framework import serializers
 from .models import BookingRequest
 from apps.services.serializers import ServiceSerializer
+from config.fieldsets import SparseFieldsMixin
 
 
-class BookingRequestSerializer(serializers.ModelSerializer):
+class BookingRequestSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for BookingRequest model."""
     
     service = ServiceSerializer(read_only=True)
@@ -20,6 +21,12 @@ class BookingRequestSerializer(serializers.ModelSerializer):
             'created_at', 'updated_at'
         ]
         read_only_fields = ['id', 'status', 'created_at', 'updated_at']
+        computed_fields = {
+            'total_duration': (['service__duration_minutes'], lambda minutes: minutes + BookingRequest.BUFFER_MINUTES),
+            'estimated_end_time': (['preferred_time', 'service__duration_minutes'], BookingRequest.end_time),
+        }
+        # Sent as the service id in ?fields= responses unless ?expand=service (config.fieldsets)
+        expandable_fields = ['service']
     
     def validate_preferred_date(self, value):
         """Validate that the preferred date is not in the past."""
@@ -34,11 +41,40 @@ class BookingRequestSerializer(serializers.ModelSerializer):
         """Validate booking request data."""
         # Check if service exists and is active
         service_id = data.get('service_id')
-        if service_id:
+        # 0 is not a valid id, but must still be looked up (and rejected)
+        if service_id is not None:
             from apps.services.models import Service
             try:
                 service = Service.objects.get(id=service_id, is_active=True)
             except Service.DoesNotExist:
                 raise serializers.ValidationError("Selected service is not available.")
+            # Keep the instance so the booking view can check the slot without refetching
+            data['service'] = service
+            del data['service_id']
         
         return data
+
+
+class AvailabilityQuerySerializer(serializers.Serializer):
+    """Query parameters for the slot availability endpoint."""
+    
+    service_id = serializers.IntegerField()
+    start = serializers.DateField(required=False)
+    days = serializers.IntegerField(required=False, default=14, min_value=1, max_value=60)
+    
+    def validate_start(self, value):
+        """Validate that the start date is not in the past."""
+        from django.utils import timezone
+        
+        if value < timezone.localdate():
+            raise serializers.ValidationError("Cannot check availability in the past.")
+        return value
+    
+    def validate_service_id(self, value):
+        """Resolve the service, which must exist and be active."""
+        from apps.services.models import Service
+        
+        try:
+            return Service.objects.get(id=value, is_active=True)
+        except Service.DoesNotExist:
+            raise serializers.ValidationError("Selected service is not available.")
@@ -0,0 +1,29 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from .availability import invalidate_days
+from .models import BookingRequest
+
+
+@receiver(post_init, sender=BookingRequest)
+def remember_preferred_date(sender, instance, **kwargs):
+    """Keep the loaded date so a rescheduled booking also frees its old day."""
+    # Read from __dict__ so deferred fields don't trigger a query
+    instance._loaded_preferred_date = instance.__dict__.get('preferred_date')
+
+
+@receiver(post_save, sender=BookingRequest)
+def invalidate_occupancy_on_save(sender, instance, **kwargs):
+    """Drop cached availability for the booking's old and new day."""
+    days = [instance.preferred_date, getattr(instance, '_loaded_preferred_date', None)]
+    # Wait for commit so a concurrent reader can't re-cache the pre-commit state
+    transaction.on_commit(lambda: invalidate_days(days))
+    instance._loaded_preferred_date = instance.preferred_date
+
+
+@receiver(post_delete, sender=BookingRequest)
+def invalidate_occupancy_on_delete(sender, instance, **kwargs):
+    """Drop cached availability for a deleted booking's day."""
+    day = instance.preferred_date
+    transaction.on_commit(lambda: invalidate_days([day]))
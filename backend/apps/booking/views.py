@@ -1,38 +1,51 @@
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from django.core.mail import send_mail
-from django.conf import settings
-from django.template.loader import render_to_string
-import threading
+from django.db import transaction
 import logging
+from config.fastlist import FastListMixin
+from config.fieldsets import SparseQuerysetMixin
+from config.pagination import KeysetPagination
+from .availability import build_occupancy, free_slots, is_slot_free, lock_day
 from .models import BookingRequest
-from .serializers import BookingRequestSerializer
+from .notifications import queue_booking_notification, queue_confirmation_email
+from .serializers import AvailabilityQuerySerializer, BookingRequestSerializer
 
 logger = logging.getLogger(__name__)
 
 
-class BookingRequestViewSet(viewsets.ModelViewSet):
+class BookingRequestViewSet(FastListMixin, SparseQuerysetMixin, viewsets.ModelViewSet):
     """ViewSet for BookingRequest model."""
     
-    queryset = BookingRequest.objects.all()
+    # The serializer nests the service
+    queryset = BookingRequest.objects.select_related('service')
     serializer_class = BookingRequestSerializer
+    pagination_class = KeysetPagination
+    query_budget = {'list': 1, 'retrieve': 1, 'create': 11, 'availability': 2}
     
     def create(self, request, *args, **kwargs):
-        """Create a new booking request and send email notification."""
+        """Create a new booking request and queue the email notification."""
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         
-        # Create the booking request
-        booking = serializer.save()
+        service = serializer.validated_data['service']
+        day = serializer.validated_data['preferred_date']
+        slot = serializer.validated_data['preferred_time']
         
-        # Send email notification in background (don't block response)
-        email_thread = threading.Thread(
-            target=self.send_booking_notification,
-            args=(booking,),
-            daemon=True
-        )
-        email_thread.start()
+        # Serialize bookings for the same day on a row lock, then re-check the
+        # slot against the database (not the cache) before inserting
+        with transaction.atomic():
+            lock_day(day)
+            occupancy = build_occupancy([day])[day]
+            if is_slot_free(service, day, slot, occupancy=occupancy):
+                booking = serializer.save()
+                # Queued in the same transaction, delivered by the outbox worker
+                queue_booking_notification(booking)
+            else:
+                booking = None
+        
+        if booking is None:
+            return self._slot_taken(service, day)
         
         headers = self.get_success_headers(serializer.data)
         return Response(
@@ -41,105 +54,70 @@ class BookingRequestViewSet(viewsets.ModelViewSet):
             headers=headers
         )
     
-    def send_booking_notification(self, booking):
-        """Send email notification about new booking request (runs in background)."""
-        from django.db import connections
+    def update(self, request, *args, **kwargs):
+        """Update a booking, re-checking the slot on the same day lock as create() when it moves."""
+        partial = kwargs.pop('partial', False)
+        instance = self.get_object()
+        serializer = self.get_serializer(instance, data=request.data, partial=partial)
+        serializer.is_valid(raise_exception=True)
+        
+        service = serializer.validated_data.get('service', instance.service)
+        day = serializer.validated_data.get('preferred_date', instance.preferred_date)
+        slot = serializer.validated_data.get('preferred_time', instance.preferred_time)
+        moved = (service.pk, day, slot) != (instance.service_id, instance.preferred_date, instance.preferred_time)
         
-        try:
-            # Close any existing database connections for this thread
-            connections.close_all()
-            subject = f"New Booking Request - {booking.customer_name}"
-            
-            # Create email content
-            context = {
-                'booking': booking,
-                'service': booking.service,
-            }
-            
-            html_message = render_to_string('emails/booking_notification.html', context)
-            plain_message = f"""
-            New booking request received:
-            
-            Customer: {booking.customer_name}
-            Email: {booking.customer_email}
-            Phone: {booking.customer_phone}
-            Service: {booking.service.name}
-            Date: {booking.preferred_date}
-            Time: {booking.preferred_time}
-            Notes: {booking.notes or 'None'}
-            
-            Please confirm this appointment.
-            """
-            
-            # Get admin email from settings or fallback
-            admin_email = getattr(settings, 'ADMIN_EMAIL', None) or settings.EMAIL_HOST_USER or settings.DEFAULT_FROM_EMAIL
-            logger.info(f"Attempting to send booking notification email to {admin_email}")
-            result = send_mail(
-                subject=subject,
-                message=plain_message,
-                html_message=html_message,
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[admin_email],  # Business owner email
-                fail_silently=False,  # Raise exception so we can log it
-            )
-            logger.info(f"Booking notification email sent successfully. Result: {result}")
-        except Exception as e:
-            # Log error but don't fail (already saved to database)
-            logger.error(f"Failed to send booking notification: {e}", exc_info=True)
+        with transaction.atomic():
+            if moved and instance.status in BookingRequest.ACTIVE_STATUSES:
+                lock_day(day)
+                # The booking's own current slot doesn't count against it
+                occupancy = build_occupancy([day], exclude=instance.pk)[day]
+                if not is_slot_free(service, day, slot, occupancy=occupancy):
+                    return self._slot_taken(service, day)
+            serializer.save()
+        
+        return Response(serializer.data)
+    
+    def _slot_taken(self, service, day):
+        """409 response with free slots over the next few days."""
+        return Response(
+            {
+                'detail': 'This time slot is no longer available.',
+                'alternatives': [
+                    {'date': option['date'].isoformat(), 'slots': option['slots']}
+                    for option in free_slots(service, start_date=day, days=3)
+                ],
+            },
+            status=status.HTTP_409_CONFLICT,
+        )
+    
+    @action(detail=False, methods=['get'])
+    def availability(self, request):
+        """Return free time slots for a service over the next few days."""
+        query = AvailabilityQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        
+        service = query.validated_data['service_id']
+        days = free_slots(
+            service,
+            start_date=query.validated_data.get('start'),
+            days=query.validated_data['days'],
+        )
+        return Response({
+            'service_id': service.id,
+            'duration_minutes': service.duration_minutes + BookingRequest.BUFFER_MINUTES,
+            'days': [
+                {'date': day['date'].isoformat(), 'slots': day['slots']}
+                for day in days
+            ],
+        })
     
     @action(detail=True, methods=['post'])
     def confirm(self, request, pk=None):
         """Confirm a booking request (admin action)."""
         booking = self.get_object()
-        booking.status = 'confirmed'
-        booking.save()
-        
-        # Send confirmation email in background (don't block response)
-        email_thread = threading.Thread(
-            target=self.send_confirmation_email,
-            args=(booking,),
-            daemon=True
-        )
-        email_thread.start()
+        with transaction.atomic():
+            booking.status = 'confirmed'
+            booking.save()
+            queue_confirmation_email(booking)
         
         return Response({'status': 'Booking confirmed'})
-    
-    def send_confirmation_email(self, booking):
-        """Send confirmation email to customer (runs in background)."""
-        from django.db import connections
-        
-        try:
-            # Close any existing database connections for this thread
-            connections.close_all()
-            subject = f"Appointment Confirmed - {booking.service.name}"
-            
-            context = {
-                'booking': booking,
-                'service': booking.service,
-            }
-            
-            html_message = render_to_string('emails/booking_confirmation.html', context)
-            plain_message = f"""
-            Your appointment has been confirmed!
-            
-            Service: {booking.service.name}
-            Date: {booking.preferred_date}
-            Time: {booking.preferred_time}
-            Duration: {booking.service.duration_display}
-            
-            We look forward to seeing you!
-            """
-            
-            logger.info(f"Attempting to send confirmation email to {booking.customer_email}")
-            result = send_mail(
-                subject=subject,
-                message=plain_message,
-                html_message=html_message,
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[booking.customer_email],
-                fail_silently=False,  # Raise exception so we can log it
-            )
-            logger.info(f"Confirmation email sent successfully. Result: {result}")
-        except Exception as e:
-            # Log error but don't fail (booking already confirmed)
-            logger.error(f"Failed to send confirmation email: {e}", exc_info=True)
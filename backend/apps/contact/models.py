@@ -41,6 +41,10 @@ class ContactMessage(models.Model):
         ordering = ['-created_at']
         verbose_name = "Contact Message"
         verbose_name_plural = "Contact Messages"
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='contact_keyset_idx'),
+            models.Index(fields=['-created_at'], condition=models.Q(is_read=False), name='contact_unread_idx'),
+        ]
     
     def __str__(self):
         return f"{self.name} - {self.subject} ({self.created_at.strftime('%Y-%m-%d')})"
@@ -59,6 +63,12 @@ class NewsletterSubscriber(models.Model):
         ordering = ['-subscribed_at']
         verbose_name = "Newsletter Subscriber"
         verbose_name_plural = "Newsletter Subscribers"
+        indexes = [
+            # The API only lists active subscribers
+            models.Index(
+                fields=['-subscribed_at', '-id'], condition=models.Q(is_active=True), name='subscriber_keyset_idx',
+            ),
+        ]
     
     def __str__(self):
         return f"{self.email} ({'Active' if self.is_active else 'Inactive'})"
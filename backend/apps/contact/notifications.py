@@ -0,0 +1,32 @@
+"""
+Contact and newsletter emails, queued through the notifications outbox.
+
+Call these inside the transaction that saves the row so the email is only
+queued if the row is committed.
+"""
+from apps.notifications.outbox import enqueue_email, get_admin_email
+from apps.notifications.rendering import render
+
+
+def queue_contact_notification(message):
+    """Queue the new-contact-message notification for the business owner."""
+    plain_message, html_message = render('contact_notification', {'message': message})
+    
+    return enqueue_email(
+        subject=f"New Contact Message - {message.subject}",
+        body=plain_message,
+        html_body=html_message,
+        recipients=[get_admin_email()],  # Business owner email
+    )
+
+
+def queue_welcome_email(subscriber):
+    """Queue the welcome email for a new or reactivated subscriber."""
+    plain_message, html_message = render('newsletter_welcome', {'subscriber': subscriber})
+    
+    return enqueue_email(
+        subject="Welcome to our newsletter!",
+        body=plain_message,
+        html_body=html_message,
+        recipients=[subscriber.email],
+    )
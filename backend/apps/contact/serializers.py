@@ -1,8 +1,9 @@
 from rest_framework import serializers
+from config.fieldsets import SparseFieldsMixin
 from .models import ContactMessage, NewsletterSubscriber
 
 
-class ContactMessageSerializer(serializers.ModelSerializer):
+class ContactMessageSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for ContactMessage model."""
     
     class Meta:
@@ -14,7 +15,7 @@ class ContactMessageSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'is_read', 'created_at', 'updated_at']
 
 
-class NewsletterSubscriberSerializer(serializers.ModelSerializer):
+class NewsletterSubscriberSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for NewsletterSubscriber model."""
     
     class Meta:
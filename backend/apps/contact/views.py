@@ -1,39 +1,35 @@
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from django.core.mail import send_mail
-from django.conf import settings
-from django.template.loader import render_to_string
+from django.db import transaction
 from django.utils import timezone
-import threading
 import logging
+from config.fieldsets import SparseQuerysetMixin
+from config.pagination import KeysetPagination
 from .models import ContactMessage, NewsletterSubscriber
+from .notifications import queue_contact_notification, queue_welcome_email
 from .serializers import ContactMessageSerializer, NewsletterSubscriberSerializer
 
 logger = logging.getLogger(__name__)
 
 
-class ContactMessageViewSet(viewsets.ModelViewSet):
+class ContactMessageViewSet(SparseQuerysetMixin, viewsets.ModelViewSet):
     """ViewSet for ContactMessage model."""
     
     queryset = ContactMessage.objects.all()
     serializer_class = ContactMessageSerializer
+    pagination_class = KeysetPagination
+    query_budget = {'list': 1, 'retrieve': 1, 'create': 4}
     
     def create(self, request, *args, **kwargs):
-        """Create a new contact message and send email notification."""
+        """Create a new contact message and queue the email notification."""
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         
-        # Create the contact message
-        message = serializer.save()
-        
-        # Send email notification in background (don't block response)
-        email_thread = threading.Thread(
-            target=self.send_contact_notification,
-            args=(message,),
-            daemon=True
-        )
-        email_thread.start()
+        # Create the contact message and queue the notification in one transaction
+        with transaction.atomic():
+            message = serializer.save()
+            queue_contact_notification(message)
         
         headers = self.get_success_headers(serializer.data)
         return Response(
@@ -42,50 +38,6 @@ class ContactMessageViewSet(viewsets.ModelViewSet):
             headers=headers
         )
     
-    def send_contact_notification(self, message):
-        """Send email notification about new contact message (runs in background)."""
-        from django.db import connections
-        
-        try:
-            # Close any existing database connections for this thread
-            connections.close_all()
-            subject = f"New Contact Message - {message.subject}"
-            
-            # Create email content
-            context = {
-                'message': message,
-            }
-            
-            html_message = render_to_string('emails/contact_notification.html', context)
-            plain_message = f"""
-            New contact message received:
-            
-            From: {message.name}
-            Email: {message.email}
-            Phone: {message.phone or 'Not provided'}
-            Subject: {message.subject}
-            Type: {message.get_subject_type_display()}
-            
-            Message:
-            {message.message}
-            """
-            
-            # Get admin email from settings or fallback
-            admin_email = getattr(settings, 'ADMIN_EMAIL', None) or settings.EMAIL_HOST_USER or settings.DEFAULT_FROM_EMAIL
-            logger.info(f"Attempting to send contact notification email to {admin_email}")
-            result = send_mail(
-                subject=subject,
-                message=plain_message,
-                html_message=html_message,
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[admin_email],  # Business owner email
-                fail_silently=False,  # Raise exception so we can log it
-            )
-            logger.info(f"Contact notification email sent successfully. Result: {result}")
-        except Exception as e:
-            # Log error but don't fail (already saved to database)
-            logger.error(f"Failed to send contact notification: {e}", exc_info=True)
-    
     @action(detail=True, methods=['post'])
     def mark_read(self, request, pk=None):
         """Mark a contact message as read."""
@@ -95,29 +47,33 @@ class ContactMessageViewSet(viewsets.ModelViewSet):
         return Response({'status': 'Message marked as read'})
 
 
-class NewsletterSubscriberViewSet(viewsets.ModelViewSet):
+class SubscriberPagination(KeysetPagination):
+    """Keyset pagination on (subscribed_at, id)."""
+    
+    ordering = ('-subscribed_at', '-id')
+
+
+class NewsletterSubscriberViewSet(SparseQuerysetMixin, viewsets.ModelViewSet):
     """ViewSet for NewsletterSubscriber model."""
     
     queryset = NewsletterSubscriber.objects.filter(is_active=True)
     serializer_class = NewsletterSubscriberSerializer
+    pagination_class = SubscriberPagination
+    query_budget = {'list': 1, 'retrieve': 1, 'create': 8}
     
     def create(self, request, *args, **kwargs):
         """Subscribe to newsletter."""
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         
-        subscriber = serializer.save()
-        
-        # Send welcome email in background only for new or reactivated subscribers
-        # Check if this is a new subscriber (set by serializer)
-        is_new = getattr(subscriber, '_is_new_subscriber', True)
-        if is_new:
-            email_thread = threading.Thread(
-                target=self.send_welcome_email,
-                args=(subscriber,),
-                daemon=True
-            )
-            email_thread.start()
+        with transaction.atomic():
+            subscriber = serializer.save()
+            
+            # Queue welcome email only for new or reactivated subscribers
+            # Check if this is a new subscriber (set by serializer)
+            is_new = getattr(subscriber, '_is_new_subscriber', True)
+            if is_new:
+                queue_welcome_email(subscriber)
         
         headers = self.get_success_headers(serializer.data)
         return Response(
@@ -126,44 +82,6 @@ class NewsletterSubscriberViewSet(viewsets.ModelViewSet):
             headers=headers
         )
     
-    def send_welcome_email(self, subscriber):
-        """Send welcome email to new subscriber (runs in background)."""
-        from django.db import connections
-        
-        try:
-            # Close any existing database connections for this thread
-            connections.close_all()
-            subject = "Welcome to our newsletter!"
-            
-            context = {
-                'subscriber': subscriber,
-            }
-            
-            html_message = render_to_string('emails/newsletter_welcome.html', context)
-            plain_message = f"""
-            Welcome to our newsletter, {subscriber.name or 'there'}!
-            
-            Thank you for subscribing. You'll receive updates about our latest services, 
-            special offers, and beauty tips.
-            
-            Best regards,
-            The Nail & Lash Team
-            """
-            
-            logger.info(f"Attempting to send welcome email to {subscriber.email}")
-            result = send_mail(
-                subject=subject,
-                message=plain_message,
-                html_message=html_message,
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[subscriber.email],
-                fail_silently=False,  # Raise exception so we can log it
-            )
-            logger.info(f"Welcome email sent successfully. Result: {result}")
-        except Exception as e:
-            # Log error but don't fail (already saved to database)
-            logger.error(f"Failed to send welcome email: {e}", exc_info=True)
-    
     @action(detail=True, methods=['post'])
     def unsubscribe(self, request, pk=None):
         """Unsubscribe from newsletter."""
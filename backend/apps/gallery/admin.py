@@ -1,41 +1,201 @@
-from django.contrib import admin
+import zipfile
+
+from django import forms
+from django.conf import settings
+from django.contrib import admin, messages
+from django.core.exceptions import PermissionDenied
+from django.shortcuts import redirect
+from django.template.response import TemplateResponse
+from django.urls import path, reverse
+from django.utils import timezone
+from config.caching import bump_version
+from .duplicates import REPORT_MAX_DISTANCE, find_near_duplicates, hash_fields, near_duplicate_groups
+from .imaging import dhash
+from .importing import import_zip
 from .models import GalleryImage
 
 
+class GalleryImageAdminForm(forms.ModelForm):
+    """GalleryImage form that refuses near-duplicates of existing images unless told otherwise."""
+    
+    allow_duplicate = forms.BooleanField(
+        required=False,
+        label="Upload anyway",
+        help_text="Keep this image even if it looks like one already in the gallery"
+    )
+    
+    class Meta:
+        model = GalleryImage
+        fields = '__all__'
+    
+    def clean(self):
+        cleaned_data = super().clean()
+        image = cleaned_data.get('image')
+        if not image or 'image' not in self.changed_data:
+            return cleaned_data
+        
+        try:
+            value = dhash(image, settings.IMAGE_MAX_PIXELS)
+        except Exception:
+            # Unreadable or oversized images are reported by the field validators
+            return cleaned_data
+        finally:
+            image.seek(0)
+        
+        matches = find_near_duplicates(value, exclude_pk=self.instance.pk)
+        if matches and not cleaned_data.get('allow_duplicate'):
+            titles = ', '.join(f'"{match.title}" (#{match.pk})' for match, _distance in matches[:3])
+            self.add_error('image', f'This looks like a duplicate of {titles}. Tick "Upload anyway" to keep it.')
+        else:
+            # Saved with the row; the background worker recomputes it from the stored file
+            for field, field_value in hash_fields(value).items():
+                setattr(self.instance, field, field_value)
+        return cleaned_data
+
+
+class GalleryImportForm(forms.Form):
+    """Upload form for importing a ZIP archive of gallery images."""
+    
+    archive = forms.FileField(help_text="ZIP archive of JPEG, PNG, WebP or GIF images")
+    category = forms.ChoiceField(choices=GalleryImage.CATEGORIES)
+    is_active = forms.BooleanField(required=False, initial=True, help_text="Show the images in the gallery")
+    allow_duplicates = forms.BooleanField(
+        required=False, help_text="Also import images that look like ones already in the gallery"
+    )
+
+
 @admin.register(GalleryImage)
 class GalleryImageAdmin(admin.ModelAdmin):
-    list_display = ['title', 'category', 'is_featured', 'is_active', 'sort_order', 'created_at']
-    list_filter = ['category', 'is_featured', 'is_active', 'created_at']
+    form = GalleryImageAdminForm
+    change_list_template = 'admin/gallery/galleryimage/change_list.html'
+    list_display = ['title', 'category', 'is_featured', 'is_active', 'sort_order', 'processing_status', 'created_at']
+    list_filter = ['category', 'is_featured', 'is_active', 'processing_status', 'created_at']
     search_fields = ['title', 'description']
     list_editable = ['is_featured', 'is_active', 'sort_order']
     ordering = ['-sort_order', '-is_featured', '-created_at']
-    readonly_fields = ['thumbnail', 'created_at', 'updated_at']
+    readonly_fields = [
+        'thumbnail', 'composite', 'processing_status', 'processing_attempts', 'processing_error', 'processing_started_at',
+        'image_hash', 'created_at', 'updated_at',
+    ]
     
     fieldsets = (
         ('Image Information', {
             'fields': ('title', 'description', 'category')
         }),
         ('Image Files', {
-            'fields': ('image', 'comparison_image', 'thumbnail'),
-            'description': 'For "Before & After" category, upload both images. comparison_image displays as "After" side by side.'
+            'fields': ('image', 'allow_duplicate', 'comparison_image', 'thumbnail', 'composite'),
+            'description': 'For "Before & After" category, upload both images. comparison_image displays as "After" side by side; the combined image is generated automatically.'
         }),
         ('Display Options', {
             'fields': ('is_featured', 'is_active', 'sort_order')
         }),
+        ('Image Processing', {
+            'fields': (
+                'processing_status', 'processing_attempts', 'processing_error', 'processing_started_at', 'image_hash',
+            ),
+            'classes': ('collapse',)
+        }),
         ('Timestamps', {
             'fields': ('created_at', 'updated_at'),
             'classes': ('collapse',)
         }),
     )
     
-    actions = ['feature_images', 'activate_images']
+    actions = ['feature_images', 'activate_images', 'regenerate_thumbnails']
     
     def feature_images(self, request, queryset):
-        queryset.update(is_featured=True)
+        queryset.update(is_featured=True, updated_at=timezone.now())
+        bump_version(GalleryImage)  # update() bypasses post_save
         self.message_user(request, f'{queryset.count()} images featured.')
     feature_images.short_description = "Feature selected images"
     
     def activate_images(self, request, queryset):
-        queryset.update(is_active=True)
+        queryset.update(is_active=True, updated_at=timezone.now())
+        bump_version(GalleryImage)  # update() bypasses post_save
         self.message_user(request, f'{queryset.count()} images activated.')
     activate_images.short_description = "Activate selected images"
+    
+    def regenerate_thumbnails(self, request, queryset):
+        count = queryset.exclude(processing_status='skipped').update(
+            processing_status='pending', processing_attempts=0, processing_error='', updated_at=timezone.now(),
+        )
+        self.message_user(request, f'{count} images queued for image processing.')
+    regenerate_thumbnails.short_description = "Regenerate thumbnails and renditions for selected images"
+    
+    def get_urls(self):
+        urls = [
+            path('import-zip/', self.admin_site.admin_view(self.import_zip_view), name='gallery_galleryimage_import_zip'),
+            path(
+                'direct-upload/', self.admin_site.admin_view(self.direct_upload_view),
+                name='gallery_galleryimage_direct_upload',
+            ),
+            path(
+                'near-duplicates/', self.admin_site.admin_view(self.near_duplicates_view),
+                name='gallery_galleryimage_near_duplicates',
+            ),
+        ]
+        return urls + super().get_urls()
+    
+    def import_zip_view(self, request):
+        """Import a ZIP archive; thumbnails and renditions are generated by the background worker."""
+        if not self.has_add_permission(request):
+            raise PermissionDenied
+        
+        form = GalleryImportForm(request.POST or None, request.FILES or None)
+        if request.method == 'POST' and form.is_valid():
+            try:
+                ids, skipped = import_zip(
+                    form.cleaned_data['archive'], form.cleaned_data['category'],
+                    is_active=form.cleaned_data['is_active'], allow_duplicates=form.cleaned_data['allow_duplicates'],
+                )
+            except zipfile.BadZipFile:
+                form.add_error('archive', 'This is not a valid ZIP archive.')
+            else:
+                self.message_user(
+                    request,
+                    f'{len(ids)} images imported. Thumbnails and renditions are being generated in the background.',
+                )
+                for filename, reason in skipped:
+                    self.message_user(request, f'Skipped {filename}: {reason}', level=messages.WARNING)
+                return redirect(reverse('admin:gallery_galleryimage_changelist'))
+        
+        context = {
+            **self.admin_site.each_context(request),
+            'title': 'Import gallery images from ZIP',
+            'opts': self.model._meta,
+            'form': form,
+        }
+        return TemplateResponse(request, 'admin/gallery/galleryimage/import_zip.html', context)
+    
+    def direct_upload_view(self, request):
+        """Upload images from the browser straight to storage (see apps.gallery.uploads)."""
+        if not self.has_add_permission(request):
+            raise PermissionDenied
+        
+        context = {
+            **self.admin_site.each_context(request),
+            'title': 'Upload gallery images',
+            'opts': self.model._meta,
+            'categories': GalleryImage.CATEGORIES,
+        }
+        return TemplateResponse(request, 'admin/gallery/galleryimage/direct_upload.html', context)
+    
+    def near_duplicates_view(self, request):
+        """Report groups of gallery images that look alike (perceptual hashes within ?distance= bits)."""
+        if not self.has_view_permission(request):
+            raise PermissionDenied
+        
+        try:
+            distance = min(max(int(request.GET.get('distance', REPORT_MAX_DISTANCE)), 0), 16)
+        except ValueError:
+            distance = REPORT_MAX_DISTANCE
+        
+        context = {
+            **self.admin_site.each_context(request),
+            'title': 'Near-duplicate gallery images',
+            'opts': self.model._meta,
+            'distance': distance,
+            'groups': near_duplicate_groups(distance),
+            'unhashed': GalleryImage.objects.filter(image_hash__isnull=True).count(),
+        }
+        return TemplateResponse(request, 'admin/gallery/galleryimage/near_duplicates.html', context)
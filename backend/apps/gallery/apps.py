@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class GalleryConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.gallery'
+
+    def ready(self):
+        from config.caching import invalidate_on_change
+        from .models import GalleryImage
+        invalidate_on_change(GalleryImage)
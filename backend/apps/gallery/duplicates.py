@@ -0,0 +1,146 @@
+"""
+Near-duplicate detection for gallery images using perceptual (dHash) hashes.
+
+Each image's 64-bit hash is stored in `image_hash` and split into four
+16-bit bands, each in its own indexed column. Two hashes at most
+UPLOAD_MAX_DISTANCE bits apart must share at least one band exactly
+(pigeonhole), so the upload check is an indexed OR lookup followed by an
+exact Hamming check on the few candidates, never a table scan. The admin
+report, which looks for looser matches across the whole gallery, builds a
+BK-tree in memory instead.
+"""
+from django.db.models import Q
+
+from .models import GalleryImage
+
+HASH_BITS = 64
+HASH_BANDS = 4
+BAND_BITS = HASH_BITS // HASH_BANDS
+BAND_MASK = (1 << BAND_BITS) - 1
+HASH_MASK = (1 << HASH_BITS) - 1
+
+# Largest distance the band index is guaranteed to find
+UPLOAD_MAX_DISTANCE = HASH_BANDS - 1
+# Default distance for the admin near-duplicates report
+REPORT_MAX_DISTANCE = 6
+
+
+def to_signed(value):
+    """Unsigned 64-bit hash -> value that fits a signed BigIntegerField."""
+    return value - (1 << HASH_BITS) if value >= 1 << (HASH_BITS - 1) else value
+
+
+def hamming(a, b):
+    """Number of differing bits between two hashes (signed or unsigned)."""
+    return ((a ^ b) & HASH_MASK).bit_count()
+
+
+def bands(value):
+    """The HASH_BANDS band values of a hash, most significant first."""
+    value &= HASH_MASK
+    return [(value >> (BAND_BITS * (HASH_BANDS - 1 - index))) & BAND_MASK for index in range(HASH_BANDS)]
+
+
+def hash_fields(value):
+    """Model field values for a hash: {'image_hash': ..., 'hash_band_0': ..., ...}."""
+    fields = {'image_hash': to_signed(value & HASH_MASK)}
+    fields.update({f'hash_band_{index}': band for index, band in enumerate(bands(value))})
+    return fields
+
+
+def find_near_duplicates(value, max_distance=UPLOAD_MAX_DISTANCE, exclude_pk=None):
+    """
+    Return [(GalleryImage, distance)] for stored images within max_distance bits, closest first.
+
+    max_distance can't exceed UPLOAD_MAX_DISTANCE: the band index wouldn't
+    find every match beyond it.
+    """
+    max_distance = min(max_distance, UPLOAD_MAX_DISTANCE)
+    candidates = GalleryImage.objects.filter(
+        Q(**{f'hash_band_{index}': band for index, band in enumerate(bands(value))}, _connector=Q.OR)
+    )
+    if exclude_pk is not None:
+        candidates = candidates.exclude(pk=exclude_pk)
+
+    matches = []
+    for image in candidates.order_by().only('id', 'title', 'image', 'image_hash'):
+        distance = hamming(value, image.image_hash)
+        if distance <= max_distance:
+            matches.append((image, distance))
+    return sorted(matches, key=lambda match: match[1])
+
+
+class BKTree:
+    """Burkhard-Keller tree over hashes with Hamming distance; items are (hash, payload)."""
+
+    def __init__(self):
+        self.root = None
+
+    def add(self, value, payload):
+        node = [value, payload, {}]
+        if self.root is None:
+            self.root = node
+            return
+        current = self.root
+        while True:
+            distance = hamming(value, current[0])
+            child = current[2].get(distance)
+            if child is None:
+                current[2][distance] = node
+                return
+            current = child
+
+    def search(self, value, max_distance):
+        """Return [(distance, payload)] for every item within max_distance of value."""
+        results = []
+        stack = [self.root] if self.root is not None else []
+        while stack:
+            node_value, payload, children = stack.pop()
+            distance = hamming(value, node_value)
+            if distance <= max_distance:
+                results.append((distance, payload))
+            # Triangle inequality: only these subtrees can hold matches
+            for child_distance, child in children.items():
+                if distance - max_distance <= child_distance <= distance + max_distance:
+                    stack.append(child)
+        return results
+
+
+def near_duplicate_groups(max_distance=REPORT_MAX_DISTANCE, queryset=None):
+    """
+    Group hashed gallery images whose hashes are within max_distance bits.
+
+    Returns a list of groups (lists of GalleryImage, oldest first) with two
+    or more images each, largest groups first. Matching is transitive: A~B
+    and B~C put A, B and C in one group.
+    """
+    queryset = queryset if queryset is not None else GalleryImage.objects.all()
+    images = list(
+        queryset.filter(image_hash__isnull=False)
+        .only('id', 'title', 'category', 'image', 'thumbnail', 'image_hash', 'created_at')
+        .order_by('created_at', 'id')
+    )
+
+    tree = BKTree()
+    for index, image in enumerate(images):
+        tree.add(image.image_hash, index)
+
+    # Union-find over image indexes
+    parent = list(range(len(images)))
+
+    def find(index):
+        while parent[index] != index:
+            parent[index] = parent[parent[index]]
+            index = parent[index]
+        return index
+
+    for index, image in enumerate(images):
+        for _distance, other in tree.search(image.image_hash, max_distance):
+            root, other_root = find(index), find(other)
+            if root != other_root:
+                parent[max(root, other_root)] = min(root, other_root)
+
+    groups = {}
+    for index, image in enumerate(images):
+        groups.setdefault(find(index), []).append(image)
+    return sorted((group for group in groups.values() if len(group) > 1), key=len, reverse=True)
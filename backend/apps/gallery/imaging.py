@@ -0,0 +1,321 @@
+"""
+Pillow image operations for the gallery processing pipeline.
+
+Functions here take a file path or bytes and return encoded bytes, with no
+Django model access, so they can run in ProcessPoolExecutor workers.
+
+Memory is bounded by decoding JPEGs at reduced scale (draft mode) whenever
+the output is smaller than the original, and by refusing images above a
+pixel cap before anything is decoded. Derived images are written without
+EXIF; strip_jpeg_metadata() does the same for stored JPEG originals.
+"""
+import base64
+import struct
+from io import BytesIO
+
+from PIL import Image, ImageOps
+
+try:
+    # Optional plugin that registers an AVIF encoder with Pillow
+    import pillow_avif  # noqa: F401
+except ImportError:
+    pass
+
+THUMBNAIL_SIZE = (300, 300)
+
+# Rendition widths in pixels, largest first; images are never upscaled
+RENDITION_WIDTHS = (1280, 960, 640, 320)
+# Preferred order for <picture> sources; formats Pillow can't encode are skipped
+RENDITION_FORMATS = ('avif', 'webp')
+RENDITION_QUALITY = {'avif': 60, 'webp': 80}
+
+# Before & After composites: both photos scaled to this height (or the shorter
+# photo's height) and separated by a divider in the site's gray-300
+COMPOSITE_HEIGHT = 960
+COMPOSITE_GAP = 8
+COMPOSITE_GAP_COLOR = (209, 213, 219)
+COMPOSITE_QUALITY = 85
+
+# Longest side of the inline placeholder image, in pixels
+PLACEHOLDER_SIZE = 16
+# dHash compares HASH_SIZE + 1 columns per row over HASH_SIZE rows: 64 bits
+HASH_SIZE = 8
+
+EXIF_ORIENTATION = 0x0112
+# Orientations that swap width and height
+TRANSPOSED_ORIENTATIONS = (5, 6, 7, 8)
+# JPEG segments dropped from originals: APP1 (EXIF/XMP), APP13 (IPTC) and comments
+METADATA_MARKERS = (0xE1, 0xED, 0xFE)
+COPY_CHUNK_SIZE = 64 * 1024
+
+
+class ImageTooLarge(ValueError):
+    """Raised for images above the configured pixel cap (possible decompression bombs)."""
+
+
+def rendition_formats():
+    """Rendition formats the installed Pillow can encode."""
+    Image.init()
+    return [image_format for image_format in RENDITION_FORMATS if image_format.upper() in Image.SAVE]
+
+
+def check_pixels(img, max_pixels):
+    """Raise ImageTooLarge if an opened (not yet decoded) image exceeds max_pixels."""
+    if max_pixels and img.width * img.height > max_pixels:
+        raise ImageTooLarge(
+            f'Image is {img.width}x{img.height} ({img.width * img.height} pixels), '
+            f'above the {max_pixels} pixel limit'
+        )
+
+
+def _open(source, max_pixels=None):
+    """Open an image from a filesystem path, raw bytes or file object; only the header is read."""
+    if isinstance(source, (bytes, bytearray)):
+        source = BytesIO(source)
+    img = Image.open(source)
+    try:
+        check_pixels(img, max_pixels)
+    except ImageTooLarge:
+        img.close()
+        raise
+    return img
+
+
+def _oriented_size(img):
+    """Image size after applying its EXIF orientation."""
+    if img.getexif().get(EXIF_ORIENTATION) in TRANSPOSED_ORIENTATIONS:
+        return img.height, img.width
+    return img.size
+
+
+def _draft(img, box):
+    """Ask the JPEG decoder for the smallest scale still covering `box` (given in oriented pixels)."""
+    if img.getexif().get(EXIF_ORIENTATION) in TRANSPOSED_ORIENTATIONS:
+        box = box[::-1]
+    img.draft(None, box)
+
+
+def _encode(img, image_format, **options):
+    buffer = BytesIO()
+    if image_format == 'JPEG' and img.mode not in ('RGB', 'L'):
+        img = img.convert('RGB')
+    img.save(buffer, format=image_format, **options)
+    return buffer.getvalue()
+
+
+def make_thumbnail(source, size=THUMBNAIL_SIZE, max_pixels=None):
+    """Return thumbnail bytes in the original image's format (JPEG if unknown)."""
+    with _open(source, max_pixels) as img:
+        image_format = img.format or 'JPEG'
+        # thumbnail() decodes JPEGs in draft mode itself
+        img.thumbnail(size, Image.Resampling.LANCZOS)
+        return _encode(ImageOps.exif_transpose(img), image_format)
+
+
+def make_renditions(source, widths=RENDITION_WIDTHS, formats=None, max_pixels=None):
+    """
+    Resize an image to each width and encode it in each rendition format.
+
+    Returns (original_size, renditions) where renditions is a list of
+    (format, width, height, bytes). Widths at or above the original width
+    collapse into one rendition at the original width.
+    """
+    formats = formats or rendition_formats()
+    with _open(source, max_pixels) as img:
+        original_size = original_width, original_height = _oriented_size(img)
+        targets = sorted({min(width, original_width) for width in widths}, reverse=True)
+        _draft(img, (targets[0], -(-original_height * targets[0] // original_width)))
+
+        # Apply the camera orientation so renditions don't come out rotated
+        img = ImageOps.exif_transpose(img)
+        if img.mode not in ('RGB', 'RGBA'):
+            img = img.convert('RGBA' if 'transparency' in img.info or img.mode in ('LA', 'PA') else 'RGB')
+
+        renditions = []
+        current = img
+        for width in targets:
+            if width < current.width:
+                height = max(1, round(original_height * width / original_width))
+                # Downscale from the previous (larger) rendition rather than the original
+                current = current.resize((width, height), Image.Resampling.LANCZOS)
+            for image_format in formats:
+                data = _encode(current, image_format.upper(), quality=RENDITION_QUALITY.get(image_format, 80))
+                renditions.append((image_format, current.width, current.height, data))
+    return original_size, renditions
+
+
+def make_composite(before, after, height=COMPOSITE_HEIGHT, max_pixels=None):
+    """
+    Return JPEG bytes of two images side by side at a common height.
+
+    Neither image is upscaled: the composite is at most as tall as the
+    shorter one. Each side is decoded in draft mode at roughly its final size.
+    """
+    sides = []
+    with _open(before, max_pixels) as first, _open(after, max_pixels) as second:
+        height = min(height, _oriented_size(first)[1], _oriented_size(second)[1])
+        for img in (first, second):
+            original_width, original_height = _oriented_size(img)
+            size = (max(1, round(original_width * height / original_height)), height)
+            _draft(img, size)
+            img = ImageOps.exif_transpose(img).convert('RGB')
+            sides.append(img.resize(size, Image.Resampling.LANCZOS))
+
+    left, right = sides
+    composite = Image.new('RGB', (left.width + COMPOSITE_GAP + right.width, height), COMPOSITE_GAP_COLOR)
+    composite.paste(left, (0, 0))
+    composite.paste(right, (left.width + COMPOSITE_GAP, 0))
+    return _encode(composite, 'JPEG', quality=COMPOSITE_QUALITY, optimize=True, progressive=True)
+
+
+def make_placeholder(source, size=PLACEHOLDER_SIZE, max_pixels=None):
+    """
+    Return a tiny preview as a WebP data URI of a few hundred bytes.
+
+    Clients stretch it with a CSS blur while the real image loads. JPEGs are
+    decoded at reduced scale (draft mode), so this stays cheap even for large
+    photos.
+    """
+    with _open(source, max_pixels) as img:
+        img.draft(None, (size * 8, size * 8))
+        img = ImageOps.exif_transpose(img).convert('RGB')
+        img.thumbnail((size, size), Image.Resampling.BILINEAR)
+        data = _encode(img, 'WEBP', quality=40)
+    return f"data:image/webp;base64,{base64.b64encode(data).decode('ascii')}"
+
+
+def dhash(source, max_pixels=None):
+    """
+    Return the 64-bit difference hash of an image as an unsigned int.
+
+    Each bit says whether a pixel is brighter than its right-hand neighbour
+    in a 9x8 greyscale version, so re-encoded, resized or lightly edited
+    copies of a photo land within a few bits of each other.
+    """
+    with _open(source, max_pixels) as img:
+        img.draft(None, ((HASH_SIZE + 1) * 8, HASH_SIZE * 8))
+        img = ImageOps.exif_transpose(img).convert('L')
+        pixels = list(img.resize((HASH_SIZE + 1, HASH_SIZE), Image.Resampling.LANCZOS).getdata())
+    value = 0
+    for row in range(HASH_SIZE):
+        for column in range(HASH_SIZE):
+            left = pixels[row * (HASH_SIZE + 1) + column]
+            value = (value << 1) | (left > pixels[row * (HASH_SIZE + 1) + column + 1])
+    return value
+
+
+def process_image(sources, thumbnail=None, placeholder=None, renditions=True, max_pixels=None,
+                  perceptual_hash=None, composite=None):
+    """
+    Run every Pillow job for one model row.
+
+    `sources` maps image field names to a path or bytes; `thumbnail`,
+    `placeholder` and `perceptual_hash` name the field to build each from,
+    if any, and `composite` an optional (before, after) pair of sources to
+    render side by side.
+    Returns {'thumbnail': bytes or None, 'placeholder': str or None,
+    'hash': int or None, 'composite': bytes or None,
+    'renditions': {field: (original_size, renditions)}}; the composite's
+    renditions are under the key 'composite'.
+    """
+    result = {
+        'thumbnail': make_thumbnail(sources[thumbnail], max_pixels=max_pixels) if thumbnail else None,
+        'placeholder': make_placeholder(sources[placeholder], max_pixels=max_pixels) if placeholder else None,
+        'hash': dhash(sources[perceptual_hash], max_pixels=max_pixels) if perceptual_hash else None,
+        'composite': make_composite(*composite, max_pixels=max_pixels) if composite else None,
+        'renditions': {
+            field: make_renditions(source, max_pixels=max_pixels) for field, source in sources.items()
+        } if renditions else {},
+    }
+    if renditions and result['composite'] is not None:
+        result['renditions']['composite'] = make_renditions(result['composite'])
+    return result
+
+
+def _orientation_segment(orientation):
+    """APP1 segment holding a minimal EXIF block with only the orientation tag."""
+    tiff = b'MM\x00*' + struct.pack('>IH', 8, 1) + struct.pack('>HHIHH', EXIF_ORIENTATION, 3, 1, orientation, 0)
+    payload = b'Exif\x00\x00' + tiff + struct.pack('>I', 0)
+    return b'\xff\xe1' + struct.pack('>H', len(payload) + 2) + payload
+
+
+def _copy_scan(src, dst):
+    """
+    Copy entropy-coded scan data from `src` up to the next marker.
+
+    `src` is left at the marker (or at the end of the file). Stuffed 0xFF00
+    bytes, restart markers and fill bytes are part of the scan.
+    """
+    pending = b''
+    while True:
+        chunk = src.read(COPY_CHUNK_SIZE)
+        if not chunk:
+            dst.write(pending)
+            return
+        data = pending + chunk
+        index = data.find(b'\xff')
+        while index != -1 and index < len(data) - 1:
+            following = data[index + 1]
+            if following not in (0x00, 0xFF) and not 0xD0 <= following <= 0xD7:
+                dst.write(data[:index])
+                src.seek(index - len(data), 1)
+                return
+            index = data.find(b'\xff', index + (1 if following == 0xFF else 2))
+        # Keep a trailing 0xFF until the next chunk shows what follows it
+        split = len(data) - 1 if index == len(data) - 1 else len(data)
+        dst.write(data[:split])
+        pending = data[split:]
+
+
+def strip_jpeg_metadata(src, dst, orientation=1):
+    """
+    Copy a JPEG from `src` to `dst` without EXIF, XMP, IPTC or comment segments.
+
+    Works segment by segment and copies the compressed image data in chunks,
+    so nothing is decoded and memory use doesn't grow with the file. A
+    non-default `orientation` is kept in a minimal EXIF block so the photo
+    still displays upright. Copying stops at the first end-of-image marker,
+    which drops the extra frames (each with its own EXIF) that MPO files from
+    phones append to the primary JPEG. `src` must be seekable. Returns False
+    (writing nothing) if `src` is not a JPEG.
+    """
+    if src.read(2) != b'\xff\xd8':
+        return False
+    dst.write(b'\xff\xd8')
+    orientation_segment = _orientation_segment(orientation) if orientation != 1 else b''
+
+    while True:
+        marker = src.read(2)
+        while marker[1:] == b'\xff':
+            # Fill bytes before a marker
+            marker = b'\xff' + src.read(1)
+        if not marker:
+            # Truncated after a scan: keep what there is
+            return True
+        if len(marker) < 2 or marker[0] != 0xFF:
+            raise ValueError('Corrupt JPEG: expected a segment marker')
+        code = marker[1]
+
+        if code != 0xE0 and orientation_segment:
+            # After the JFIF APP0 segment, before everything else
+            dst.write(orientation_segment)
+            orientation_segment = b''
+
+        if code == 0xD9:
+            dst.write(marker)
+            return True
+        if 0xD0 <= code <= 0xD7 or code == 0x01:
+            # Markers without a length field
+            dst.write(marker)
+            continue
+
+        length = src.read(2)
+        if len(length) < 2:
+            raise ValueError('Corrupt JPEG: truncated segment')
+        data = src.read(struct.unpack('>H', length)[0] - 2)
+        # APP2 MPF indexes the MPO frames that are no longer copied
+        if code not in METADATA_MARKERS and not (code == 0xE2 and data.startswith(b'MPF\x00')):
+            dst.write(marker + length + data)
+        if code == 0xDA:
+            # Start of scan: the compressed data follows, up to the next marker
+            _copy_scan(src, dst)
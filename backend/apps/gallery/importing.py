@@ -0,0 +1,156 @@
+"""
+Bulk gallery import from a ZIP archive.
+
+Members are streamed out of the archive one at a time through a spooled
+temporary file (in memory up to FILE_UPLOAD_MAX_MEMORY_SIZE, on disk above,
+and no more than IMAGE_MAX_BYTES), hashed, checked for near-duplicates (in
+the gallery and earlier in the same archive), stored, and inserted with
+bulk_create(). Rows are created 'pending', so the thumbnails and
+renditions come from the processing pipeline: the import_gallery command
+runs it straight away in a process pool, uploads through the admin leave
+it to the process_gallery_images worker.
+"""
+import logging
+import os
+import tempfile
+import zipfile
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files import File
+from PIL import Image, UnidentifiedImageError
+
+from config.caching import bump_version
+from .duplicates import UPLOAD_MAX_DISTANCE, BKTree, find_near_duplicates, hash_fields
+from .imaging import dhash
+from .models import GalleryImage
+from .validators import validate_image_pixels
+
+logger = logging.getLogger(__name__)
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp', '.gif')
+COPY_CHUNK_SIZE = 64 * 1024
+
+
+def _title(filename):
+    """'IMG_2041-final.jpg' -> 'Img 2041 Final'"""
+    stem = os.path.splitext(filename)[0]
+    return ' '.join(stem.replace('_', ' ').replace('-', ' ').split()).title()[:200]
+
+
+def image_members(archive):
+    """Image entries of an open ZipFile, in archive order, skipping folders and OS metadata files."""
+    for member in archive.infolist():
+        name = os.path.basename(member.filename)
+        if member.is_dir() or name.startswith('.') or '__MACOSX/' in member.filename:
+            continue
+        if name.lower().endswith(IMAGE_EXTENSIONS):
+            yield member
+
+
+def _check_duplicates(value, seen):
+    """Raise ValidationError if a near-duplicate is already in the gallery or earlier in the archive."""
+    matches = find_near_duplicates(value)
+    if matches:
+        image, _distance = matches[0]
+        raise ValidationError(f'Near-duplicate of "{image.title}" (#{image.pk}) already in the gallery.')
+    matches = seen.search(value, UPLOAD_MAX_DISTANCE)
+    if matches:
+        raise ValidationError(f'Near-duplicate of {min(matches)[1]} earlier in this archive.')
+
+
+def _build_image(archive, member, category, is_active, seen, allow_duplicates):
+    """Stream one member into storage and return an unsaved GalleryImage."""
+    filename = os.path.basename(member.filename)
+    limit = settings.IMAGE_MAX_BYTES
+    if member.file_size > limit:
+        raise ValidationError(f'File is {member.file_size} bytes, above the {limit} byte limit.')
+
+    spool = tempfile.SpooledTemporaryFile(max_size=settings.FILE_UPLOAD_MAX_MEMORY_SIZE)
+    content = spool
+    try:
+        copied = 0
+        with archive.open(member) as source:
+            # The header's size can lie; count what actually comes out of the decompressor
+            while chunk := source.read(COPY_CHUNK_SIZE):
+                copied += len(chunk)
+                if copied > limit:
+                    raise ValidationError(f'File is above the {limit} byte limit.')
+                spool.write(chunk)
+        spool.seek(0)
+
+        # Header only: rejects files that aren't images before anything is stored
+        try:
+            with Image.open(spool):
+                pass
+        except UnidentifiedImageError:
+            raise ValidationError('Not a valid image file.')
+        spool.seek(0)
+
+        image = GalleryImage(title=_title(filename), category=category, is_active=is_active)
+        image.image = File(spool, name=filename)
+        validate_image_pixels(image.image)
+
+        value = dhash(spool)
+        spool.seek(0)
+        if not allow_duplicates:
+            _check_duplicates(value, seen)
+        seen.add(value, member.filename)
+        for field, field_value in hash_fields(value).items():
+            setattr(image, field, field_value)
+
+        if settings.IMAGE_STRIP_METADATA:
+            image._strip_metadata()
+            content = image.image.file
+        image.image.save(filename, content, save=False)
+        return image
+    finally:
+        # Storage has its own copy by now; a large import would otherwise hold a temp file per member
+        content.close()
+        spool.close()
+
+
+def import_zip(archive, category, is_active=True, batch_size=50, progress=None, allow_duplicates=False):
+    """
+    Import every image in a ZIP archive (a path or file object) as GalleryImage rows.
+
+    Near-duplicates are skipped unless allow_duplicates is set. Returns
+    (ids, skipped) where skipped is a list of (filename, reason).
+    `progress`, if given, is called as progress(done, total) after each member.
+    """
+    ids, skipped, batch = [], [], []
+    # Hashes of this archive's images, so duplicates within it are caught before they're inserted
+    seen = BKTree()
+
+    def flush():
+        # Backends that can't return ids from bulk_create get them from the query below
+        created = GalleryImage.objects.bulk_create(batch)
+        if all(image.pk for image in created):
+            ids.extend(image.pk for image in created)
+        else:
+            names = [image.image.name for image in batch]
+            ids.extend(GalleryImage.objects.filter(image__in=names).values_list('id', flat=True))
+        batch.clear()
+
+    with zipfile.ZipFile(archive) as zf:
+        members = list(image_members(zf))
+        for index, member in enumerate(members, start=1):
+            try:
+                batch.append(_build_image(zf, member, category, is_active, seen, allow_duplicates))
+            except ValidationError as e:
+                skipped.append((member.filename, ' '.join(e.messages)))
+            except Exception as e:
+                skipped.append((member.filename, str(e)))
+            if len(batch) >= batch_size:
+                flush()
+            if progress:
+                progress(index, len(members))
+        if batch:
+            flush()
+
+    for filename, reason in skipped:
+        logger.warning(f"⚠️  Skipped {filename} from gallery import: {reason}")
+    if ids:
+        # bulk_create() bypasses post_save
+        bump_version(GalleryImage)
+    return ids, skipped
@@ -0,0 +1,84 @@
+"""
+Django management command that computes placeholders for existing images.
+
+Usage:
+    python manage.py backfill_placeholders              # rows without a placeholder
+    python manage.py backfill_placeholders --force      # recompute every placeholder
+
+New uploads get their placeholder from process_gallery_images; this command
+fills in rows created before placeholders existed. Decoding runs in a
+fixed-size process pool and each batch is written with one bulk_update().
+"""
+
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+from django.utils import timezone
+
+from apps.gallery.imaging import make_placeholder
+from apps.gallery.processing import PROCESSED_MODELS, placeholder_source
+from config.caching import bump_version
+
+
+class Command(BaseCommand):
+    help = 'Computes inline image placeholders for existing gallery images and services'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=settings.IMAGE_WORKERS, help='Worker processes')
+        parser.add_argument('--batch-size', type=int, default=100, help='Rows loaded and saved per batch')
+        parser.add_argument('--force', action='store_true', help='Recompute placeholders that already exist')
+
+    def _backfill(self, model, pool, batch_size, force):
+        main = model.IMAGE_FIELDS[0]
+        queryset = model.objects.exclude(Q(**{main: ''}) | Q(**{f'{main}__isnull': True}))
+        if not force:
+            queryset = queryset.filter(placeholder='')
+        ids = list(queryset.order_by('id').values_list('id', flat=True))
+
+        done = failed = 0
+        for start in range(0, len(ids), batch_size):
+            instances = list(model.objects.filter(id__in=ids[start:start + batch_size]).only('id', main))
+            futures = {}
+            for instance in instances:
+                try:
+                    source = placeholder_source(getattr(instance, main))
+                    futures[instance] = pool.submit(make_placeholder, source, max_pixels=settings.IMAGE_MAX_PIXELS)
+                except Exception as e:
+                    failed += 1
+                    self.stderr.write(f'   ❌ {model._meta.verbose_name} {instance.pk}: {e}')
+
+            updated = []
+            now = timezone.now()
+            for instance, future in futures.items():
+                try:
+                    instance.placeholder = future.result()
+                except Exception as e:
+                    failed += 1
+                    self.stderr.write(f'   ❌ {model._meta.verbose_name} {instance.pk}: {e}')
+                    continue
+                # Moves the ETag/Last-Modified of ConditionalGetMixin, so clients refetch
+                instance.updated_at = now
+                updated.append(instance)
+            model.objects.bulk_update(updated, ['placeholder', 'updated_at'])
+            done += len(updated)
+            self.stdout.write(f'   {model._meta.verbose_name_plural}: {done + failed}/{len(ids)}')
+
+        if done:
+            # bulk_update() bypasses post_save, so drop cached responses explicitly
+            bump_version(model)
+        return done, failed
+
+    def handle(self, *args, **options):
+        workers = max(options['workers'], 1)
+        self.stdout.write(f'🖼️  Backfilling placeholders ({workers} processes)')
+
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            for model in PROCESSED_MODELS:
+                done, failed = self._backfill(model, pool, max(options['batch_size'], 1), options['force'])
+                self.stdout.write(
+                    self.style.SUCCESS(f'✅ {model._meta.verbose_name_plural}: {done} placeholders, {failed} failed')
+                )
@@ -0,0 +1,126 @@
+"""
+Django management command that measures peak memory and time per image for
+the background image pipeline.
+
+Usage:
+    python manage.py benchmark_image_processing                  # 5 generated 6000x4000 photos
+    python manage.py benchmark_image_processing --dir ~/photos   # your own JPEGs
+
+"full decode" loads every original at full resolution before resizing (the
+pipeline before draft-mode decoding); "draft decode" is
+apps.gallery.imaging.process_image as run by process_gallery_images. Each
+image is processed in a fresh process, so the reported peak RSS is the
+memory one job needs on top of the worker's baseline.
+"""
+
+import multiprocessing
+import resource
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from PIL import Image, ImageOps
+
+from apps.gallery.imaging import (
+    EXIF_ORIENTATION, PLACEHOLDER_SIZE, RENDITION_QUALITY, RENDITION_WIDTHS, THUMBNAIL_SIZE, _encode, process_image,
+    rendition_formats,
+)
+
+
+def _full_decode(path, max_pixels):
+    with Image.open(path) as img:
+        img = ImageOps.exif_transpose(img).convert('RGB')
+        for width in RENDITION_WIDTHS:
+            resized = img.resize((width, round(img.height * width / img.width)), Image.Resampling.LANCZOS)
+            for image_format in rendition_formats():
+                _encode(resized, image_format.upper(), quality=RENDITION_QUALITY[image_format])
+        for size in (THUMBNAIL_SIZE, (PLACEHOLDER_SIZE, PLACEHOLDER_SIZE)):
+            thumbnail = img.copy()
+            thumbnail.thumbnail(size, Image.Resampling.LANCZOS)
+            _encode(thumbnail, 'WEBP')
+
+
+def _draft_decode(path, max_pixels):
+    process_image({'image': path}, thumbnail='image', placeholder='image', max_pixels=max_pixels)
+
+
+MODES = {'full decode': _full_decode, 'draft decode': _draft_decode}
+
+
+def _peak_rss():
+    """Peak RSS of this process in KiB."""
+    try:
+        # VmHWM belongs to this address space; ru_maxrss also counts the parent before exec
+        with open('/proc/self/status') as status:
+            for line in status:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def _measure(mode, path, max_pixels):
+    """Run one job in this (fresh) process; return (seconds, baseline KiB, peak KiB)."""
+    baseline = _peak_rss()
+    started = time.perf_counter()
+    MODES[mode](path, max_pixels)
+    elapsed = time.perf_counter() - started
+    return elapsed, baseline, _peak_rss()
+
+
+def _make_photo(path, width, height, orientation):
+    """Noisy gradient JPEG, so it compresses roughly like a real photo."""
+    channels = [
+        Image.blend(Image.linear_gradient('L').resize((width, height)), Image.effect_noise((width, height), 48), 0.4)
+        for _ in range(3)
+    ]
+    exif = Image.Exif()
+    exif[EXIF_ORIENTATION] = orientation
+    Image.merge('RGB', channels).save(path, 'JPEG', quality=90, exif=exif.tobytes())
+
+
+class Command(BaseCommand):
+    help = 'Benchmarks peak memory and time per image for full-resolution vs draft-mode decoding'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dir', help='Directory of JPEG photos to use instead of generated ones')
+        parser.add_argument('--count', type=int, default=5, help='Photos to generate')
+        parser.add_argument('--size', default='6000x4000', help='Generated photo size, WIDTHxHEIGHT')
+
+    def handle(self, *args, **options):
+        with tempfile.TemporaryDirectory() as workdir:
+            if options['dir']:
+                photos = sorted(
+                    path for path in Path(options['dir']).expanduser().iterdir()
+                    if path.suffix.lower() in ('.jpg', '.jpeg')
+                )
+            else:
+                width, height = (int(value) for value in options['size'].lower().split('x'))
+                photos = [Path(workdir) / f'photo-{index}.jpg' for index in range(options['count'])]
+                for index, path in enumerate(photos):
+                    # Mix upright and rotated phone photos
+                    _make_photo(path, width, height, 6 if index % 2 else 1)
+
+            if not photos:
+                self.stdout.write('No JPEG photos found')
+                return
+            self.stdout.write(f'Processing {len(photos)} photos')
+
+            context = multiprocessing.get_context('spawn')
+            for mode in MODES:
+                results = []
+                for path in photos:
+                    # One process per image so the peak RSS is that image's alone
+                    with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                        results.append(pool.submit(_measure, mode, str(path), settings.IMAGE_MAX_PIXELS).result())
+                seconds = sum(result[0] for result in results) / len(results)
+                peak = max(result[2] for result in results)
+                job = max(result[2] - result[1] for result in results)
+                self.stdout.write(
+                    f'   {mode:<13} {seconds * 1000:8.0f} ms/image   '
+                    f'peak RSS {peak / 1024:6.0f} MiB ({job / 1024:.0f} MiB above worker baseline)'
+                )
@@ -0,0 +1,163 @@
+"""
+Django management command that measures concurrent media throughput for
+django.views.static.serve and config.media.serve_media.
+
+Usage:
+    python manage.py benchmark_media_serving
+    python manage.py benchmark_media_serving --concurrency 32 --requests 4000 --size-kb 500
+
+Hashed files are written to a temporary media root and served by a threaded
+WSGI server (the runserver one) in a separate process, so the clients and
+the server don't share a GIL. Scenarios:
+
+- full: plain GET of the whole file
+- range: `Range: bytes=0-65535`, as sent by browsers resuming a download
+- revalidate: GET with the validator from a previous response (304)
+- x-accel: serve_media with MEDIA_ACCEL_REDIRECT_PREFIX set; only the
+  gunicorn side of the request is timed, nginx would send the body
+"""
+
+import http.client
+import multiprocessing
+import statistics
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import cycle, islice
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.management.base import BaseCommand
+from django.urls import re_path
+from django.views.static import serve
+
+from config.media import serve_media
+from config.storage import HashedFileSystemStorage
+
+
+def _static_serve(request, path):
+    return serve(request, path, document_root=settings.MEDIA_ROOT)
+
+
+# URLconf of the benchmark server process
+urlpatterns = [
+    re_path(r'^static-serve/(?P<path>.*)$', _static_serve),
+    re_path(r'^media/(?P<path>.*)$', serve_media),
+]
+
+
+def _serve(media_root, accel_prefix, ports):
+    """Run a threaded WSGI server for this module's URLconf; report its port on `ports`."""
+    from django.core.servers.basehttp import ThreadedWSGIServer, WSGIRequestHandler
+    from django.core.wsgi import get_wsgi_application
+
+    settings.ROOT_URLCONF = __name__
+    settings.MEDIA_ROOT = media_root
+    settings.MEDIA_ACCEL_REDIRECT_PREFIX = accel_prefix
+    settings.ALLOWED_HOSTS = ['127.0.0.1']
+    settings.SECURE_SSL_REDIRECT = False
+    settings.DEBUG = False
+
+    class QuietHandler(WSGIRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+    class Server(ThreadedWSGIServer):
+        request_queue_size = 256
+
+    httpd = Server(('127.0.0.1', 0), QuietHandler)
+    httpd.set_app(get_wsgi_application())
+    ports.put(httpd.server_port)
+    httpd.serve_forever()
+
+
+def _fetch(port, path, headers):
+    """GET one URL on a fresh connection; return (seconds, status, body bytes, response headers)."""
+    connection = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+    started = time.perf_counter()
+    connection.request('GET', path, headers=headers)
+    response = connection.getresponse()
+    body = response.read()
+    elapsed = time.perf_counter() - started
+    connection.close()
+    return elapsed, response.status, len(body), dict(response.getheaders())
+
+
+class Command(BaseCommand):
+    help = 'Benchmarks concurrent media requests for django.views.static.serve vs serve_media'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--files', type=int, default=20, help='Files to serve')
+        parser.add_argument('--size-kb', type=int, default=300, help='Size of each file in KiB')
+        parser.add_argument('--concurrency', type=int, default=16, help='Concurrent clients')
+        parser.add_argument('--requests', type=int, default=2000, help='Requests per scenario')
+
+    def _start_server(self, context, media_root, accel_prefix=''):
+        ports = context.Queue()
+        process = context.Process(target=_serve, args=(media_root, accel_prefix, ports), daemon=True)
+        process.start()
+        return process, ports.get(timeout=60)
+
+    def _run(self, label, port, paths, headers, options):
+        urls = list(islice(cycle(paths), options['requests']))
+        with ThreadPoolExecutor(max_workers=options['concurrency']) as pool:
+            # Warm up each thread's first import/connection
+            list(pool.map(lambda path: _fetch(port, path, headers(path)), urls[:options['concurrency']]))
+            started = time.perf_counter()
+            results = list(pool.map(lambda path: _fetch(port, path, headers(path)), urls))
+            elapsed = time.perf_counter() - started
+
+        latencies = sorted(result[0] * 1000 for result in results)
+        received = sum(result[2] for result in results)
+        statuses = sorted({result[1] for result in results})
+        sample = results[0][3]
+        p95 = latencies[int(len(latencies) * 0.95) - 1]
+        self.stdout.write(
+            f'   {label:<26} {len(results) / elapsed:8.0f} req/s  {received / elapsed / 2 ** 20:8.1f} MiB/s  '
+            f'p50 {statistics.median(latencies):6.1f} ms  p95 {p95:6.1f} ms  '
+            f'status {",".join(map(str, statuses))}  cache-control: {sample.get("Cache-Control", "-")}'
+        )
+
+    def handle(self, *args, **options):
+        context = multiprocessing.get_context('spawn')
+        with tempfile.TemporaryDirectory() as media_root:
+            storage = HashedFileSystemStorage(location=media_root)
+            names = [
+                storage.save(f'gallery/photo-{index}.jpg', ContentFile(bytes(range(256)) * (options['size_kb'] * 4)))
+                for index in range(max(options['files'], 1))
+            ]
+            self.stdout.write(
+                f"Serving {len(names)} files of {options['size_kb']} KiB to {options['concurrency']} clients, "
+                f"{options['requests']} requests per scenario"
+            )
+
+            server, port = self._start_server(context, media_root)
+            accel_server, accel_port = self._start_server(context, media_root, '/protected-media/')
+            try:
+                # Validators from a first response, for the revalidation scenarios
+                validators = {}
+                for name in names:
+                    response_headers = _fetch(port, f'/media/{name}', {})[3]
+                    validators[name] = response_headers['ETag'], response_headers['Last-Modified']
+
+                def revalidate_static(path):
+                    return {'If-Modified-Since': validators[path.split('/', 2)[2]][1]}
+
+                def revalidate_media(path):
+                    return {'If-None-Match': validators[path.split('/', 2)[2]][0]}
+
+                scenarios = [
+                    ('static.serve full', port, 'static-serve', lambda path: {}),
+                    ('serve_media full', port, 'media', lambda path: {}),
+                    ('static.serve range', port, 'static-serve', lambda path: {'Range': 'bytes=0-65535'}),
+                    ('serve_media range', port, 'media', lambda path: {'Range': 'bytes=0-65535'}),
+                    ('static.serve revalidate', port, 'static-serve', revalidate_static),
+                    ('serve_media revalidate', port, 'media', revalidate_media),
+                    ('serve_media x-accel', accel_port, 'media', lambda path: {}),
+                ]
+                for label, scenario_port, prefix, headers in scenarios:
+                    paths = [f'/{prefix}/{name}' for name in names]
+                    self._run(label, scenario_port, paths, headers, options)
+            finally:
+                server.terminate()
+                accel_server.terminate()
@@ -0,0 +1,87 @@
+"""
+Django management command that imports a photoshoot from a ZIP archive.
+
+Usage:
+    python manage.py import_gallery shoot.zip --category nails
+    python manage.py import_gallery shoot.zip --category lashes --inactive --workers 4
+
+Images are streamed out of the archive and inserted with bulk_create(); their
+thumbnails and renditions are then generated across a process pool. Rows
+still pending when the command stops are picked up by process_gallery_images.
+"""
+
+import multiprocessing
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.gallery.importing import import_zip
+from apps.gallery.models import GalleryImage
+from apps.gallery.processing import claim_images, process_images
+
+
+class Command(BaseCommand):
+    help = 'Imports every image in a ZIP archive into the gallery'
+
+    def add_arguments(self, parser):
+        parser.add_argument('archive', help='Path to the ZIP archive')
+        parser.add_argument(
+            '--category', required=True, choices=[value for value, _label in GalleryImage.CATEGORIES],
+            help='Category for the imported images',
+        )
+        parser.add_argument('--inactive', action='store_true', help='Import images hidden from the gallery')
+        parser.add_argument('--allow-duplicates', action='store_true', help='Import near-duplicate images too')
+        parser.add_argument('--workers', type=int, default=settings.IMAGE_WORKERS, help='Worker processes')
+        parser.add_argument('--batch-size', type=int, default=50, help='Rows per bulk insert')
+        parser.add_argument(
+            '--no-process', action='store_true',
+            help='Only import; leave thumbnails and renditions to process_gallery_images',
+        )
+
+    def _progress(self, label):
+        def report(done, total):
+            if done == total or done % 10 == 0:
+                self.stdout.write(f'   {label} {done}/{total}')
+        return report
+
+    def _process(self, ids, workers):
+        """Generate thumbnails and renditions for the imported rows."""
+        report = self._progress('Processed')
+        done = 0
+        # Enough per round to keep every process busy
+        chunk_size = workers * 4
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            for start in range(0, len(ids), chunk_size):
+                # Rows already claimed by a running worker are skipped here
+                claimed = claim_images(GalleryImage, chunk_size, ids=ids[start:start + chunk_size])
+                done += process_images(GalleryImage, claimed, pool)
+                report(min(start + chunk_size, len(ids)), len(ids))
+        return done
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        self.stdout.write(f"📦 Importing {options['archive']}")
+        try:
+            ids, skipped = import_zip(
+                options['archive'], options['category'], is_active=not options['inactive'],
+                batch_size=max(options['batch_size'], 1), progress=self._progress('Stored'),
+                allow_duplicates=options['allow_duplicates'],
+            )
+        except (OSError, zipfile.BadZipFile) as e:
+            raise CommandError(f'Could not read {options["archive"]}: {e}')
+
+        for filename, reason in skipped:
+            self.stderr.write(f'   ❌ Skipped {filename}: {reason}')
+
+        processed = 0
+        if ids and not options['no_process']:
+            processed = self._process(ids, max(options['workers'], 1))
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ Imported {len(ids)} images ({len(skipped)} skipped, {processed} processed) in {elapsed:.1f}s'
+        ))
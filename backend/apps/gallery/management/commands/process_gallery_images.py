@@ -0,0 +1,81 @@
+"""
+Django management command that processes gallery and service images in the background.
+
+Usage:
+    python manage.py process_gallery_images                # run forever, polling for pending images
+    python manage.py process_gallery_images --once         # process what is pending now and exit
+    python manage.py process_gallery_images --missing --once   # also queue images missing any output
+
+Each pending row gets WebP (and AVIF, when Pillow can encode it) renditions
+at several widths, plus a thumbnail for gallery images and a side-by-side
+composite for Before & After ones. Pillow work runs in
+a fixed-size process pool, so resizing never blocks a web worker and CPU use
+stays bounded however many images are uploaded.
+"""
+
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from apps.gallery.processing import (
+    PROCESSED_MODELS, claim_images, process_images, requeue_missing_composites, requeue_missing_hashes,
+    requeue_missing_renditions, requeue_missing_thumbnails,
+)
+
+
+class Command(BaseCommand):
+    help = 'Generates thumbnails and responsive renditions off the request path with a bounded process pool'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Process pending images and exit')
+        parser.add_argument('--workers', type=int, default=settings.IMAGE_WORKERS, help='Worker processes')
+        parser.add_argument('--batch-size', type=int, default=20, help='Rows claimed per model per poll')
+        parser.add_argument(
+            '--interval', type=float, default=settings.IMAGE_POLL_INTERVAL,
+            help='Seconds to sleep when nothing is pending',
+        )
+        parser.add_argument(
+            '--missing', action='store_true', help='Queue images without a thumbnail, renditions, perceptual hash or composite',
+        )
+        parser.add_argument('--retry-failed', action='store_true', help='Queue rows whose processing failed')
+
+    def handle(self, *args, **options):
+        if options['missing']:
+            queued = (
+                requeue_missing_thumbnails() + requeue_missing_renditions() + requeue_missing_hashes()
+                + requeue_missing_composites()
+            )
+            self.stdout.write(f'   Queued {queued} rows without a thumbnail, renditions, hash or composite')
+        if options['retry_failed']:
+            queued = sum(
+                model.objects.filter(processing_status='failed').update(
+                    processing_status='pending', processing_attempts=0, processing_error='',
+                )
+                for model in PROCESSED_MODELS
+            )
+            self.stdout.write(f'   Queued {queued} failed rows')
+
+        workers = max(options['workers'], 1)
+        self.stdout.write(f'🖼️  Gallery image worker started ({workers} processes)')
+
+        # Spawned children start clean: no inherited database connections or threads
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            while True:
+                claimed = 0
+                for model in PROCESSED_MODELS:
+                    ids = claim_images(model, options['batch_size'])
+                    if ids:
+                        done = process_images(model, ids, pool)
+                        claimed += len(ids)
+                        self.stdout.write(f'   Processed {done}/{len(ids)} {model._meta.verbose_name_plural}')
+                if claimed:
+                    continue
+                if options['once']:
+                    break
+                close_old_connections()
+                time.sleep(options['interval'])
@@ -0,0 +1,45 @@
+# Generated by Django 4.2.7 on 2026-10-18 09:12
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def mark_existing_images(apps, schema_editor):
+    """Existing images already went through inline thumbnail generation; don't queue them again."""
+    GalleryImage = apps.get_model('gallery', 'GalleryImage')
+    # Same check as is_cloudinary_storage(); STORAGES mirrors DEFAULT_FILE_STORAGE
+    if 'cloudinary' in settings.STORAGES['default']['BACKEND'].lower():
+        GalleryImage.objects.update(processing_status='skipped')
+    else:
+        GalleryImage.objects.exclude(thumbnail='').exclude(thumbnail__isnull=True).update(processing_status='done')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gallery', '0003_remove_studio_category'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='galleryimage',
+            name='processing_attempts',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='galleryimage',
+            name='processing_error',
+            field=models.TextField(blank=True),
+        ),
+        migrations.AddField(
+            model_name='galleryimage',
+            name='processing_started_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='galleryimage',
+            name='processing_status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('processing', 'Processing'), ('done', 'Done'), ('failed', 'Failed'), ('skipped', 'Skipped')], default='pending', help_text='State of background thumbnail generation', max_length=20),
+        ),
+        migrations.RunPython(mark_existing_images, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 4.2.7 on 2026-10-18 09:14
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def queue_existing_images(apps, schema_editor):
+    """Queue existing images so the worker builds their renditions."""
+    # Same check as is_cloudinary_storage(); STORAGES mirrors DEFAULT_FILE_STORAGE
+    if 'cloudinary' in settings.STORAGES['default']['BACKEND'].lower():
+        return
+    GalleryImage = apps.get_model('gallery', 'GalleryImage')
+    GalleryImage.objects.exclude(image='').update(processing_status='pending', processing_attempts=0)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gallery', '0004_galleryimage_processing'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='galleryimage',
+            name='renditions',
+            field=models.JSONField(blank=True, default=dict, help_text='Generated image renditions'),
+        ),
+        migrations.AlterField(
+            model_name='galleryimage',
+            name='processing_status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('processing', 'Processing'), ('done', 'Done'), ('failed', 'Failed'), ('skipped', 'Skipped')], default='pending', help_text='State of background image processing', max_length=20),
+        ),
+        migrations.RunPython(queue_existing_images, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-18 09:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gallery', '0005_galleryimage_renditions'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='galleryimage',
+            name='placeholder',
+            field=models.TextField(blank=True, help_text='Tiny data URI preview of the main image, shown while it loads'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 4.2.7 on 2026-10-18 09:18
+
+import apps.gallery.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gallery', '0006_galleryimage_placeholder'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='galleryimage',
+            name='comparison_image',
+            field=models.ImageField(blank=True, help_text="Comparison image (for 'Before & After' category - displays side by side)", null=True, upload_to='gallery/', validators=[apps.gallery.validators.validate_image_pixels]),
+        ),
+        migrations.AlterField(
+            model_name='galleryimage',
+            name='image',
+            field=models.ImageField(help_text='Gallery image', upload_to='gallery/', validators=[apps.gallery.validators.validate_image_pixels]),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 4.2.7 on 2026-10-18 09:25
+
+from django.db import migrations, models
+
+
+def queue_existing_images(apps, schema_editor):
+    """Queue existing images so the worker computes their perceptual hashes."""
+    GalleryImage = apps.get_model('gallery', 'GalleryImage')
+    GalleryImage.objects.exclude(image='').update(processing_status='pending', processing_attempts=0)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gallery', '0007_image_pixel_validators'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='galleryimage',
+            name='hash_band_0',
+            field=models.IntegerField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='galleryimage',
+            name='hash_band_1',
+            field=models.IntegerField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='galleryimage',
+            name='hash_band_2',
+            field=models.IntegerField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='galleryimage',
+            name='hash_band_3',
+            field=models.IntegerField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='galleryimage',
+            name='image_hash',
+            field=models.BigIntegerField(blank=True, db_index=True, help_text='Perceptual hash of the image', null=True),
+        ),
+        migrations.RunPython(queue_existing_images, migrations.RunPython.noop),
+    ]
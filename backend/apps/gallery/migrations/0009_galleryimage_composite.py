@@ -0,0 +1,27 @@
+# Generated by Django 4.2.7 on 2026-10-18 09:34
+
+from django.db import migrations, models
+
+
+def queue_before_after_images(apps, schema_editor):
+    """Queue existing Before & After images so the worker renders their composites."""
+    GalleryImage = apps.get_model('gallery', 'GalleryImage')
+    GalleryImage.objects.filter(category='before_after').exclude(image='').exclude(comparison_image='').exclude(
+        comparison_image__isnull=True,
+    ).update(processing_status='pending', processing_attempts=0)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gallery', '0008_galleryimage_image_hash'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='galleryimage',
+            name='composite',
+            field=models.ImageField(blank=True, help_text='Before & After images side by side (auto-generated)', null=True, upload_to='gallery/composites/'),
+        ),
+        migrations.RunPython(queue_before_after_images, migrations.RunPython.noop),
+    ]
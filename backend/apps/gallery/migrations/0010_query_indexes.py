@@ -0,0 +1,25 @@
+# Generated by Django 4.2.7 on 2026-10-18 09:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gallery', '0009_galleryimage_composite'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='galleryimage',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['-sort_order', '-is_featured', '-created_at'], name='gallery_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='galleryimage',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['category', '-sort_order', '-is_featured', '-created_at'], name='gallery_category_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='galleryimage',
+            index=models.Index(condition=models.Q(('is_active', True), ('is_featured', True)), fields=['-sort_order', '-is_featured', '-created_at'], name='gallery_featured_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-18 10:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gallery', '0010_query_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='galleryimage',
+            name='upload_checks_pending',
+            field=models.BooleanField(default=False, help_text='Uploaded straight to storage; the worker still runs the upload checks'),
+        ),
+    ]
@@ -1,8 +1,157 @@
+import logging
+import tempfile
+
 from django.db import models
 from django.conf import settings
+from django.core.files import File
+from PIL import Image
+
+from .imaging import EXIF_ORIENTATION, strip_jpeg_metadata
+from .validators import validate_image_pixels
+
+logger = logging.getLogger(__name__)
+
+
+def is_cloudinary_storage():
+    """Check whether media files are stored on Cloudinary."""
+    # STORAGES mirrors DEFAULT_FILE_STORAGE; reading the latter directly builds a deprecation traceback each time
+    return 'cloudinary' in settings.STORAGES['default']['BACKEND'].lower()
+
+
+def strip_upload_metadata(upload, name=None):
+    """
+    Return a copy of a JPEG upload without EXIF/XMP/IPTC metadata (keeps orientation); other files as-is.
+
+    Multi-picture JPEGs from phones (Pillow's 'MPO') are kept as their primary image.
+    """
+    try:
+        upload.seek(0)
+        with Image.open(upload) as img:
+            if img.format not in ('JPEG', 'MPO'):
+                upload.seek(0)
+                return upload
+            orientation = img.getexif().get(EXIF_ORIENTATION, 1)
+        upload.seek(0)
+        # Same memory/disk split Django uses for uploads
+        cleaned = tempfile.SpooledTemporaryFile(max_size=settings.FILE_UPLOAD_MAX_MEMORY_SIZE)
+        strip_jpeg_metadata(upload, cleaned, orientation)
+    except Exception as e:
+        logger.warning(f"⚠️  Could not strip metadata from {name or upload.name}: {e}")
+        upload.seek(0)
+        return upload
+    cleaned.seek(0)
+    return File(cleaned, name=upload.name)
+
+
+class ProcessedImageModel(models.Model):
+    """
+    Abstract base for models whose images are processed in the background.
+
+    Subclasses list their ImageFields in IMAGE_FIELDS, main image first.
+    Uploading a new file to any of them queues the row for
+    `manage.py process_gallery_images`, which writes resized WebP/AVIF
+    renditions (recorded in `renditions`) and a `placeholder` for the main
+    image.
+    """
+    
+    PROCESSING_STATUSES = [
+        ('pending', 'Pending'),
+        ('processing', 'Processing'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+        ('skipped', 'Skipped'),
+    ]
+    
+    # Names of the ImageFields that get renditions
+    IMAGE_FIELDS = ()
+    # Name of the field to store an auto-generated thumbnail in, if any
+    THUMBNAIL_FIELD = None
+    # Name of the field to compute a perceptual hash of, if any (see apps.gallery.duplicates)
+    HASH_FIELD = None
+    # ImageField storing a side-by-side composite of the COMPOSITE_SOURCES (before, after) pair, if any
+    COMPOSITE_FIELD = None
+    COMPOSITE_SOURCES = ()
+    
+    processing_status = models.CharField(
+        max_length=20,
+        choices=PROCESSING_STATUSES,
+        default='pending',
+        help_text="State of background image processing"
+    )
+    processing_attempts = models.PositiveIntegerField(default=0)
+    processing_error = models.TextField(blank=True)
+    processing_started_at = models.DateTimeField(blank=True, null=True)
+    # {field: {'source', 'width', 'height', 'formats': {format: [{'width', 'height', 'name'}]}}}
+    renditions = models.JSONField(default=dict, blank=True, help_text="Generated image renditions")
+    placeholder = models.TextField(
+        blank=True,
+        help_text="Tiny data URI preview of the main image, shown while it loads"
+    )
+    upload_checks_pending = models.BooleanField(
+        default=False,
+        help_text="Uploaded straight to storage; the worker still runs the upload checks"
+    )
+    
+    class Meta:
+        abstract = True
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored images so save() can tell when a new one is uploaded
+        instance._loaded_image_names = {field: instance.__dict__.get(field) for field in cls.IMAGE_FIELDS}
+        return instance
+    
+    def _image_names(self):
+        return {field: getattr(self, field).name or None for field in self.IMAGE_FIELDS}
+    
+    def _needs_processing(self, names, loaded):
+        """Whether a save should queue the row: any image was replaced."""
+        return any(name and name != loaded.get(field) for field, name in names.items())
+    
+    @classmethod
+    def rendition_fields(cls):
+        """Fields that get renditions: IMAGE_FIELDS plus the composite, if any."""
+        return cls.IMAGE_FIELDS + ((cls.COMPOSITE_FIELD,) if cls.COMPOSITE_FIELD else ())
+    
+    def wants_composite(self):
+        """Whether the worker should render the composite (both COMPOSITE_SOURCES are set)."""
+        return bool(self.COMPOSITE_FIELD) and all(getattr(self, field) for field in self.COMPOSITE_SOURCES)
+    
+    def _strip_metadata(self):
+        """Swap new JPEG uploads for a copy without EXIF/XMP/IPTC metadata (keeps orientation)."""
+        for field in self.IMAGE_FIELDS:
+            field_file = getattr(self, field)
+            if not field_file or field_file._committed:
+                continue
+            field_file.file = strip_upload_metadata(field_file.file, field_file.name)
+    
+    def save(self, *args, **kwargs):
+        """Override save to queue image processing when a new image is uploaded."""
+        if settings.IMAGE_STRIP_METADATA:
+            self._strip_metadata()
+        names = self._image_names()
+        loaded = getattr(self, '_loaded_image_names', {})
+        if self._needs_processing(names, loaded):
+            # Images are processed off the request path by `manage.py process_gallery_images`.
+            # With Cloudinary, only the placeholder is built there; renditions are URL transformations.
+            self.processing_status = 'pending'
+            self.processing_attempts = 0
+            self.processing_error = ''
+            changed = {'processing_status', 'processing_attempts', 'processing_error'}
+            main = self.IMAGE_FIELDS[0]
+            if names[main] != loaded.get(main):
+                # The old preview would flash the previous image
+                self.placeholder = ''
+                changed.add('placeholder')
+            if kwargs.get('update_fields') is not None:
+                kwargs['update_fields'] = set(kwargs['update_fields']) | changed
+        
+        super().save(*args, **kwargs)
+        self._loaded_image_names = self._image_names()
 
 
-class GalleryImage(models.Model):
+class GalleryImage(ProcessedImageModel):
     """Model for gallery images showcasing work."""
     
     CATEGORIES = [
@@ -12,14 +161,21 @@ class GalleryImage(models.Model):
         ('other', 'Other'),
     ]
     
+    IMAGE_FIELDS = ('image', 'comparison_image')
+    THUMBNAIL_FIELD = 'image'
+    HASH_FIELD = 'image'
+    COMPOSITE_FIELD = 'composite'
+    COMPOSITE_SOURCES = ('image', 'comparison_image')
+    
     title = models.CharField(max_length=200, help_text="Image title")
     description = models.TextField(blank=True, help_text="Image description")
     category = models.CharField(max_length=20, choices=CATEGORIES, help_text="Image category")
-    image = models.ImageField(upload_to='gallery/', help_text="Gallery image")
+    image = models.ImageField(upload_to='gallery/', validators=[validate_image_pixels], help_text="Gallery image")
     comparison_image = models.ImageField(
         upload_to='gallery/', 
         blank=True, 
         null=True,
+        validators=[validate_image_pixels],
         help_text="Comparison image (for 'Before & After' category - displays side by side)"
     )
     thumbnail = models.ImageField(
@@ -28,9 +184,24 @@ class GalleryImage(models.Model):
         null=True,
         help_text="Thumbnail image (auto-generated if not provided)"
     )
+    composite = models.ImageField(
+        upload_to='gallery/composites/',
+        blank=True,
+        null=True,
+        help_text="Before & After images side by side (auto-generated)"
+    )
     is_featured = models.BooleanField(default=False, help_text="Show on homepage")
     is_active = models.BooleanField(default=True, help_text="Visible in gallery")
     sort_order = models.PositiveIntegerField(default=0, help_text="Sort order (higher = first)")
+    
+    # Perceptual (dHash) hash of `image` for near-duplicate detection, stored signed,
+    # plus its four 16-bit bands for indexed lookups
+    image_hash = models.BigIntegerField(blank=True, null=True, db_index=True, help_text="Perceptual hash of the image")
+    hash_band_0 = models.IntegerField(blank=True, null=True, db_index=True)
+    hash_band_1 = models.IntegerField(blank=True, null=True, db_index=True)
+    hash_band_2 = models.IntegerField(blank=True, null=True, db_index=True)
+    hash_band_3 = models.IntegerField(blank=True, null=True, db_index=True)
+    
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
@@ -38,41 +209,43 @@ class GalleryImage(models.Model):
         ordering = ['-sort_order', '-is_featured', '-created_at']
         verbose_name = "Gallery Image"
         verbose_name_plural = "Gallery Images"
+        indexes = [
+            # Public list in its default order, by category, and featured only
+            models.Index(
+                fields=['-sort_order', '-is_featured', '-created_at'], condition=models.Q(is_active=True),
+                name='gallery_active_idx',
+            ),
+            models.Index(
+                fields=['category', '-sort_order', '-is_featured', '-created_at'], condition=models.Q(is_active=True),
+                name='gallery_category_idx',
+            ),
+            models.Index(
+                fields=['-sort_order', '-is_featured', '-created_at'],
+                condition=models.Q(is_active=True, is_featured=True),
+                name='gallery_featured_idx',
+            ),
+        ]
     
     def __str__(self):
         return f"{self.title} ({self.category})"
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_category = instance.__dict__.get('category')
+        return instance
+    
     def save(self, *args, **kwargs):
-        """Override save to auto-generate thumbnail if not provided."""
-        # Check if using Cloudinary storage
-        is_cloudinary = 'cloudinary' in settings.DEFAULT_FILE_STORAGE.lower() if hasattr(settings, 'DEFAULT_FILE_STORAGE') else False
-        
         super().save(*args, **kwargs)
-        
-        # Auto-generate thumbnail if not provided and using local storage
-        # Note: With Cloudinary, thumbnails can be generated on-the-fly via URL transformations
-        # So we skip auto-generation when using Cloudinary
-        if not self.thumbnail and self.image and not is_cloudinary:
-            # Only generate thumbnail for local storage
-            try:
-                # Check if image has .path (local storage)
-                if hasattr(self.image, 'path') and self.image.path:
-                    from PIL import Image
-                    import os
-                    
-                    # Create thumbnail
-                    img = Image.open(self.image.path)
-                    img.thumbnail((300, 300), Image.Resampling.LANCZOS)
-                    
-                    # Save thumbnail
-                    thumb_path = self.image.path.replace('gallery/', 'gallery/thumbnails/')
-                    thumb_dir = os.path.dirname(thumb_path)
-                    os.makedirs(thumb_dir, exist_ok=True)
-                    
-                    img.save(thumb_path)
-                    self.thumbnail.name = thumb_path.replace(settings.MEDIA_ROOT + '/', '')
-                    super().save(*args, **kwargs)
-            except (AttributeError, OSError, Exception):
-                # Cloudinary storage or any error - skip thumbnail generation
-                # Thumbnails can be generated via Cloudinary URL transformations instead
-                pass
+        self._loaded_category = self.category
+    
+    def _needs_processing(self, names, loaded):
+        # Moving into or out of Before & After adds or removes the composite
+        loaded_category = getattr(self, '_loaded_category', None)
+        category_changed = loaded_category is not None and (
+            (loaded_category == 'before_after') != (self.category == 'before_after')
+        )
+        return super()._needs_processing(names, loaded) or (category_changed and bool(self.comparison_image))
+    
+    def wants_composite(self):
+        return settings.IMAGE_COMPOSITES and self.category == 'before_after' and super().wants_composite()
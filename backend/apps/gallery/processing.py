@@ -0,0 +1,337 @@
+"""
+Background processing for gallery and service images.
+
+ProcessedImageModel.save() marks rows with a new upload as 'pending'; the
+process_gallery_images management command claims pending rows, runs the
+Pillow work (thumbnail, WebP/AVIF renditions and the Before & After
+composite) in a process pool and records the outcome on each row. A job is idempotent: re-running it
+overwrites the same files.
+
+With Cloudinary storage a job only builds the placeholder, from a small
+transformation of the main image, and the composite, which is uploaded;
+renditions come from Cloudinary URLs.
+
+Direct uploads (apps.gallery.uploads) reach storage without the checks a
+form upload gets, so their rows carry `upload_checks_pending` and the
+worker runs those checks first: on Cloudinary the original is downloaded
+once to enforce the pixel cap (an oversized image is deleted) and strip
+JPEG metadata. Once the hash is computed, a gallery image that looks like
+one already in the gallery is hidden, with the match noted in
+processing_error for staff to review.
+"""
+import logging
+import os
+from concurrent.futures import as_completed
+from io import BytesIO
+from datetime import timedelta
+
+import requests
+from django.conf import settings
+from django.core.files import File
+from django.core.files.base import ContentFile
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from PIL import Image
+
+from config.caching import bump_version
+from apps.services.models import Service
+from .duplicates import find_near_duplicates, hash_fields
+from .imaging import ImageTooLarge, check_pixels, process_image
+from .models import GalleryImage, is_cloudinary_storage, strip_upload_metadata
+from .renditions import cloudinary_url, manifest_entry, manifest_names, rendition_name
+
+logger = logging.getLogger(__name__)
+
+# Models handled by the worker, in the order they are polled
+PROCESSED_MODELS = [GalleryImage, Service]
+# Width of the Cloudinary transformation placeholders are built from
+PLACEHOLDER_SOURCE_WIDTH = 64
+# Width of the Cloudinary transformations composites are built from
+COMPOSITE_SOURCE_WIDTH = 1280
+
+
+def claim_images(model, limit, ids=None):
+    """
+    Claim up to `limit` pending rows of `model` and return their ids.
+
+    Rows stuck in 'processing' longer than IMAGE_PROCESSING_LEASE_SECONDS
+    (a worker died mid-job) are claimed again. Pass `ids` to only claim
+    among those rows.
+    """
+    now = timezone.now()
+    stale = now - timedelta(seconds=settings.IMAGE_PROCESSING_LEASE_SECONDS)
+    queryset = model.objects.filter(
+        Q(processing_status='pending') | Q(processing_status='processing', processing_started_at__lt=stale)
+    )
+    if ids is not None:
+        queryset = queryset.filter(id__in=ids)
+    with transaction.atomic():
+        claimed = list(
+            queryset.select_for_update(skip_locked=True).order_by('id').values_list('id', flat=True)[:limit]
+        )
+        model.objects.filter(id__in=claimed).update(processing_status='processing', processing_started_at=now)
+    return claimed
+
+
+def requeue_missing_thumbnails():
+    """Queue every gallery image without a thumbnail. Returns the number queued."""
+    if is_cloudinary_storage():
+        return 0
+    return GalleryImage.objects.filter(
+        Q(thumbnail='') | Q(thumbnail__isnull=True),
+    ).exclude(image='').exclude(processing_status__in=['processing', 'skipped']).update(
+        processing_status='pending', processing_attempts=0, processing_error='',
+    )
+
+
+def requeue_missing_renditions():
+    """Queue every row with an image but no renditions. Returns the number queued."""
+    if is_cloudinary_storage():
+        return 0
+    queued = 0
+    for model in PROCESSED_MODELS:
+        has_image = Q()
+        for field in model.IMAGE_FIELDS:
+            has_image |= ~Q(**{field: ''}) & Q(**{f'{field}__isnull': False})
+        queued += model.objects.filter(has_image, renditions={}).exclude(
+            processing_status__in=['processing', 'skipped'],
+        ).update(processing_status='pending', processing_attempts=0, processing_error='')
+    return queued
+
+
+def requeue_missing_composites():
+    """Queue Before & After gallery images that should have a composite but don't. Returns the number queued."""
+    if not settings.IMAGE_COMPOSITES:
+        return 0
+    return GalleryImage.objects.filter(
+        Q(composite='') | Q(composite__isnull=True), category='before_after',
+    ).exclude(image='').exclude(Q(comparison_image='') | Q(comparison_image__isnull=True)).exclude(
+        processing_status__in=['processing', 'skipped'],
+    ).update(processing_status='pending', processing_attempts=0, processing_error='')
+
+
+def requeue_missing_hashes():
+    """Queue every gallery image that has no perceptual hash yet. Returns the number queued."""
+    return GalleryImage.objects.filter(image_hash__isnull=True).exclude(image='').exclude(
+        processing_status='processing',
+    ).update(processing_status='pending', processing_attempts=0, processing_error='')
+
+
+def _source(field_file):
+    """Path for local storage (avoids pickling the file), bytes otherwise."""
+    try:
+        return field_file.path
+    except NotImplementedError:
+        with field_file.open('rb') as f:
+            return f.read()
+
+
+def placeholder_source(field_file):
+    """
+    Source to build a placeholder from.
+
+    On Cloudinary, a small transformation is downloaded instead of the original.
+    """
+    if not is_cloudinary_storage():
+        return _source(field_file)
+    response = requests.get(cloudinary_url(field_file, PLACEHOLDER_SOURCE_WIDTH, 'jpg'), timeout=10)
+    response.raise_for_status()
+    return response.content
+
+
+def composite_source(field_file):
+    """Source to render a composite from; on Cloudinary, a transformation no wider than needed."""
+    if not is_cloudinary_storage():
+        return _source(field_file)
+    response = requests.get(cloudinary_url(field_file, COMPOSITE_SOURCE_WIDTH, 'jpg'), timeout=30)
+    response.raise_for_status()
+    return response.content
+
+
+def _submit(pool, instance):
+    main = instance.IMAGE_FIELDS[0]
+    composite = None
+    if instance.wants_composite():
+        composite = tuple(composite_source(getattr(instance, field)) for field in instance.COMPOSITE_SOURCES)
+
+    if is_cloudinary_storage():
+        sources = {main: placeholder_source(getattr(instance, main))} if getattr(instance, main) else {}
+        return pool.submit(
+            process_image, sources, placeholder=main if sources else None, renditions=False,
+            max_pixels=settings.IMAGE_MAX_PIXELS,
+            perceptual_hash=main if main in sources and instance.HASH_FIELD == main else None,
+            composite=composite,
+        )
+
+    sources = {
+        field: _source(getattr(instance, field))
+        for field in instance.IMAGE_FIELDS if getattr(instance, field)
+    }
+    thumbnail = instance.THUMBNAIL_FIELD if instance.THUMBNAIL_FIELD in sources else None
+    return pool.submit(
+        process_image, sources, thumbnail, placeholder=main if main in sources else None,
+        max_pixels=settings.IMAGE_MAX_PIXELS,
+        perceptual_hash=instance.HASH_FIELD if instance.HASH_FIELD in sources else None,
+        composite=composite,
+    )
+
+
+def _replace(storage, name, data, previous=None):
+    # Same base name every run, so retries replace the file instead of piling up copies.
+    # Hashed storage saves under a new name; `previous` is the name it replaces.
+    if storage.exists(name):
+        storage.delete(name)
+    saved = storage.save(name, ContentFile(data))
+    if previous and previous != saved and storage.exists(previous):
+        storage.delete(previous)
+    return saved
+
+
+def _save_composite(instance, data):
+    """Store (or, with no data, remove) the row's composite; return its new name."""
+    field_file = getattr(instance, instance.COMPOSITE_FIELD)
+    previous = field_file.name
+    if data is None:
+        if previous:
+            field_file.storage.delete(previous)
+        return ''
+    upload_to = instance._meta.get_field(instance.COMPOSITE_FIELD).upload_to
+    return _replace(field_file.storage, f'{upload_to}{instance._meta.model_name}-{instance.pk}.jpg', data, previous)
+
+
+def _save_results(instance, result):
+    """Store the job's files and return the fields to update on the row."""
+    updates = {}
+    if result['placeholder'] is not None:
+        updates['placeholder'] = result['placeholder']
+    if result['hash'] is not None:
+        updates.update(hash_fields(result['hash']))
+    if instance.COMPOSITE_FIELD:
+        updates[instance.COMPOSITE_FIELD] = _save_composite(instance, result['composite'])
+        # So the manifest below records the new composite as the renditions' source
+        setattr(instance, instance.COMPOSITE_FIELD, updates[instance.COMPOSITE_FIELD])
+    if is_cloudinary_storage():
+        return updates
+
+    if result['thumbnail'] is not None:
+        source = getattr(instance, instance.THUMBNAIL_FIELD)
+        updates['thumbnail'] = _replace(
+            instance.thumbnail.storage, f'gallery/thumbnails/{os.path.basename(source.name)}', result['thumbnail'],
+            previous=instance.thumbnail.name,
+        )
+
+    manifest = {}
+    for field, (original_size, renditions) in result['renditions'].items():
+        field_file = getattr(instance, field)
+        stored = [
+            (image_format, width, height,
+             _replace(field_file.storage, rendition_name(instance, field, width, image_format), data))
+            for image_format, width, height, data in renditions
+        ]
+        manifest[field] = manifest_entry(field_file.name, original_size, stored)
+
+    # Drop renditions of replaced or removed images
+    for name in manifest_names(instance.renditions) - manifest_names(manifest):
+        instance.image.storage.delete(name)
+    updates['renditions'] = manifest
+    return updates
+
+
+def _check_direct_upload(instance):
+    """
+    Run the pixel cap and metadata stripping a Cloudinary direct upload skipped; return a note for staff.
+
+    Changes are written to the row straight away, so a retry doesn't see the
+    deleted or replaced file. Local direct uploads were already checked by
+    store_local_upload.
+    """
+    if not is_cloudinary_storage():
+        return ''
+    updates, notes = {}, []
+    for field in instance.IMAGE_FIELDS:
+        field_file = getattr(instance, field)
+        if not field_file:
+            continue
+        with field_file.open('rb') as f:
+            upload = File(BytesIO(f.read()), name=field_file.name)
+        try:
+            with Image.open(upload) as img:
+                check_pixels(img, settings.IMAGE_MAX_PIXELS)
+        except ImageTooLarge as e:
+            logger.warning(f"⚠️  Removed {field_file.name} from {instance._meta.verbose_name} {instance.pk}: {e}")
+            field_file.storage.delete(field_file.name)
+            updates[field] = ''
+            notes.append(f'Removed {field}: {e}')
+            if isinstance(instance, GalleryImage):
+                updates['is_active'] = False
+            continue
+        if settings.IMAGE_STRIP_METADATA:
+            cleaned = strip_upload_metadata(upload)
+            if cleaned is not upload:
+                updates[field] = _replace(field_file.storage, field_file.name, cleaned.read())
+    for field, name in updates.items():
+        setattr(instance, field, name)
+    if updates:
+        type(instance).objects.filter(pk=instance.pk).update(**updates)
+    return '; '.join(notes)
+
+
+def _duplicate_check(instance, value):
+    """Hide a directly uploaded gallery image that looks like one already in the gallery; return (updates, note)."""
+    matches = find_near_duplicates(value, exclude_pk=instance.pk)
+    if not matches:
+        return {}, ''
+    titles = ', '.join(f'"{match.title}" (#{match.pk})' for match, _distance in matches[:3])
+    logger.warning(f"⚠️  Hid gallery image {instance.pk}: looks like a duplicate of {titles}")
+    return {'is_active': False}, f'Hidden: looks like a duplicate of {titles}. Activate it to keep it.'
+
+
+def _record_failure(model, pk, error):
+    logger.error(f"Processing {model._meta.verbose_name} {pk} failed: {error}")
+    attempts = model.objects.filter(pk=pk).values_list('processing_attempts', flat=True).first() or 0
+    model.objects.filter(pk=pk).update(
+        processing_status='failed' if attempts + 1 >= settings.IMAGE_PROCESSING_MAX_ATTEMPTS else 'pending',
+        processing_attempts=F('processing_attempts') + 1,
+        processing_error=str(error),
+    )
+
+
+def process_images(model, ids, pool):
+    """Process the claimed rows of `model` on the given executor. Returns the number done."""
+    instances = {instance.pk: instance for instance in model.objects.filter(id__in=ids)}
+    futures, notes = {}, {}
+    for pk, instance in instances.items():
+        try:
+            if instance.upload_checks_pending:
+                notes[pk] = _check_direct_upload(instance)
+            futures[_submit(pool, instance)] = pk
+        except Exception as e:
+            _record_failure(model, pk, e)
+
+    done = 0
+    for future in as_completed(futures):
+        pk = futures[future]
+        instance = instances[pk]
+        try:
+            result = future.result()
+            updates = _save_results(instance, result)
+        except Exception as e:
+            _record_failure(model, pk, e)
+            continue
+        note = notes.get(pk, '')
+        if instance.upload_checks_pending:
+            updates['upload_checks_pending'] = False
+            if result['hash'] is not None:
+                hidden, duplicate_note = _duplicate_check(instance, result['hash'])
+                updates.update(hidden)
+                note = '; '.join(filter(None, [note, duplicate_note]))
+        # A new upload during the job has set the row back to 'pending'; leave it queued
+        done += model.objects.filter(pk=pk, processing_status='processing').update(
+            processing_status='done', processing_error=note, updated_at=timezone.now(), **updates,
+        )
+
+    if done:
+        # update() bypasses post_save
+        bump_version(model)
+    return done
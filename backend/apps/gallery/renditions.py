@@ -0,0 +1,102 @@
+"""
+Responsive image renditions for ProcessedImageModel subclasses.
+
+With local storage the background worker writes each rendition file and
+records it in the model's `renditions` manifest. With Cloudinary nothing is
+stored: srcsets are built from on-the-fly transformation URLs instead.
+"""
+from django.core.files.storage import default_storage
+
+from config.storage import url_builder
+
+from .imaging import RENDITION_FORMATS, RENDITION_WIDTHS
+from .models import is_cloudinary_storage
+
+
+def rendition_name(instance, field, width, image_format):
+    """Storage name for one rendition; stable so re-processing overwrites it."""
+    return f'renditions/{instance._meta.model_name}/{instance.pk}/{field}-{width}.{image_format}'
+
+
+def manifest_entry(source_name, original_size, stored):
+    """Build one field's manifest entry from [(format, width, height, name)]."""
+    formats = {}
+    for image_format, width, height, name in stored:
+        formats.setdefault(image_format, []).append({'width': width, 'height': height, 'name': name})
+    return {'source': source_name, 'width': original_size[0], 'height': original_size[1], 'formats': formats}
+
+
+def manifest_names(manifest):
+    """Every stored file name referenced by a manifest."""
+    return {
+        rendition['name']
+        for entry in manifest.values()
+        for renditions in entry.get('formats', {}).values()
+        for rendition in renditions
+    }
+
+
+def _srcset(urls):
+    return ', '.join(f'{url} {width}w' for width, url in urls)
+
+
+def _cloudinary_name_url(storage, name, width, image_format):
+    import cloudinary
+
+    resource = cloudinary.CloudinaryResource(storage._prepend_prefix(name), default_resource_type='image')
+    return resource.build_url(width=width, crop='limit', fetch_format=image_format, quality='auto', secure=True)
+
+
+def cloudinary_url(field_file, width, image_format):
+    """Cloudinary transformation URL for a stored image, resized to at most `width` pixels."""
+    return _cloudinary_name_url(field_file.storage, field_file.name, width, image_format)
+
+
+def _cloudinary_srcsets(storage, name):
+    return {
+        image_format: _srcset(
+            (width, _cloudinary_name_url(storage, name, width, image_format)) for width in sorted(RENDITION_WIDTHS)
+        )
+        for image_format in RENDITION_FORMATS
+    }
+
+
+def _stored_srcsets(entry, url):
+    srcsets = {}
+    for image_format, renditions in entry['formats'].items():
+        urls = [
+            (rendition['width'], url(rendition['name']))
+            for rendition in sorted(renditions, key=lambda item: item['width'])
+        ]
+        srcsets[image_format] = _srcset(urls)
+    return srcsets
+
+
+def get_srcsets(instance, request=None):
+    """
+    Return {field: {format: srcset}} for every image field with renditions.
+
+    Formats are ordered best-compression first, ready for <picture> <source>
+    elements. Fields whose manifest was built from a previous upload are
+    left out until the worker catches up.
+    """
+    names = {field: getattr(instance, field).name for field in instance.rendition_fields()}
+    return build_srcsets(type(instance), names, instance.renditions, request)
+
+
+def build_srcsets(model, names, renditions, request=None):
+    """get_srcsets() from raw column values: {field: stored name} and the renditions manifest."""
+    cloudinary = is_cloudinary_storage()
+    url = None
+    srcsets = {}
+    for field, name in names.items():
+        if not name:
+            continue
+        if cloudinary:
+            srcsets[field] = _cloudinary_srcsets(model._meta.get_field(field).storage, name)
+            continue
+        entry = renditions.get(field)
+        if entry and entry.get('source') == name:
+            url = url or url_builder(default_storage, request)
+            srcsets[field] = _stored_srcsets(entry, url)
+    return srcsets
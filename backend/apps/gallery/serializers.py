@@ -1,14 +1,82 @@
 from rest_framework import serializers
+from config.fieldsets import SparseFieldsMixin
 from .models import GalleryImage
+from .importing import IMAGE_EXTENSIONS
+from .renditions import build_srcsets, get_srcsets
+from .uploads import TARGETS
 
 
-class GalleryImageSerializer(serializers.ModelSerializer):
+class SrcsetField(serializers.Field):
+    """
+    Read-only {field: {format: srcset}} map of an object's image renditions.
+
+    Use as `srcsets = SrcsetField()` on serializers of ProcessedImageModel
+    subclasses; the original image fields remain the fallback `src`.
+    """
+    
+    def __init__(self, **kwargs):
+        kwargs['source'] = '*'
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+    
+    def to_representation(self, instance):
+        return get_srcsets(instance, self.context.get('request'))
+    
+    def values_plan(self, model):
+        """Columns and builder for the fast list path (config.fastlist)."""
+        fields = model.rendition_fields()
+        
+        def build(request, *values):
+            return build_srcsets(model, dict(zip(fields, values)), values[-1], request)
+        return [*fields, 'renditions'], build
+
+
+class GalleryImageSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for GalleryImage model."""
     
+    srcsets = SrcsetField()
+    
     class Meta:
         model = GalleryImage
         fields = [
-            'id', 'title', 'description', 'category', 'image', 'comparison_image', 'thumbnail',
-            'is_featured', 'is_active', 'sort_order', 'created_at', 'updated_at'
+            'id', 'title', 'description', 'category', 'image', 'comparison_image', 'thumbnail', 'composite',
+            'placeholder', 'srcsets', 'is_featured', 'is_active', 'sort_order', 'created_at', 'updated_at'
         ]
-        read_only_fields = ['id', 'thumbnail', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'thumbnail', 'composite', 'placeholder', 'created_at', 'updated_at']
+
+
+class DirectUploadSignSerializer(serializers.Serializer):
+    """Request for signed direct-upload parameters."""
+    
+    target = serializers.ChoiceField(choices=sorted(TARGETS))
+    filename = serializers.CharField(max_length=255)
+    
+    def validate_filename(self, value):
+        if not value.lower().endswith(IMAGE_EXTENSIONS):
+            raise serializers.ValidationError(f'Supported image types: {", ".join(IMAGE_EXTENSIONS)}')
+        return value
+
+
+class DirectUploadCompleteSerializer(serializers.Serializer):
+    """
+    Completion callback for a direct upload.
+    
+    `public_id`, `version` and `signature` are copied from the storage's
+    upload response. Without `object_id`, a `gallery.image` upload creates a
+    new GalleryImage from the remaining fields; with it, the image is set on
+    that existing GalleryImage or Service.
+    """
+    
+    token = serializers.CharField()
+    public_id = serializers.CharField(max_length=255)
+    version = serializers.CharField(max_length=32)
+    signature = serializers.CharField(max_length=128)
+    object_id = serializers.IntegerField(required=False)
+
+
+class DirectUploadGalleryImageSerializer(serializers.ModelSerializer):
+    """Fields of a GalleryImage created by a direct upload (the image comes from the upload)."""
+    
+    class Meta:
+        model = GalleryImage
+        fields = ['title', 'description', 'category', 'is_featured', 'is_active', 'sort_order']
@@ -0,0 +1,161 @@
+"""
+Direct-to-storage image uploads.
+
+Large uploads that go through Django hold a gunicorn thread for as long as
+the browser takes to send them. Here the browser asks for signed upload
+parameters (sign_upload), sends the file straight to storage, and hands the
+storage's response back to complete_upload, which only verifies it and
+returns the stored name to put on a GalleryImage or Service.
+
+With Cloudinary, the parameters are a signed form POST to the Cloudinary
+upload API (the file never touches Django) and the completion is checked
+with Cloudinary's response signature. Without it, the "storage" is the
+local stand-in endpoint (store_local_upload), which saves to MEDIA_ROOT
+and signs its own response the same way, so clients behave identically in
+development.
+
+Rows are then processed like any other upload by process_gallery_images,
+flagged with `upload_checks_pending` so the worker also runs the checks a
+form upload gets at save time: the near-duplicate check, and on Cloudinary
+the pixel cap and metadata stripping (see apps.gallery.processing).
+"""
+import os
+import time
+import uuid
+
+from django.conf import settings
+from django.core import signing
+from django.core.exceptions import ValidationError
+from django.core.files.storage import default_storage
+from django.urls import reverse
+from django.utils.crypto import constant_time_compare
+from django.utils.text import slugify
+from PIL import Image, UnidentifiedImageError
+
+from apps.services.models import Service
+from .importing import IMAGE_EXTENSIONS
+from .imaging import ImageTooLarge, check_pixels
+from .models import GalleryImage, is_cloudinary_storage, strip_upload_metadata
+
+SIGNING_SALT = 'apps.gallery.uploads'
+CLOUDINARY_UPLOAD_URL = 'https://api.cloudinary.com/v1_1/{cloud_name}/image/upload'
+CLOUDINARY_ALLOWED_FORMATS = 'jpg,png,webp,gif'
+
+# Upload targets: name -> (model, image field)
+TARGETS = {
+    'gallery.image': (GalleryImage, 'image'),
+    'gallery.comparison_image': (GalleryImage, 'comparison_image'),
+    'services.image': (Service, 'image'),
+    'services.second_image': (Service, 'second_image'),
+}
+
+
+def _storage_name(model, field, filename):
+    """Unique name under the field's upload_to for a file called `filename`."""
+    upload_to = model._meta.get_field(field).upload_to.rstrip('/')
+    stem = slugify(os.path.splitext(os.path.basename(filename))[0])[:50] or 'image'
+    return f'{upload_to}/{stem}-{uuid.uuid4().hex[:12]}'
+
+
+def _response_signature(public_id, version):
+    return signing.Signer(salt=SIGNING_SALT).signature(f'{public_id}:{version}')
+
+
+def sign_upload(target, filename, user):
+    """
+    Return {'token', 'url', 'fields', 'expires_in'} for one direct upload.
+
+    The client POSTs `fields` plus the file (as `file`) to `url` as
+    multipart/form-data, then passes `token` and the JSON response to the
+    completion endpoint.
+    """
+    model, field = TARGETS[target]
+    name = _storage_name(model, field, filename)
+    token = signing.dumps({'target': target, 'name': name, 'user': user.pk}, salt=SIGNING_SALT)
+
+    if is_cloudinary_storage():
+        import cloudinary
+        import cloudinary.utils
+
+        config = cloudinary.config()
+        fields = {
+            'public_id': default_storage._prepend_prefix(name),
+            'tags': default_storage.TAG,
+            'allowed_formats': CLOUDINARY_ALLOWED_FORMATS,
+            'timestamp': int(time.time()),
+        }
+        fields['signature'] = cloudinary.utils.api_sign_request(fields, config.api_secret)
+        fields['api_key'] = config.api_key
+        url = CLOUDINARY_UPLOAD_URL.format(cloud_name=config.cloud_name)
+    else:
+        fields = {'token': token}
+        url = reverse('upload-local')
+
+    return {'token': token, 'url': url, 'fields': fields, 'expires_in': settings.DIRECT_UPLOAD_MAX_AGE}
+
+
+def load_token(token, user):
+    """Decode a sign_upload token issued to `user`; raise ValidationError if it's invalid or expired."""
+    try:
+        data = signing.loads(token, salt=SIGNING_SALT, max_age=settings.DIRECT_UPLOAD_MAX_AGE)
+    except signing.SignatureExpired:
+        raise ValidationError('This upload has expired; please upload the file again.')
+    except signing.BadSignature:
+        raise ValidationError('Invalid upload token.')
+    if data['user'] != user.pk or data['target'] not in TARGETS:
+        raise ValidationError('Invalid upload token.')
+    return data
+
+
+def store_local_upload(token, upload, user):
+    """
+    Save a file sent to the local stand-in endpoint.
+
+    Returns a response shaped like Cloudinary's: {'public_id', 'version', 'signature'}.
+    """
+    data = load_token(token, user)
+    extension = os.path.splitext(upload.name)[1].lower()
+    if extension not in IMAGE_EXTENSIONS:
+        raise ValidationError(f'Unsupported file type "{extension}".')
+    try:
+        with Image.open(upload) as img:
+            check_pixels(img, settings.IMAGE_MAX_PIXELS)
+    except UnidentifiedImageError:
+        raise ValidationError('Not a valid image file.')
+    except ImageTooLarge as e:
+        raise ValidationError(str(e))
+
+    if settings.IMAGE_STRIP_METADATA:
+        upload = strip_upload_metadata(upload)
+    else:
+        upload.seek(0)
+    public_id = default_storage.save(f"{data['name']}{extension}", upload)
+    version = int(time.time())
+    return {'public_id': public_id, 'version': version, 'signature': _response_signature(public_id, version)}
+
+
+def complete_upload(token, public_id, version, signature, user):
+    """
+    Verify a finished direct upload; return (model, field, stored name).
+
+    Raises ValidationError unless the storage's response signature is valid
+    and the file is the one the token was issued for.
+    """
+    data = load_token(token, user)
+    if is_cloudinary_storage():
+        import cloudinary.utils
+
+        expected = default_storage._prepend_prefix(data['name'])
+        valid = public_id == expected and cloudinary.utils.verify_api_response_signature(public_id, version, signature)
+    else:
+        # Hashed local storage appends '.<hash>' (and possibly a suffix) to the signed name
+        valid = (
+            public_id.startswith(f"{data['name']}.")
+            and constant_time_compare(signature, _response_signature(public_id, version))
+        )
+    if not valid:
+        raise ValidationError('The upload could not be verified.')
+    model, field = TARGETS[data['target']]
+    if model.objects.filter(**{field: public_id}).exists():
+        raise ValidationError('This upload has already been completed.')
+    return model, field, public_id
@@ -1,9 +1,10 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import GalleryImageViewSet
+from .views import DirectUploadViewSet, GalleryImageViewSet
 
 router = DefaultRouter()
 router.register(r'gallery', GalleryImageViewSet)
+router.register(r'uploads', DirectUploadViewSet, basename='upload')
 
 urlpatterns = [
     path('', include(router.urls)),
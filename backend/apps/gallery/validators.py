@@ -0,0 +1,23 @@
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from PIL import Image
+
+from .imaging import ImageTooLarge, check_pixels
+
+
+def validate_image_pixels(value):
+    """Reject new uploads above settings.IMAGE_MAX_PIXELS, reading only the image header."""
+    if getattr(value, '_committed', True):
+        # Already stored; don't download it again on every admin save
+        return
+    position = value.tell()
+    try:
+        with Image.open(value) as img:
+            check_pixels(img, settings.IMAGE_MAX_PIXELS)
+    except ImageTooLarge as e:
+        raise ValidationError(str(e), code='image_too_large')
+    except Exception:
+        # Unreadable images are reported by ImageField's own validation
+        pass
+    finally:
+        value.seek(position)
@@ -1,10 +1,27 @@
-from rest_framework import viewsets, filters
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import transaction
+from rest_framework import viewsets, filters, status
+from rest_framework.decorators import action
+from rest_framework.exceptions import PermissionDenied, ValidationError
+from rest_framework.parsers import MultiPartParser
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
+from apps.services.serializers import ServiceSerializer
+from config.caching import CachedResponseMixin, ConditionalGetMixin
+from config.fastlist import FastListMixin
+from config.fieldsets import SparseQuerysetMixin
 from .models import GalleryImage
-from .serializers import GalleryImageSerializer
+from .serializers import (
+    DirectUploadCompleteSerializer, DirectUploadGalleryImageSerializer, DirectUploadSignSerializer,
+    GalleryImageSerializer,
+)
+from .uploads import complete_upload, sign_upload, store_local_upload
 
 
-class GalleryImageViewSet(viewsets.ReadOnlyModelViewSet):
+class GalleryImageViewSet(
+    ConditionalGetMixin, CachedResponseMixin, FastListMixin, SparseQuerysetMixin, viewsets.ReadOnlyModelViewSet,
+):
     """ViewSet for GalleryImage model - read-only for public API."""
     
     queryset = GalleryImage.objects.filter(is_active=True)
@@ -14,3 +31,76 @@ class GalleryImageViewSet(viewsets.ReadOnlyModelViewSet):
     search_fields = ['title', 'description']
     ordering_fields = ['sort_order', 'created_at']
     ordering = ['-sort_order', '-is_featured', '-created_at']
+    query_budget = {'list': 3, 'retrieve': 2}
+
+
+class DirectUploadViewSet(viewsets.ViewSet):
+    """
+    Staff-only direct-to-storage image uploads (see apps.gallery.uploads).
+    
+    1. POST sign/ {target, filename} -> {token, url, fields}
+    2. POST the file with `fields` straight to `url`
+    3. POST complete/ {token, public_id, version, signature, ...}
+    
+    local/ is the stand-in storage endpoint used when Cloudinary isn't configured.
+    """
+    
+    permission_classes = [IsAdminUser]
+    
+    @action(detail=False, methods=['post'])
+    def sign(self, request):
+        """Issue short-lived signed upload parameters."""
+        serializer = DirectUploadSignSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        return Response(sign_upload(
+            serializer.validated_data['target'], serializer.validated_data['filename'], request.user,
+        ))
+    
+    @action(detail=False, methods=['post'], parser_classes=[MultiPartParser])
+    def local(self, request):
+        """Store an upload locally and answer like Cloudinary's upload API."""
+        upload = request.FILES.get('file')
+        if upload is None:
+            raise ValidationError({'file': 'No file was submitted.'})
+        try:
+            return Response(store_local_upload(request.data.get('token', ''), upload, request.user))
+        except DjangoValidationError as e:
+            raise ValidationError({'file': e.messages})
+    
+    @action(detail=False, methods=['post'])
+    def complete(self, request):
+        """Attach a verified upload to a new GalleryImage or an existing GalleryImage/Service."""
+        serializer = DirectUploadCompleteSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        try:
+            model, field, name = complete_upload(
+                data['token'], data['public_id'], data['version'], data['signature'], request.user,
+            )
+        except DjangoValidationError as e:
+            raise ValidationError({'non_field_errors': e.messages})
+        
+        opts = model._meta
+        if 'object_id' in data:
+            if not request.user.has_perm(f'{opts.app_label}.change_{opts.model_name}'):
+                raise PermissionDenied
+            with transaction.atomic():
+                instance = model.objects.select_for_update().filter(pk=data['object_id']).first()
+                if instance is None:
+                    raise ValidationError({'object_id': f'No {opts.verbose_name} with id {data["object_id"]}.'})
+                setattr(instance, field, name)
+                instance.upload_checks_pending = True
+                instance.save()
+            response_status = status.HTTP_200_OK
+        else:
+            if model is not GalleryImage or field != GalleryImage.IMAGE_FIELDS[0]:
+                raise ValidationError({'object_id': f'Required for {opts.verbose_name} {field} uploads.'})
+            if not request.user.has_perm(f'{opts.app_label}.add_{opts.model_name}'):
+                raise PermissionDenied
+            fields = DirectUploadGalleryImageSerializer(data=request.data)
+            fields.is_valid(raise_exception=True)
+            instance = fields.save(**{field: name}, upload_checks_pending=True)
+            response_status = status.HTTP_201_CREATED
+        
+        output = GalleryImageSerializer if model is GalleryImage else ServiceSerializer
+        return Response(output(instance, context={'request': request}).data, status=response_status)
@@ -0,0 +1,79 @@
+"""
+Django management command that compares per-message email rendering cost.
+
+Usage:
+    python manage.py benchmark_email_rendering --count 1000
+
+"before" is the previous per-message path (render_to_string for the HTML
+part plus an inline f-string for the text part); "after" is
+apps.notifications.rendering.render_many. Uses unsaved model instances, so
+no database access is needed.
+"""
+
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.template.loader import render_to_string
+
+from apps.booking.models import BookingRequest
+from apps.notifications.rendering import render_many
+from apps.services.models import Service
+
+
+def _legacy_render(context):
+    booking, service = context['booking'], context['service']
+    html_message = render_to_string('emails/booking_confirmation.html', context)
+    plain_message = f"""
+    Your appointment has been confirmed!
+
+    Service: {service.name}
+    Date: {booking.preferred_date}
+    Time: {booking.preferred_time}
+    Duration: {service.duration_display}
+
+    We look forward to seeing you!
+    """
+    return plain_message, html_message
+
+
+class Command(BaseCommand):
+    help = 'Benchmarks confirmation email rendering, before and after the shared renderer'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, default=1000, help='Messages to render')
+
+    def handle(self, *args, **options):
+        count = options['count']
+        service = Service(name='Classic Manicure', category='nails', description='', price=Decimal('15000.00'),
+                          duration_minutes=75)
+        contexts = [
+            {
+                'booking': BookingRequest(
+                    id=index, customer_name=f'Customer {index}', customer_email=f'customer{index}@example.com',
+                    customer_phone='+2349000000000', service=service,
+                    preferred_date=date.today() + timedelta(days=index % 30), preferred_time='10:00',
+                    notes='Please use a neutral colour' if index % 2 else '',
+                ),
+                'service': service,
+            }
+            for index in range(count)
+        ]
+
+        # Warm up both paths so template loading isn't counted
+        _legacy_render(contexts[0])
+        render_many('booking_confirmation', contexts[:1])
+
+        started = time.perf_counter()
+        rendered = [_legacy_render(context) for context in contexts]
+        before = time.perf_counter() - started
+        del rendered
+
+        started = time.perf_counter()
+        render_many('booking_confirmation', contexts)
+        after = time.perf_counter() - started
+
+        self.stdout.write(f'Rendered {count} confirmation emails')
+        self.stdout.write(f'   before: {before * 1e6 / count:.1f} µs/message ({before:.3f}s total)')
+        self.stdout.write(f'   after:  {after * 1e6 / count:.1f} µs/message ({after:.3f}s total)')
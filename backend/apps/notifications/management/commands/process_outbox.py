@@ -0,0 +1,87 @@
+"""
+Django management command that drains the email outbox.
+
+Usage:
+    python manage.py process_outbox            # run forever, polling for due messages
+    python manage.py process_outbox --once     # deliver what is due now and exit
+
+Messages are delivered from a fixed-size thread pool, so the number of
+sending threads stays bounded no matter how many emails are queued. With a
+batching backend (ResendEmailBackend) each thread sends its share of the
+claimed messages as one batch request.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.mail import get_connection
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from apps.notifications.outbox import claim_batch, deliver_many
+
+
+_local = threading.local()
+
+
+def _thread_connection():
+    """Email connection kept open for the lifetime of a pool thread."""
+    if getattr(_local, 'connection', None) is None:
+        _local.connection = get_connection()
+        _local.connection.open()
+    return _local.connection
+
+
+def _deliver_in_thread(messages):
+    try:
+        delivered = deliver_many(messages, connection=_thread_connection())
+        if not delivered:
+            # Start the next message on a fresh connection in case this one broke
+            _local.connection.close()
+            _local.connection = None
+        return delivered
+    finally:
+        # Each pool thread holds its own DB connection
+        close_old_connections()
+
+
+class Command(BaseCommand):
+    help = 'Delivers queued outbox emails with a bounded worker pool and retry/backoff'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Deliver due messages and exit')
+        parser.add_argument('--workers', type=int, default=settings.OUTBOX_WORKERS, help='Sending threads')
+        parser.add_argument('--batch-size', type=int, default=200, help='Messages claimed per poll')
+        parser.add_argument(
+            '--interval', type=float, default=settings.OUTBOX_POLL_INTERVAL,
+            help='Seconds to sleep when nothing is due',
+        )
+
+    def _chunk(self, batch, workers):
+        """
+        Split a claimed batch into per-call groups.
+
+        Batching backends get up to their batch_size messages per call (spread
+        across the pool); other backends get one message per call.
+        """
+        batch_size = getattr(get_connection(), 'batch_size', 1)
+        size = max(1, min(batch_size, -(-len(batch) // workers)))
+        return [batch[start:start + size] for start in range(0, len(batch), size)]
+
+    def handle(self, *args, **options):
+        workers = max(options['workers'], 1)
+        self.stdout.write(f'📬 Outbox worker started ({workers} threads)')
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='outbox') as pool:
+            while True:
+                batch = claim_batch(options['batch_size'])
+                if batch:
+                    results = list(pool.map(_deliver_in_thread, self._chunk(batch, workers)))
+                    self.stdout.write(f'   Delivered {sum(results)}/{len(batch)} messages')
+                    continue
+                if options['once']:
+                    break
+                close_old_connections()
+                time.sleep(options['interval'])
@@ -0,0 +1,165 @@
+"""
+Transactional email outbox.
+
+Views enqueue emails with enqueue_email() inside the same transaction that
+saves the booking/contact row; the process_outbox management command claims
+due rows and delivers them from a bounded thread pool with retry/backoff.
+"""
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import OutboxMessage
+
+logger = logging.getLogger(__name__)
+
+
+def get_admin_email():
+    """Return the business owner's address used for admin notifications."""
+    return getattr(settings, 'ADMIN_EMAIL', None) or settings.EMAIL_HOST_USER or settings.DEFAULT_FROM_EMAIL
+
+
+def _build_message(subject, body, recipients, html_body='', from_email=None, now=None):
+    return OutboxMessage(
+        subject=subject,
+        body=body,
+        html_body=html_body or '',
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+        recipients=list(recipients),
+        next_attempt_at=now or timezone.now(),
+    )
+
+
+def enqueue_email(subject, body, recipients, html_body='', from_email=None):
+    """Queue an email for the outbox worker. Call inside the caller's transaction."""
+    message = _build_message(subject, body, recipients, html_body=html_body, from_email=from_email)
+    message.save()
+    return message
+
+
+def enqueue_emails(emails):
+    """Queue many emails (dicts of enqueue_email() kwargs) with a single INSERT."""
+    now = timezone.now()
+    return OutboxMessage.objects.bulk_create(
+        [_build_message(now=now, **email) for email in emails]
+    )
+
+
+def backoff_delay(attempts):
+    """Exponential backoff for the given number of failed attempts, capped."""
+    return timedelta(seconds=min(
+        settings.OUTBOX_RETRY_BASE_SECONDS * 2 ** max(attempts - 1, 0),
+        settings.OUTBOX_RETRY_MAX_SECONDS,
+    ))
+
+
+def claim_batch(limit):
+    """
+    Claim up to `limit` due messages and return them.
+
+    Rows are leased by moving them to 'sending' with next_attempt_at pushed out
+    by OUTBOX_LEASE_SECONDS, so a worker that dies mid-send has its rows picked
+    up again once the lease expires. An expired lease counts as an attempt, so
+    a message that keeps killing the worker still ends up 'failed' after
+    OUTBOX_MAX_ATTEMPTS. skip_locked lets several workers drain the table
+    concurrently without claiming the same row.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        rows = list(
+            OutboxMessage.objects
+            .select_for_update(skip_locked=True)
+            .filter(status__in=['pending', 'sending'], next_attempt_at__lte=now)
+            .order_by('next_attempt_at')
+            .values_list('id', 'status', 'attempts')[:limit]
+        )
+        if not rows:
+            return []
+        expired = {pk for pk, status, _attempts in rows if status == 'sending'}
+        exhausted = {
+            pk for pk, status, attempts in rows
+            if status == 'sending' and attempts + 1 >= settings.OUTBOX_MAX_ATTEMPTS
+        }
+        if exhausted:
+            OutboxMessage.objects.filter(id__in=exhausted).update(
+                status='failed', attempts=F('attempts') + 1, next_attempt_at=now,
+                last_error='Lease expired: the worker died or hung while sending',
+            )
+            logger.error(f"Giving up on outbox messages {sorted(exhausted)}: lease expired on the last attempt")
+        ids = [pk for pk, _status, _attempts in rows if pk not in exhausted]
+        OutboxMessage.objects.filter(id__in=ids).update(
+            status='sending',
+            next_attempt_at=now + timedelta(seconds=settings.OUTBOX_LEASE_SECONDS),
+        )
+        if expired - exhausted:
+            OutboxMessage.objects.filter(id__in=expired - exhausted).update(attempts=F('attempts') + 1)
+    return list(OutboxMessage.objects.filter(id__in=ids))
+
+
+def _to_email(message, connection):
+    email = EmailMultiAlternatives(
+        subject=message.subject,
+        body=message.body,
+        from_email=message.from_email,
+        to=message.recipients,
+        connection=connection,
+    )
+    if message.html_body:
+        email.attach_alternative(message.html_body, 'text/html')
+    return email
+
+
+def _record_failure(message, error):
+    attempts = message.attempts + 1
+    if attempts >= settings.OUTBOX_MAX_ATTEMPTS:
+        status, next_attempt_at = 'failed', timezone.now()
+        logger.error(f"Giving up on outbox message {message.pk} after {attempts} attempts: {error}")
+    else:
+        status, next_attempt_at = 'pending', timezone.now() + backoff_delay(attempts)
+        logger.warning(f"Outbox message {message.pk} failed (attempt {attempts}), retrying at {next_attempt_at}: {error}")
+    OutboxMessage.objects.filter(pk=message.pk).update(
+        status=status, attempts=attempts, next_attempt_at=next_attempt_at, last_error=str(error),
+    )
+
+
+def deliver_many(messages, connection=None):
+    """
+    Send claimed messages with one send_messages() call and record the outcome.
+
+    Batching backends (ResendEmailBackend) send the list in a single request, so
+    callers should keep it within the connection's batch_size. If the call
+    fails, messages the backend marked as sent (`resend_id`) are still recorded
+    as sent, and the rest as failed with their own error (`send_error`) where
+    the backend gives one. Returns the number of messages delivered.
+    """
+    connection = connection or get_connection()
+    emails = [_to_email(message, connection) for message in messages]
+    try:
+        connection.send_messages(emails)
+    except Exception as e:
+        sent = [message for message, email in zip(messages, emails) if getattr(email, 'resend_id', None)]
+        logger.error(
+            f"Failed to deliver {len(messages) - len(sent)} of {len(messages)} outbox messages: {e}", exc_info=True,
+        )
+        for message, email in zip(messages, emails):
+            if not getattr(email, 'resend_id', None):
+                _record_failure(message, getattr(email, 'send_error', None) or e)
+    else:
+        sent = messages
+
+    if sent:
+        OutboxMessage.objects.filter(pk__in=[message.pk for message in sent]).update(
+            status='sent', attempts=F('attempts') + 1, sent_at=timezone.now(), last_error='',
+        )
+        logger.info(f"Delivered {len(sent)} outbox messages")
+    return len(sent)
+
+
+def deliver(message, connection=None):
+    """Send one claimed message and record the outcome. Returns True on success."""
+    return deliver_many([message], connection=connection) == 1
@@ -0,0 +1,57 @@
+"""
+Email template rendering.
+
+Each template under templates/emails/ holds both parts of a notification: the
+plain text part inside `{% if plain_text %}` and the HTML part in the
+`{% else %}` branch (so render_to_string() on its own still yields the HTML).
+Templates are compiled once per process, and both branches are rendered in a
+single pass over one Context.
+"""
+from functools import lru_cache
+
+from django.template import Context, engines
+from django.template.defaulttags import IfNode
+
+EMAIL_TEMPLATES = {
+    'booking_confirmation': 'emails/booking_confirmation.html',
+    'booking_notification': 'emails/booking_notification.html',
+    'contact_notification': 'emails/contact_notification.html',
+    'newsletter_welcome': 'emails/newsletter_welcome.html',
+}
+
+
+@lru_cache(maxsize=None)
+def get_template(name):
+    """
+    Return (template, text_nodelist, html_nodelist) for an EMAIL_TEMPLATES key.
+
+    Cached for the life of the process; restart the process to pick up
+    template edits.
+    """
+    template = engines['django'].get_template(EMAIL_TEMPLATES[name]).template
+    parts = next(node for node in template.nodelist if isinstance(node, IfNode))
+    (_condition, text_nodelist), (_else, html_nodelist) = parts.conditions_nodelists
+    return template, text_nodelist, html_nodelist
+
+
+def _render_parts(compiled, context):
+    template, text_nodelist, html_nodelist = compiled
+    context = Context(context, autoescape=False)
+    # Same setup Template.render() does before rendering its nodelist
+    with context.render_context.push_state(template), context.bind_template(template):
+        # Plain text must not be HTML-escaped
+        text = text_nodelist.render(context)
+        context.autoescape = True
+        html = html_nodelist.render(context)
+    return text, html
+
+
+def render(name, context):
+    """Render one email and return (text, html)."""
+    return _render_parts(get_template(name), context)
+
+
+def render_many(name, contexts):
+    """Render the same email for many contexts and return a list of (text, html)."""
+    compiled = get_template(name)
+    return [_render_parts(compiled, context) for context in contexts]
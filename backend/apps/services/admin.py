@@ -1,14 +1,16 @@
 from django.contrib import admin
+from django.utils import timezone
 from .models import Service
 
 
 @admin.register(Service)
 class ServiceAdmin(admin.ModelAdmin):
-    list_display = ['name', 'category', 'price', 'duration_display', 'is_featured', 'is_active']
-    list_filter = ['category', 'is_featured', 'is_active', 'created_at']
+    list_display = ['name', 'category', 'price', 'duration_display', 'is_featured', 'is_active', 'processing_status']
+    list_filter = ['category', 'is_featured', 'is_active', 'processing_status', 'created_at']
     search_fields = ['name', 'description']
     list_editable = ['is_featured', 'is_active']
     ordering = ['category', 'name']
+    readonly_fields = ['processing_status', 'processing_attempts', 'processing_error', 'processing_started_at']
     
     fieldsets = (
         ('Basic Information', {
@@ -20,4 +22,17 @@ class ServiceAdmin(admin.ModelAdmin):
         ('Display Options', {
             'fields': ('is_featured', 'is_active')
         }),
+        ('Image Processing', {
+            'fields': ('processing_status', 'processing_attempts', 'processing_error', 'processing_started_at'),
+            'classes': ('collapse',)
+        }),
     )
+    
+    actions = ['regenerate_renditions']
+    
+    def regenerate_renditions(self, request, queryset):
+        count = queryset.exclude(processing_status='skipped').update(
+            processing_status='pending', processing_attempts=0, processing_error='', updated_at=timezone.now(),
+        )
+        self.message_user(request, f'{count} services queued for image processing.')
+    regenerate_renditions.short_description = "Regenerate image renditions for selected services"
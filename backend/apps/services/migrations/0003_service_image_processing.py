@@ -0,0 +1,53 @@
+# Generated by Django 4.2.7 on 2026-10-18 09:14
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Q
+
+
+def mark_existing_services(apps, schema_editor):
+    """Existing services are queued by the field default; skip those with nothing to process."""
+    Service = apps.get_model('services', 'Service')
+    # Same check as is_cloudinary_storage(); STORAGES mirrors DEFAULT_FILE_STORAGE
+    if 'cloudinary' in settings.STORAGES['default']['BACKEND'].lower():
+        Service.objects.update(processing_status='skipped')
+    else:
+        Service.objects.filter(
+            Q(image='') | Q(image__isnull=True), Q(second_image='') | Q(second_image__isnull=True),
+        ).update(processing_status='done')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('services', '0002_service_second_image'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='service',
+            name='processing_attempts',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='service',
+            name='processing_error',
+            field=models.TextField(blank=True),
+        ),
+        migrations.AddField(
+            model_name='service',
+            name='processing_started_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='service',
+            name='processing_status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('processing', 'Processing'), ('done', 'Done'), ('failed', 'Failed'), ('skipped', 'Skipped')], default='pending', help_text='State of background image processing', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='service',
+            name='renditions',
+            field=models.JSONField(blank=True, default=dict, help_text='Generated image renditions'),
+        ),
+        migrations.RunPython(mark_existing_services, migrations.RunPython.noop),
+    ]
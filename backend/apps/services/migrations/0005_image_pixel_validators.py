@@ -0,0 +1,24 @@
+# Generated by Django 4.2.7 on 2026-10-18 09:18
+
+import apps.gallery.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('services', '0004_service_placeholder'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='service',
+            name='image',
+            field=models.ImageField(blank=True, help_text='Service image', null=True, upload_to='services/', validators=[apps.gallery.validators.validate_image_pixels]),
+        ),
+        migrations.AlterField(
+            model_name='service',
+            name='second_image',
+            field=models.ImageField(blank=True, help_text='Second image (for combined services - displays side by side with main image)', null=True, upload_to='services/', validators=[apps.gallery.validators.validate_image_pixels]),
+        ),
+    ]
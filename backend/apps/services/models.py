@@ -1,8 +1,10 @@
 from django.db import models
 from django.core.validators import MinValueValidator
+from apps.gallery.models import ProcessedImageModel
+from apps.gallery.validators import validate_image_pixels
 
 
-class Service(models.Model):
+class Service(ProcessedImageModel):
     """Model for nail and lash services offered by the technician."""
     
     SERVICE_CATEGORIES = [
@@ -11,6 +13,8 @@ class Service(models.Model):
         ('both', 'Both'),
     ]
     
+    IMAGE_FIELDS = ('image', 'second_image')
+    
     name = models.CharField(max_length=100, help_text="Service name (e.g., 'Classic Manicure')")
     category = models.CharField(max_length=10, choices=SERVICE_CATEGORIES, help_text="Service category")
     description = models.TextField(help_text="Detailed service description")
@@ -23,11 +27,14 @@ class Service(models.Model):
     duration_minutes = models.PositiveIntegerField(help_text="Service duration in minutes")
     is_featured = models.BooleanField(default=False, help_text="Show on homepage")
     is_active = models.BooleanField(default=True, help_text="Available for booking")
-    image = models.ImageField(upload_to='services/', blank=True, null=True, help_text="Service image")
+    image = models.ImageField(
+        upload_to='services/', blank=True, null=True, validators=[validate_image_pixels], help_text="Service image"
+    )
     second_image = models.ImageField(
         upload_to='services/', 
         blank=True, 
         null=True, 
+        validators=[validate_image_pixels],
         help_text="Second image (for combined services - displays side by side with main image)"
     )
     created_at = models.DateTimeField(auto_now_add=True)
@@ -37,6 +44,14 @@ class Service(models.Model):
         ordering = ['category', 'name']
         verbose_name = "Service"
         verbose_name_plural = "Services"
+        indexes = [
+            # Public list (optionally by category) and the home page's featured list
+            models.Index(fields=['category', 'name'], condition=models.Q(is_active=True), name='service_active_idx'),
+            models.Index(
+                fields=['category', 'name'], condition=models.Q(is_active=True, is_featured=True),
+                name='service_featured_idx',
+            ),
+        ]
     
     def __str__(self):
         return f"{self.name} - ₦{self.price}"
@@ -44,8 +59,13 @@ class Service(models.Model):
     @property
     def duration_display(self):
         """Return duration in hours and minutes format."""
-        hours = self.duration_minutes // 60
-        minutes = self.duration_minutes % 60
+        return self.format_duration(self.duration_minutes)
+    
+    @staticmethod
+    def format_duration(duration_minutes):
+        """Format minutes as '1h 30m', '2h' or '45m'."""
+        hours = duration_minutes // 60
+        minutes = duration_minutes % 60
         
         if hours > 0 and minutes > 0:
             return f"{hours}h {minutes}m"
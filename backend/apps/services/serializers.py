@@ -1,17 +1,22 @@
 from rest_framework import serializers
+from apps.gallery.serializers import SrcsetField
+from config.fieldsets import SparseFieldsMixin
 from .models import Service
 
 
-class ServiceSerializer(serializers.ModelSerializer):
+class ServiceSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for Service model."""
     
     duration_display = serializers.ReadOnlyField()
+    srcsets = SrcsetField()
     
     class Meta:
         model = Service
         fields = [
             'id', 'name', 'category', 'description', 'price', 
             'duration_minutes', 'duration_display', 'is_featured', 
-            'is_active', 'image', 'second_image', 'created_at', 'updated_at'
+            'is_active', 'image', 'second_image', 'placeholder', 'srcsets', 'created_at', 'updated_at'
         ]
-        read_only_fields = ['id', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'placeholder', 'created_at', 'updated_at']
+        # Model properties for the fast list path (config.fastlist): {field: (columns, function of their values)}
+        computed_fields = {'duration_display': (['duration_minutes'], Service.format_duration)}
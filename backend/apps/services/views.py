@@ -1,10 +1,15 @@
 from rest_framework import viewsets, filters
 from django_filters.rest_framework import DjangoFilterBackend
+from config.caching import CachedResponseMixin, ConditionalGetMixin
+from config.fastlist import FastListMixin
+from config.fieldsets import SparseQuerysetMixin
 from .models import Service
 from .serializers import ServiceSerializer
 
 
-class ServiceViewSet(viewsets.ReadOnlyModelViewSet):
+class ServiceViewSet(
+    ConditionalGetMixin, CachedResponseMixin, FastListMixin, SparseQuerysetMixin, viewsets.ReadOnlyModelViewSet,
+):
     """ViewSet for Service model - read-only for public API."""
     
     queryset = Service.objects.filter(is_active=True)
@@ -14,3 +19,5 @@ class ServiceViewSet(viewsets.ReadOnlyModelViewSet):
     search_fields = ['name', 'description']
     ordering_fields = ['name', 'price', 'duration_minutes']
     ordering = ['category', 'name']
+    # Cache misses: validators, COUNT and rows for a list
+    query_budget = {'list': 3, 'retrieve': 2}
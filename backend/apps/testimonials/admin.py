@@ -1,4 +1,6 @@
 from django.contrib import admin
+from django.utils import timezone
+from config.caching import bump_version
 from .models import Testimonial
 
 
@@ -30,11 +32,13 @@ class TestimonialAdmin(admin.ModelAdmin):
     actions = ['approve_testimonials', 'feature_testimonials']
     
     def approve_testimonials(self, request, queryset):
-        queryset.update(is_approved=True)
+        queryset.update(is_approved=True, updated_at=timezone.now())
+        bump_version(Testimonial)  # update() bypasses post_save
         self.message_user(request, f'{queryset.count()} testimonials approved.')
     approve_testimonials.short_description = "Approve selected testimonials"
     
     def feature_testimonials(self, request, queryset):
-        queryset.update(is_featured=True)
+        queryset.update(is_featured=True, updated_at=timezone.now())
+        bump_version(Testimonial)  # update() bypasses post_save
         self.message_user(request, f'{queryset.count()} testimonials featured.')
     feature_testimonials.short_description = "Feature selected testimonials"
@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class TestimonialsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.testimonials'
+
+    def ready(self):
+        from config.caching import invalidate_on_change
+        from .models import Testimonial
+        invalidate_on_change(Testimonial)
@@ -37,6 +37,17 @@ class Testimonial(models.Model):
         ordering = ['-is_featured', '-rating', '-created_at']
         verbose_name = "Testimonial"
         verbose_name_plural = "Testimonials"
+        indexes = [
+            # Approved testimonials in the public order; is_featured leads, so ?is_featured= uses it too
+            models.Index(
+                fields=['-is_featured', '-rating', '-created_at'], condition=models.Q(is_approved=True),
+                name='testimonial_approved_idx',
+            ),
+            models.Index(
+                fields=['service_category', '-is_featured', '-rating', '-created_at'],
+                condition=models.Q(is_approved=True), name='testimonial_category_idx',
+            ),
+        ]
     
     def __str__(self):
         return f"{self.client_name} - {self.rating} stars"
@@ -44,6 +55,11 @@ class Testimonial(models.Model):
     @property
     def stars_display(self):
         """Return star rating as string."""
-        if self.rating is None:
+        return self.format_stars(self.rating)
+    
+    @staticmethod
+    def format_stars(rating):
+        """Format a rating as five filled or empty stars."""
+        if rating is None:
             return "☆☆☆☆☆"
-        return "★" * self.rating + "☆" * (5 - self.rating)
+        return "★" * rating + "☆" * (5 - rating)
@@ -1,8 +1,9 @@
 from rest_framework import serializers
+from config.fieldsets import SparseFieldsMixin
 from .models import Testimonial
 
 
-class TestimonialSerializer(serializers.ModelSerializer):
+class TestimonialSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for Testimonial model."""
     
     stars_display = serializers.ReadOnlyField()
@@ -15,3 +16,4 @@ class TestimonialSerializer(serializers.ModelSerializer):
             'is_approved', 'created_at', 'updated_at'
         ]
         read_only_fields = ['id', 'created_at', 'updated_at']
+        computed_fields = {'stars_display': (['rating'], Testimonial.format_stars)}
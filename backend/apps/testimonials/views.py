@@ -1,10 +1,15 @@
 from rest_framework import viewsets, filters
 from django_filters.rest_framework import DjangoFilterBackend
+from config.caching import CachedResponseMixin, ConditionalGetMixin
+from config.fastlist import FastListMixin
+from config.fieldsets import SparseQuerysetMixin
 from .models import Testimonial
 from .serializers import TestimonialSerializer
 
 
-class TestimonialViewSet(viewsets.ModelViewSet):
+class TestimonialViewSet(
+    ConditionalGetMixin, CachedResponseMixin, FastListMixin, SparseQuerysetMixin, viewsets.ModelViewSet,
+):
     """ViewSet for Testimonial model - allows public submissions."""
     
     queryset = Testimonial.objects.filter(is_approved=True)
@@ -14,6 +19,7 @@ class TestimonialViewSet(viewsets.ModelViewSet):
     search_fields = ['client_name', 'review_text']
     ordering_fields = ['rating', 'created_at']
     ordering = ['-is_featured', '-rating', '-created_at']
+    query_budget = {'list': 3, 'retrieve': 2, 'create': 1}
     
     def get_queryset(self):
         """Return approved testimonials for GET requests, all for POST requests."""
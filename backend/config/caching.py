@@ -0,0 +1,150 @@
+"""
+Response caching for read-only API endpoints.
+
+CachedResponseMixin keeps a server-side copy of responses; ConditionalGetMixin
+lets clients revalidate their own copy with ETag/Last-Modified.
+
+Server-side cached responses are keyed by the full request URL (filters, search,
+ordering, page) plus a per-model version stored in the default cache. Any
+save/delete of the model replaces the version, so entries built from older
+data are never read again and simply expire. Because the version lives in
+the cache, a shared backend (database or file cache) keeps every gunicorn
+worker consistent.
+"""
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Max
+from django.db.models.signals import post_delete, post_save
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+from rest_framework.response import Response
+
+VERSION_KEY_PREFIX = 'api:version'
+RESPONSE_KEY_PREFIX = 'api:response'
+
+
+def _version_key(model):
+    return f'{VERSION_KEY_PREFIX}:{model._meta.label_lower}'
+
+
+def get_version(model):
+    """Return the current cache version for a model, creating one if missing."""
+    key = _version_key(model)
+    version = cache.get(key)
+    if version is None:
+        version = time.time_ns()
+        # add() so a concurrent first request doesn't overwrite a fresh bump
+        if not cache.add(key, version, None):
+            version = cache.get(key, version)
+    return version
+
+
+def bump_version(model):
+    """
+    Invalidate all cached responses for a model.
+
+    A new timestamp is set rather than incrementing, so concurrent bumps on
+    backends without atomic incr() can't collapse into one. Runs after commit
+    so readers can't cache pre-commit data under the new version.
+    """
+    transaction.on_commit(lambda: cache.set(_version_key(model), time.time_ns(), None))
+
+
+def invalidate_on_change(model):
+    """Bump the model's version on every post_save/post_delete."""
+    def handler(sender, **kwargs):
+        bump_version(sender)
+
+    dispatch_uid = f'api-cache-{model._meta.label_lower}'
+    post_save.connect(handler, sender=model, weak=False, dispatch_uid=dispatch_uid)
+    post_delete.connect(handler, sender=model, weak=False, dispatch_uid=dispatch_uid)
+
+
+def _plain(data):
+    """Strip DRF's ReturnDict/ReturnList wrappers (they hold the serializer) before pickling."""
+    if isinstance(data, dict):
+        return {key: _plain(value) for key, value in data.items()}
+    if isinstance(data, list):
+        return [_plain(value) for value in data]
+    return data
+
+
+class CachedResponseMixin:
+    """
+    Cache list/retrieve responses for a ViewSet.
+
+    Add before the DRF ViewSet base class. The cached model is the ViewSet's
+    queryset model; it must be registered with invalidate_on_change().
+    """
+
+    cache_timeout = None
+
+    def list(self, request, *args, **kwargs):
+        return self._cached_response(request, super().list, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self._cached_response(request, super().retrieve, *args, **kwargs)
+
+    def _cached_response(self, request, view, *args, **kwargs):
+        model = self.queryset.model
+        url = hashlib.sha1(request.build_absolute_uri().encode()).hexdigest()
+        # Read the version before querying so a concurrent bump can't be masked
+        key = f'{RESPONSE_KEY_PREFIX}:{model._meta.label_lower}:{get_version(model)}:{url}'
+
+        data = cache.get(key)
+        if data is not None:
+            return Response(data)
+
+        response = view(request, *args, **kwargs)
+        if response.status_code == 200:
+            timeout = self.cache_timeout or settings.API_CACHE_TIMEOUT
+            cache.set(key, _plain(response.data), timeout)
+        return response
+
+
+class ConditionalGetMixin:
+    """
+    ETag/Last-Modified support for list/retrieve on a ViewSet.
+
+    Validators come from one MAX(updated_at)/COUNT(*) query over the filtered
+    queryset (or the single looked-up row), so a matching If-None-Match or
+    If-Modified-Since is answered with 304 before anything is serialized.
+    Bulk update() calls must set updated_at for changes to show up here.
+    Add before CachedResponseMixin and the DRF ViewSet base class.
+    """
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        return self._conditional_response(request, queryset, super().list, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        queryset = self.filter_queryset(self.get_queryset()).filter(
+            **{self.lookup_field: kwargs[lookup_url_kwarg]}
+        )
+        return self._conditional_response(request, queryset, super().retrieve, *args, **kwargs)
+
+    def _conditional_response(self, request, queryset, view, *args, **kwargs):
+        state = queryset.order_by().aggregate(last_modified=Max('updated_at'), count=Count('pk'))
+        if state['last_modified'] is None:
+            # Empty list or missing object: nothing to validate against
+            return view(request, *args, **kwargs)
+
+        # HTTP dates have one-second resolution
+        last_modified = int(state['last_modified'].timestamp())
+        fingerprint = f"{state['last_modified'].isoformat()}:{state['count']}"
+        etag = f'"{hashlib.sha1(fingerprint.encode()).hexdigest()}"'
+
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = view(request, *args, **kwargs)
+        if response.status_code in (200, 304):
+            response['ETag'] = etag
+            response['Last-Modified'] = http_date(last_modified)
+            # Clients may keep the response but must revalidate before reuse
+            patch_cache_control(response, no_cache=True)
+        return response
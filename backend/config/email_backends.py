@@ -1,245 +1,288 @@
 """
 Custom email backend using Resend API (works with Render free tier - no SMTP needed).
+
+The backend talks to the Resend REST API through a requests.Session that it
+keeps open between open() and close(), so callers that reuse one connection
+(get_connection() + send_messages(), or the outbox worker) pay the TLS
+handshake to api.resend.com once instead of once per email. Multi-message
+sends are grouped into Resend batch requests.
 """
+import base64
 import logging
+import threading
+from email.mime.base import MIMEBase
+
+import requests
+from requests.adapters import HTTPAdapter
 from django.core.mail.backends.base import BaseEmailBackend
 from django.conf import settings
 
 logger = logging.getLogger(__name__)
 
-# Try to import resend package
-resend = None
-resend_import_error = None
-try:
-    import resend
-    # Verify it has the Emails attribute we need
-    if hasattr(resend, 'Emails'):
-        logger.info("✅ Resend package imported successfully")
-    else:
-        logger.error("❌ Resend package imported but missing 'Emails' attribute")
-        resend = None
-except ImportError as e:
-    resend_import_error = str(e)
-    logger.error(f"❌ Failed to import resend package: {e}")
-    logger.error("   Make sure 'resend' is in requirements.txt and installed")
-    logger.error("   Try: pip install resend==1.0.0")
-except Exception as e:
-    resend_import_error = str(e)
-    logger.error(f"❌ Unexpected error importing resend package: {e}")
+DEFAULT_API_URL = 'https://api.resend.com'
+DEFAULT_TIMEOUT = 10
+# Keep-alive connections held by one backend instance
+POOL_SIZE = 4
+# Maximum number of emails Resend accepts in one /emails/batch request
+BATCH_SIZE = 100
+# 4xx statuses that concern the request as a whole rather than one of its emails
+REQUEST_ERRORS = (401, 403, 429)
+
+
+class ResendAPIError(ValueError):
+    """An error response from the Resend API."""
+
+    def __init__(self, status_code, error):
+        super().__init__(f"Resend API error ({status_code}): {error}")
+        self.status_code = status_code
 
 
 class ResendEmailBackend(BaseEmailBackend):
     """Email backend using Resend API instead of SMTP."""
-    
-    def __init__(self, fail_silently=False, **kwargs):
+
+    batch_size = BATCH_SIZE
+
+    def __init__(self, fail_silently=False, api_key=None, api_url=None, timeout=None, **kwargs):
         super().__init__(fail_silently=fail_silently, **kwargs)
-        
-        # Check if resend package is installed
-        if not resend:
-            error_msg = "❌ Resend package not installed. Install with: pip install resend"
-            if resend_import_error:
-                error_msg += f"\n   Import error: {resend_import_error}"
-            logger.error(error_msg)
-            self.resend_api_key = None
-            self.from_email = getattr(settings, 'DEFAULT_FROM_EMAIL', 'noreply@naildbybola.com')
-            return
-        
+
         # Get API key from settings (always set, even if empty)
-        self.resend_api_key = getattr(settings, 'RESEND_API_KEY', None)
+        self.resend_api_key = (api_key or getattr(settings, 'RESEND_API_KEY', None) or '').strip()
+        self.api_url = (api_url or getattr(settings, 'RESEND_API_URL', DEFAULT_API_URL)).rstrip('/')
+        self.timeout = timeout or getattr(settings, 'RESEND_TIMEOUT', DEFAULT_TIMEOUT)
         self.from_email = getattr(settings, 'DEFAULT_FROM_EMAIL', 'noreply@naildbybola.com')
-        
+        self.session = None
+        self._lock = threading.RLock()
+
         # Check if API key is set and not empty
-        if not self.resend_api_key or not self.resend_api_key.strip():
+        if not self.resend_api_key:
             logger.warning("⚠️  RESEND_API_KEY not set or empty in settings. Emails will not be sent.")
-            logger.warning(f"   Current value: {repr(self.resend_api_key)}")
             logger.warning(f"   Set RESEND_API_KEY in Render Dashboard → Environment variables")
+
+    def open(self):
+        """
+        Open the keep-alive HTTP session.
+
+        Returns True if a new session was created, False if one was already open
+        (same contract as Django's SMTP backend).
+        """
+        if self.session is not None:
+            return False
+
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POOL_SIZE)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        session.headers.update({
+            'Authorization': f'Bearer {self.resend_api_key}',
+            'Content-Type': 'application/json',
+        })
+        self.session = session
+        return True
+
+    def close(self):
+        """Close the HTTP session and its pooled connections."""
+        if self.session is None:
             return
-        
-        # Set Resend API key
         try:
-            resend.api_key = self.resend_api_key.strip()
-            logger.info(f"✅ Resend API key configured (length: {len(self.resend_api_key)})")
-        except Exception as e:
-            logger.error(f"❌ Failed to set Resend API key: {e}")
-            self.resend_api_key = None
-    
+            self.session.close()
+        finally:
+            self.session = None
+
     def send_messages(self, email_messages):
-        """Send email messages using Resend API."""
-        # Try to import resend again at runtime (in case it wasn't available at module load)
-        global resend
-        if not resend:
-            try:
-                import resend
-                logger.info("✅ Resend package imported successfully at runtime")
-                # Set API key if we just imported it
-                if self.resend_api_key:
-                    try:
-                        resend.api_key = self.resend_api_key.strip()
-                        logger.info(f"✅ Resend API key configured at runtime (length: {len(self.resend_api_key)})")
-                    except Exception as e:
-                        logger.error(f"❌ Failed to set Resend API key at runtime: {e}")
-            except ImportError as e:
-                logger.error(f"❌ Failed to import resend package at runtime: {e}")
-                logger.error("   This usually means the package isn't installed in the Docker container")
-                logger.error("   Check that 'resend==1.0.0' is in requirements.txt")
-                if not self.fail_silently:
-                    raise ValueError(f"Resend package not installed. Error: {e}. Install with: pip install resend==1.0.0")
-                return 0
-        
-        if not resend or not self.resend_api_key:
+        """
+        Send email messages using Resend API.
+
+        Messages without attachments go out through the batch endpoint, up to
+        batch_size per request; messages with attachments are sent one by one
+        since the batch endpoint does not accept them. Each sent message gets
+        its Resend ID set as `message.resend_id`; a message that failed gets
+        the error as `message.send_error`.
+        """
+        if not email_messages:
+            return 0
+
+        if not self.resend_api_key:
             if not self.fail_silently:
                 raise ValueError("Resend not configured. Set RESEND_API_KEY in settings.")
             return 0
-        
-        sent_count = 0
-        for message in email_messages:
+
+        with self._lock:
+            new_session_created = self.open()
             try:
-                # Extract recipients
-                to_emails = message.to
-                if not to_emails:
-                    logger.warning("No recipients in email message")
-                    continue
-                
-                # Resend v1.0.0 accepts both string and list for 'to'
-                # Convert to list if it's a single string
-                if isinstance(to_emails, str):
-                    to_emails_list = [to_emails]
-                else:
-                    to_emails_list = list(to_emails)
-                
-                # Prepare email data
-                email_data = {
-                    "from": message.from_email or self.from_email,
-                    "to": to_emails_list,  # Resend accepts list of recipients
-                    "subject": message.subject,
-                }
-                
-                # Handle CC and BCC
-                if hasattr(message, 'cc') and message.cc:
-                    email_data["cc"] = message.cc
-                if hasattr(message, 'bcc') and message.bcc:
-                    email_data["bcc"] = message.bcc
-                
-                # Extract HTML and text from alternatives
-                html_content = None
-                text_content = None
-                
-                if hasattr(message, 'alternatives') and message.alternatives:
-                    for alt in message.alternatives:
-                        if alt[1] == 'text/html':
-                            html_content = alt[0]
-                        elif alt[1] == 'text/plain':
-                            text_content = alt[0]
-                
-                # Set HTML content (preferred) or text content
-                if html_content:
-                    email_data["html"] = html_content
-                if text_content:
-                    email_data["text"] = text_content
-                
-                # If no HTML/text from alternatives, use body
-                if not html_content and not text_content:
-                    # Try to determine if body is HTML or plain text
-                    if '<html' in message.body.lower() or '<body' in message.body.lower():
-                        email_data["html"] = message.body
+                sent_count = 0
+                batchable = []
+                for message in email_messages:
+                    if not message.to:
+                        logger.warning("No recipients in email message")
+                    elif message.attachments:
+                        sent_count += self._send(message)
                     else:
-                        email_data["text"] = message.body
-                
-                # Send via Resend API
-                # Resend v1.0.0 uses resend.Emails.send() with params dict
-                logger.info(f"📧 Sending email via Resend")
-                logger.info(f"   From: {email_data.get('from')}")
-                logger.info(f"   To: {to_emails_list}")
-                logger.info(f"   Subject: {email_data.get('subject')}")
-                logger.debug(f"Email data: subject={email_data.get('subject')}, has_html={bool(email_data.get('html'))}, has_text={bool(email_data.get('text'))}")
-                
-                # Ensure API key is set (in case it wasn't set during init)
-                if not hasattr(resend, 'api_key') or not resend.api_key:
-                    resend.api_key = self.resend_api_key.strip()
-                    logger.info("✅ Resend API key set before sending")
-                
-                # Call Resend API - use the correct format from documentation
-                logger.info(f"   Calling Resend API...")
-                try:
-                    result = resend.Emails.send(email_data)
-                except Exception as api_error:
-                    # Catch Resend API exceptions and log them clearly
-                    logger.error(f"   ❌ Resend API call failed: {api_error}")
-                    logger.error(f"   Error type: {type(api_error).__name__}")
-                    # Try to extract more details from the exception
-                    if hasattr(api_error, 'message'):
-                        logger.error(f"   Error message: {api_error.message}")
-                    if hasattr(api_error, 'status_code'):
-                        logger.error(f"   Status code: {api_error.status_code}")
-                    if hasattr(api_error, 'response'):
-                        logger.error(f"   Response: {api_error.response}")
-                    # Log the full exception string
-                    logger.error(f"   Full error: {str(api_error)}")
-                    raise  # Re-raise to be caught by outer exception handler
-                
-                # Log the full result for debugging (use info so it shows in Render logs)
-                logger.info(f"   Resend API response received")
-                logger.info(f"   Response type: {type(result).__name__}")
-                if hasattr(result, '__dict__'):
-                    logger.info(f"   Response attributes: {[attr for attr in dir(result) if not attr.startswith('_')]}")
-                if isinstance(result, dict):
-                    logger.info(f"   Response dict: {result}")
-                elif hasattr(result, 'id'):
-                    logger.info(f"   Response ID: {result.id}")
-                
-                # Check for errors in result
-                if hasattr(result, 'error'):
-                    error_msg = f"❌ Resend API error: {result.error}"
-                    logger.error(error_msg)
-                    if not self.fail_silently:
-                        raise ValueError(error_msg)
-                    continue
-                
-                # Check if result is a dict with error
-                if isinstance(result, dict) and result.get('error'):
-                    error_msg = f"❌ Resend API error: {result.get('error')}"
-                    logger.error(error_msg)
-                    if not self.fail_silently:
-                        raise ValueError(error_msg)
-                    continue
-                
-                # Check for success (message ID indicates success)
-                if result and hasattr(result, 'id'):
-                    sent_count += 1
-                    logger.info(f"✅ Email sent successfully via Resend. Message ID: {result.id}")
-                elif result and isinstance(result, dict) and result.get('id'):
-                    sent_count += 1
-                    logger.info(f"✅ Email sent successfully via Resend. Message ID: {result.get('id')}")
-                elif result:
-                    sent_count += 1
-                    logger.info(f"✅ Email sent successfully via Resend. Result: {result}")
-                else:
-                    error_msg = f"❌ Resend API returned no result for email to {to_emails}"
-                    logger.error(error_msg)
-                    logger.error(f"   Full result object: {result}")
-                    if not self.fail_silently:
-                        raise ValueError(error_msg)
-                    
-            except Exception as e:
-                error_msg = f"❌ Failed to send email via Resend to {to_emails}: {str(e)}"
-                logger.error(error_msg, exc_info=True)
-                logger.error(f"Email data was: {email_data}")
-                logger.error(f"Exception type: {type(e).__name__}")
-                
-                # Check for specific Resend API errors
-                error_str = str(e).lower()
-                if 'unauthorized' in error_str or 'invalid api key' in error_str:
-                    logger.error("   ⚠️  This looks like an API key issue. Check RESEND_API_KEY in environment variables.")
-                elif 'domain' in error_str or 'from' in error_str or 'sender' in error_str:
-                    logger.error("   ⚠️  This looks like a 'from' address issue.")
-                    logger.error("   💡 Resend's test domain (onboarding@resend.dev) may have restrictions.")
-                    logger.error("   💡 Try verifying your domain in Resend Dashboard or use a verified email.")
-                elif 'recipient' in error_str or 'to' in error_str:
-                    logger.error("   ⚠️  This looks like a recipient address issue.")
-                    logger.error("   💡 Resend's test domain may only allow sending to verified addresses.")
-                
-                if not self.fail_silently:
-                    raise Exception(error_msg) from e
-        
+                        batchable.append(message)
+
+                for start in range(0, len(batchable), self.batch_size):
+                    chunk = batchable[start:start + self.batch_size]
+                    if len(chunk) == 1:
+                        sent_count += self._send(chunk[0])
+                    else:
+                        sent_count += self._send_batch(chunk)
+            finally:
+                if new_session_created:
+                    self.close()
         return sent_count
 
+    def _build_payload(self, message):
+        """Convert an EmailMessage into a Resend API payload."""
+        # Extract recipients
+        to_emails = message.to
+        if isinstance(to_emails, str):
+            to_emails = [to_emails]
+
+        # Prepare email data
+        email_data = {
+            "from": message.from_email or self.from_email,
+            "to": list(to_emails),  # Resend accepts list of recipients
+            "subject": message.subject,
+        }
+
+        # Handle CC and BCC
+        if getattr(message, 'cc', None):
+            email_data["cc"] = message.cc
+        if getattr(message, 'bcc', None):
+            email_data["bcc"] = message.bcc
+        if getattr(message, 'reply_to', None):
+            email_data["reply_to"] = message.reply_to
+
+        # Extract HTML and text from alternatives
+        html_content = None
+        text_content = None
+
+        for content, mimetype in getattr(message, 'alternatives', None) or []:
+            if mimetype == 'text/html':
+                html_content = content
+            elif mimetype == 'text/plain':
+                text_content = content
+
+        # The body is the plain text part when an HTML alternative is attached
+        if html_content and not text_content and message.body:
+            text_content = message.body
+
+        # Set HTML content (preferred) or text content
+        if html_content:
+            email_data["html"] = html_content
+        if text_content:
+            email_data["text"] = text_content
+
+        # If no HTML/text from alternatives, use body
+        if not html_content and not text_content:
+            # Try to determine if body is HTML or plain text
+            if '<html' in message.body.lower() or '<body' in message.body.lower():
+                email_data["html"] = message.body
+            else:
+                email_data["text"] = message.body
+
+        if message.attachments:
+            email_data["attachments"] = [self._build_attachment(attachment) for attachment in message.attachments]
+
+        return email_data
+
+    def _build_attachment(self, attachment):
+        """Convert a (filename, content, mimetype) tuple or MIME part into a Resend attachment."""
+        if isinstance(attachment, MIMEBase):
+            filename = attachment.get_filename()
+            content = attachment.get_payload(decode=True)
+        else:
+            filename, content, _mimetype = attachment
+            if isinstance(content, str):
+                content = content.encode()
+        return {
+            "filename": filename,
+            "content": base64.b64encode(content).decode('ascii'),
+        }
+
+    def _post(self, path, payload):
+        """POST a JSON payload to the Resend API and return the decoded response."""
+        response = self.session.post(f'{self.api_url}{path}', json=payload, timeout=self.timeout)
+        result = response.json() if response.content else {}
+        if response.status_code >= 400:
+            error = result.get('message') or result.get('error') or response.text
+            raise ResendAPIError(response.status_code, error)
+        return result
+
+    def _handle_error(self, recipients, error):
+        """Log a failed send and re-raise unless fail_silently is set."""
+        error_msg = f"❌ Failed to send email via Resend to {recipients}: {str(error)}"
+        logger.error(error_msg, exc_info=True)
+
+        # Check for specific Resend API errors
+        error_str = str(error).lower()
+        if 'unauthorized' in error_str or 'api key' in error_str:
+            logger.error("   ⚠️  This looks like an API key issue. Check RESEND_API_KEY in environment variables.")
+        elif 'domain' in error_str or 'from' in error_str or 'sender' in error_str:
+            logger.error("   ⚠️  This looks like a 'from' address issue.")
+            logger.error("   💡 Resend's test domain (onboarding@resend.dev) may have restrictions.")
+            logger.error("   💡 Try verifying your domain in Resend Dashboard or use a verified email.")
+
+        if not self.fail_silently:
+            raise Exception(error_msg) from error
+
+    def _send(self, message):
+        """Send one message over the open session. Returns 1 on success, 0 otherwise."""
+        email_data = self._build_payload(message)
+        logger.info(f"📧 Sending email via Resend to {email_data['to']}: {email_data['subject']}")
+
+        try:
+            result = self._post('/emails', email_data)
+            if not result.get('id'):
+                raise ValueError(f"Resend API returned no message ID: {result}")
+        except Exception as e:
+            message.send_error = e
+            self._handle_error(email_data['to'], e)
+            return 0
+
+        message.resend_id = result['id']
+        logger.info(f"✅ Email sent successfully via Resend. Message ID: {result['id']}")
+        return 1
+
+    def _send_batch(self, messages):
+        """Send up to batch_size messages in one batch request. Returns the number sent."""
+        payload = [self._build_payload(message) for message in messages]
+        recipients = [address for email_data in payload for address in email_data['to']]
+        logger.info(f"📧 Sending batch of {len(payload)} emails via Resend")
+
+        try:
+            data = self._post('/emails/batch', payload).get('data') or []
+            if len(data) != len(messages):
+                raise ValueError(f"Resend batch returned {len(data)} results for {len(messages)} emails")
+        except ResendAPIError as e:
+            if e.status_code < 400 or e.status_code >= 500 or e.status_code in REQUEST_ERRORS:
+                for message in messages:
+                    message.send_error = e
+                self._handle_error(recipients, e)
+                return 0
+            # Resend rejects the whole batch over one bad email: send them one by one
+            logger.warning(f"⚠️  Resend rejected the batch ({e}), sending its {len(messages)} emails one by one")
+            return self._send_each(messages)
+        except Exception as e:
+            for message in messages:
+                message.send_error = e
+            self._handle_error(recipients, e)
+            return 0
+
+        # Results come back in request order
+        for message, item in zip(messages, data):
+            message.resend_id = item.get('id')
+        logger.info(f"✅ Batch of {len(messages)} emails sent successfully via Resend")
+        return len(messages)
+
+    def _send_each(self, messages):
+        """Send messages one at a time so a bad one can't stop the others. Returns the number sent."""
+        sent_count, errors = 0, []
+        for message in messages:
+            try:
+                sent_count += self._send(message)
+            except Exception as e:
+                errors.append(e)
+        if errors:
+            # _send() has logged each failure; only reached when not fail_silently
+            raise Exception(f"❌ {len(errors)} of {len(messages)} emails failed via Resend") from errors[0]
+        return sent_count
@@ -0,0 +1,217 @@
+"""
+Fast read-only serialization for list actions.
+
+A ModelSerializer builds a model instance per row and then calls
+get_attribute() and to_representation() field by field. For lists of a few
+hundred rows that is most of the request's CPU time. FastListMixin compiles
+the viewset's serializer once into a ValuesPlan, a flat list of
+.values_list() columns plus one converter per output key. It then builds
+each row's dict straight from the tuples, without model instances, and
+with the same keys, order and value formatting as the serializer.
+
+A plan can be compiled when every readable field is one of:
+
+- a concrete model field, possibly reached through forward relations with
+  a dotted source. Plain text, number and choice fields are copied as they
+  are. File fields become URLs the way DRF builds them. Anything else goes
+  through the DRF field's own to_representation();
+- a nested serializer for a forward relation, compiled recursively into the
+  same query;
+- a field with a `values_plan(model)` method returning (columns,
+  build(request, *values)), like SrcsetField;
+- a computed field named in the serializer's Meta.computed_fields, as
+  {name: (columns, function(*values))}, for model properties.
+
+Otherwise the viewset falls back to the serializer, so the fast path only
+changes speed, never output. `manage.py benchmark_serialization` checks
+both paths give identical JSON.
+"""
+import threading
+from operator import itemgetter
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.relations import PrimaryKeyRelatedField, RelatedField
+from rest_framework.response import Response
+
+from .storage import url_builder
+
+# Fields whose to_representation() returns the database value unchanged
+IDENTITY_FIELDS = (
+    serializers.CharField, serializers.EmailField, serializers.ChoiceField, serializers.IntegerField,
+    serializers.BooleanField, serializers.ReadOnlyField,
+)
+
+# Sparse fieldsets (config.fieldsets) compile a plan per field combination
+MAX_PLANS = 256
+
+_plans = {}
+_plans_lock = threading.Lock()
+
+
+class Unsupported(Exception):
+    """The serializer has a field the fast path can't build from .values()."""
+
+
+def _resolve(model, attrs):
+    """The model field at the end of a source path, following forward relations."""
+    for index, attr in enumerate(attrs):
+        try:
+            field = model._meta.get_field(attr)
+        except FieldDoesNotExist:
+            raise Unsupported(attr)
+        if index < len(attrs) - 1:
+            if not (field.is_relation and (field.many_to_one or field.one_to_one) and field.concrete):
+                raise Unsupported(attr)
+            model = field.related_model
+    if not field.concrete or field.many_to_many:
+        raise Unsupported(attrs[-1])
+    return field
+
+
+class ValuesPlan:
+    """Columns to fetch and how to turn each row into the serializer's output."""
+
+    def __init__(self, serializer, model, prefix=''):
+        self.columns = []
+        # (key, kind, payload): kind is 'value', 'convert', 'file', 'build', 'computed' or 'nested'
+        self.entries = []
+        computed = getattr(getattr(serializer, 'Meta', None), 'computed_fields', {})
+
+        for field in serializer._readable_fields:
+            key = field.field_name
+            if key in computed:
+                columns, function = computed[key]
+                self.entries.append((key, 'computed', (self._add(prefix, columns), function)))
+            elif hasattr(field, 'values_plan'):
+                columns, build = field.values_plan(model)
+                self.entries.append((key, 'build', (self._add(prefix, columns), build)))
+            elif isinstance(field, serializers.BaseSerializer):
+                self.entries.append((key, 'nested', self._nested(field, model, prefix)))
+            else:
+                self.entries.append(self._simple(field, model, prefix))
+
+    def _add(self, prefix, columns):
+        indexes = []
+        for column in columns:
+            self.columns.append(prefix + column)
+            indexes.append(len(self.columns) - 1)
+        return indexes
+
+    def _nested(self, field, model, prefix):
+        if getattr(field, 'many', False) or len(field.source_attrs) != 1:
+            raise Unsupported(field.field_name)
+        relation = model._meta.get_field(field.source)
+        if not (relation.is_relation and (relation.many_to_one or relation.one_to_one) and relation.concrete):
+            raise Unsupported(field.field_name)
+        related = relation.related_model
+        plan = ValuesPlan(field, related, f'{prefix}{field.source}__')
+        # A missing related row serializes as None
+        pk = self._add(prefix, [f'{field.source}__{related._meta.pk.name}'])[0] if relation.null else None
+        start = len(self.columns)
+        self.columns.extend(plan.columns)
+        return start, plan, pk
+
+    def _simple(self, field, model, prefix):
+        key = field.field_name
+        if isinstance(field, RelatedField) and not isinstance(field, PrimaryKeyRelatedField):
+            raise Unsupported(key)
+        if isinstance(field, serializers.ModelField) or field.source == '*':
+            raise Unsupported(key)
+        model_field = _resolve(model, field.source_attrs)
+        column = self._add(prefix, ['__'.join(field.source_attrs)])[0]
+        if isinstance(field, serializers.FileField):
+            return key, 'file', (column, model_field.storage)
+        if isinstance(field, PrimaryKeyRelatedField) or type(field) in IDENTITY_FIELDS:
+            return key, 'value', column
+        return key, 'convert', (column, field.to_representation)
+
+    def bind(self, request, offset=0):
+        """Return a function turning one row tuple into the output dict."""
+        getters = []
+        for key, kind, payload in self.entries:
+            if kind == 'value':
+                getters.append((key, itemgetter(payload + offset)))
+            elif kind == 'convert':
+                index, convert = payload
+                getters.append((key, lambda row, i=index + offset, f=convert: None if row[i] is None else f(row[i])))
+            elif kind == 'file':
+                index, storage = payload
+                build = url_builder(storage, request)
+                getters.append((key, lambda row, i=index + offset, f=build: f(row[i]) if row[i] else None))
+            elif kind == 'computed':
+                indexes, function = payload
+                indexes = [index + offset for index in indexes]
+                getters.append((key, lambda row, ix=indexes, f=function: f(*[row[i] for i in ix])))
+            elif kind == 'build':
+                indexes, build = payload
+                indexes = [index + offset for index in indexes]
+                getters.append((key, lambda row, ix=indexes, f=build: f(request, *[row[i] for i in ix])))
+            else:
+                start, plan, pk = payload
+                nested = plan.bind(request, offset + start)
+                if pk is not None:
+                    getters.append((key, lambda row, n=nested, p=pk + offset: None if row[p] is None else n(row)))
+                else:
+                    getters.append((key, nested))
+
+        def row_to_dict(row):
+            return {key: getter(row) for key, getter in getters}
+        return row_to_dict
+
+    def load_fields(self):
+        """Field paths for QuerySet.only(): the columns and the relations they go through."""
+        paths = set()
+        for column in self.columns:
+            parts = column.split('__')
+            paths.update('__'.join(parts[:index]) for index in range(1, len(parts) + 1))
+        return sorted(paths)
+
+    def serialize(self, rows, request):
+        convert = self.bind(request)
+        return [convert(row) for row in rows]
+
+
+def get_plan(serializer):
+    """The compiled ValuesPlan for a serializer instance, or None if it can't have one."""
+    # ?fields= can also prune a nested serializer or collapse it to its pk (config.fieldsets)
+    key = (type(serializer), tuple(serializer.fields), getattr(serializer, 'fieldset_key', None))
+    try:
+        return _plans[key]
+    except KeyError:
+        pass
+    try:
+        plan = ValuesPlan(serializer, serializer.Meta.model)
+    except Unsupported:
+        plan = None
+    # Threaded workers share the cache; eviction and insertion must not interleave
+    with _plans_lock:
+        if key not in _plans:
+            if len(_plans) >= MAX_PLANS:
+                del _plans[next(iter(_plans))]
+            _plans[key] = plan
+        return _plans[key]
+
+
+class FastListMixin:
+    """
+    Serve list actions from .values_list() rows through a ValuesPlan.
+
+    Add before the DRF ViewSet base class (after the caching mixins). Turned
+    off with API_FAST_LIST = False, and skipped for serializers with fields
+    it can't build.
+    """
+
+    def list(self, request, *args, **kwargs):
+        plan = get_plan(self.get_serializer()) if settings.API_FAST_LIST else None
+        if plan is None:
+            return super().list(request, *args, **kwargs)
+
+        # KeysetPagination reads each row's cursor position from trailing key columns
+        key_fields = getattr(self.paginator, 'key_fields', ())
+        rows = self.filter_queryset(self.get_queryset()).values_list(*plan.columns, *key_fields)
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(plan.serialize(page, request))
+        return Response(plan.serialize(rows, request))
@@ -0,0 +1,121 @@
+"""
+Sparse fieldsets for the API's GET endpoints.
+
+    ?fields=id,name,price,image       only these keys
+    ?omit=description                 every key but these
+    ?fields=id,service.name           dotted paths reach into nested objects
+    ?fields=id,service&expand=service keep `service` as an object
+
+SparseFieldsMixin prunes a serializer's fields from those query parameters.
+A nested serializer named in Meta.expandable_fields (the booking's service)
+is collapsed to its primary key in a sparse response, unless it is listed
+in ?expand= or a dotted path selects fields inside it. Without ?fields= or
+?omit= every response is exactly as before, and ?expand= does nothing.
+Unknown names are ignored. Writes always use the full serializer, so the
+parameters can't drop a required input.
+
+SparseQuerysetMixin pushes the same projection down to the queryset with
+.only(), from the fast list plan of the pruned serializer (config.fastlist),
+so the database doesn't send columns the response leaves out either.
+"""
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.relations import PrimaryKeyRelatedField
+
+from .fastlist import get_plan
+
+FIELDS_PARAM = 'fields'
+OMIT_PARAM = 'omit'
+EXPAND_PARAM = 'expand'
+
+
+def _paths(request, param):
+    return [path.strip() for path in request.query_params.get(param, '').split(',') if path.strip()]
+
+
+def is_sparse(request):
+    """Whether a request asks for sparse fieldsets."""
+    return (
+        request is not None and request.method in SAFE_METHODS
+        and bool(_paths(request, FIELDS_PARAM) or _paths(request, OMIT_PARAM))
+    )
+
+
+def _joins(related, prefix=''):
+    """The paths in a QuerySet's select_related tree."""
+    for name, nested in related.items():
+        yield prefix + name
+        yield from _joins(nested, f'{prefix}{name}__')
+
+
+class SparseFieldsMixin:
+    """Serializer mixin honouring ?fields=, ?omit= and ?expand= (add before ModelSerializer)."""
+
+    @property
+    def fieldset_key(self):
+        """The request's sparse fieldset parameters, which shape nested serializers too (None if not sparse)."""
+        request = self.context.get('request')
+        if not is_sparse(request):
+            return None
+        return tuple(tuple(_paths(request, param)) for param in (FIELDS_PARAM, OMIT_PARAM, EXPAND_PARAM))
+
+    def _prefix(self):
+        """This serializer's dotted path from the root serializer, with a trailing dot ('' for the root)."""
+        names, node = [], self
+        while node.parent is not None:
+            if node.field_name:
+                names.append(node.field_name)
+            node = node.parent
+        return ''.join(f'{name}.' for name in reversed(names))
+
+    def get_fields(self):
+        fields = super().get_fields()
+        request = self.context.get('request')
+        if not is_sparse(request):
+            return fields
+
+        prefix = self._prefix()
+
+        def below(param):
+            return [path[len(prefix):] for path in _paths(request, param) if path.startswith(prefix)]
+
+        selected, omitted = below(FIELDS_PARAM), below(OMIT_PARAM)
+        if selected:
+            keep = {path.split('.')[0] for path in selected}
+            fields = {name: field for name, field in fields.items() if name in keep}
+        for name in omitted:
+            fields.pop(name, None)
+
+        expanded = set(below(EXPAND_PARAM)) | {path.split('.')[0] for path in selected + omitted if '.' in path}
+        for name in getattr(self.Meta, 'expandable_fields', ()):
+            if name in fields and name not in expanded:
+                source = fields[name].source
+                fields[name] = PrimaryKeyRelatedField(read_only=True, **({'source': source} if source else {}))
+        return fields
+
+
+class SparseQuerysetMixin:
+    """
+    Load only the columns a sparse response needs.
+
+    Add before the DRF ViewSet base class. Serializers the fast list path
+    can't compile load every column, as before.
+    """
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if is_sparse(self.request):
+            plan = get_plan(self.get_serializer())
+            if plan is not None:
+                loaded = plan.load_fields()
+                if isinstance(queryset.query.select_related, dict):
+                    # Don't join relations the response leaves out (.only() would refuse to)
+                    joins = [
+                        path for path in _joins(queryset.query.select_related)
+                        if any(field.startswith(f'{path}__') for field in loaded)
+                    ]
+                    queryset = queryset.select_related(None)
+                    if joins:
+                        queryset = queryset.select_related(*joins)
+                # Keyset pagination reads its cursor from the key columns
+                queryset = queryset.only(*loaded, *getattr(self.paginator, 'key_fields', ()))
+        return queryset
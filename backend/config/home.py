@@ -0,0 +1,102 @@
+"""
+Homepage bundle: featured services, gallery images and testimonials in one response.
+
+The home page used to make three list requests, each with its own
+pagination COUNT query and full serializer. /api/home/ returns the fields
+the page renders, built from three narrow .values() queries. The response
+is cached under the cache versions of all three models (see
+config.caching), so any change to one of them rebuilds it, and the same
+versions make the ETag: revalidation never touches the database.
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.cache import get_conditional_response, patch_cache_control
+from rest_framework.decorators import api_view
+from rest_framework.response import Response
+
+from apps.gallery.models import GalleryImage
+from apps.services.models import Service
+from apps.testimonials.models import Testimonial
+from .caching import RESPONSE_KEY_PREFIX, get_version
+from .querybudget import query_budget
+
+HOME_MODELS = (Service, GalleryImage, Testimonial)
+# Items per section; the page shows six gallery images
+SERVICES_LIMIT = 20
+GALLERY_LIMIT = 6
+TESTIMONIALS_LIMIT = 20
+
+
+def _file_url(field, name, request):
+    """Absolute URL for a stored file name, as DRF's ImageField renders it."""
+    if not name:
+        return None
+    url = field.storage.url(name)
+    return request.build_absolute_uri(url) if request else url
+
+
+def _rows(queryset, fields, request):
+    """Run a .values() query, turning file names into URLs and decimals into DRF-style strings."""
+    model = queryset.model
+    file_fields = [name for name in fields if hasattr(model._meta.get_field(name), 'storage')]
+    decimal_places = {
+        name: model._meta.get_field(name).decimal_places
+        for name in fields if model._meta.get_field(name).get_internal_type() == 'DecimalField'
+    }
+    rows = list(queryset.values(*fields))
+    for row in rows:
+        for name in file_fields:
+            row[name] = _file_url(model._meta.get_field(name), row[name], request)
+        for name, places in decimal_places.items():
+            if row[name] is not None:
+                row[name] = f'{row[name]:.{places}f}'
+    return rows
+
+
+def build_home(request=None):
+    """The bundle's data: three queries, no COUNT."""
+    return {
+        'services': _rows(
+            Service.objects.filter(is_active=True, is_featured=True).order_by('category', 'name')[:SERVICES_LIMIT],
+            ['id', 'name', 'category', 'description', 'price', 'duration_minutes', 'image', 'second_image',
+             'placeholder'],
+            request,
+        ),
+        'gallery': _rows(
+            GalleryImage.objects.filter(is_active=True, is_featured=True)
+            .order_by('-sort_order', '-is_featured', '-created_at')[:GALLERY_LIMIT],
+            ['id', 'title', 'category', 'image', 'comparison_image', 'thumbnail', 'composite', 'placeholder'],
+            request,
+        ),
+        'testimonials': _rows(
+            Testimonial.objects.filter(is_approved=True, is_featured=True)
+            .order_by('-is_featured', '-rating', '-created_at')[:TESTIMONIALS_LIMIT],
+            ['id', 'client_name', 'client_photo', 'service_category', 'rating', 'review_text'],
+            request,
+        ),
+    }
+
+
+@query_budget(3)
+@api_view(['GET'])
+def home(request):
+    """Featured services, gallery images and testimonials for the home page."""
+    versions = ':'.join(str(get_version(model)) for model in HOME_MODELS)
+    etag = f'"{hashlib.sha1(versions.encode()).hexdigest()}"'
+
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        # Keyed by host and scheme too: the data holds absolute URLs
+        url = hashlib.sha1(request.build_absolute_uri().encode()).hexdigest()
+        key = f'{RESPONSE_KEY_PREFIX}:home:{versions}:{url}'
+        data = cache.get(key)
+        if data is None:
+            data = build_home(request)
+            cache.set(key, data, settings.API_CACHE_TIMEOUT)
+        response = Response(data)
+    response['ETag'] = etag
+    # Clients may keep the response but must revalidate before reuse
+    patch_cache_control(response, no_cache=True)
+    return response
@@ -0,0 +1,114 @@
+"""
+Django management command that compares the home page's three featured-content
+requests with the single /api/home/ bundle.
+
+Usage:
+    python manage.py benchmark_home                      # existing data
+    python manage.py benchmark_home --seed 20            # add 20 featured rows per model (removed afterwards)
+    python manage.py benchmark_home --rtt 300 --kbps 400 # slow-connection estimate
+
+For each variant it reports database queries, response bytes and server time
+with a cold and a warm cache, then estimates time to first render on a slow
+link: one round trip per request wave plus transfer time. The browser sends
+the three separate requests in parallel, so they cost one wave but need three
+connections and three responses' worth of bytes.
+"""
+
+import time
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import Client
+
+from apps.gallery.models import GalleryImage
+from apps.services.models import Service
+from apps.testimonials.models import Testimonial
+from config.caching import bump_version
+from config.home import HOME_MODELS
+
+SEED_PREFIX = 'Benchmark'
+
+SEPARATE = ['/api/services/?is_featured=true', '/api/testimonials/?is_featured=true', '/api/gallery/?is_featured=true']
+BUNDLE = ['/api/home/']
+
+
+class Command(BaseCommand):
+    help = 'Benchmarks the /api/home/ bundle against the three separate featured-content requests'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed', type=int, default=0, help='Featured rows to add per model (removed afterwards)')
+        parser.add_argument('--repeat', type=int, default=20, help='Warm requests to average')
+        parser.add_argument('--rtt', type=float, default=300, help='Round-trip time in ms for the estimate')
+        parser.add_argument('--kbps', type=float, default=400, help='Bandwidth in kbit/s for the estimate')
+
+    def _seed(self, count):
+        Service.objects.bulk_create(
+            Service(
+                name=f'{SEED_PREFIX} service {index}', category='nails', description='Lovely nails ' * 20,
+                price=Decimal('35.00'), duration_minutes=60, is_featured=True,
+            )
+            for index in range(count)
+        )
+        GalleryImage.objects.bulk_create(
+            GalleryImage(
+                title=f'{SEED_PREFIX} image {index}', category='nails', image=f'gallery/benchmark-{index}.jpg',
+                is_featured=True, processing_status='skipped',
+            )
+            for index in range(count)
+        )
+        Testimonial.objects.bulk_create(
+            Testimonial(
+                client_name=f'{SEED_PREFIX} client {index}', service_category='nails', rating=5,
+                review_text='Lovely work ' * 15, is_featured=True,
+            )
+            for index in range(count)
+        )
+
+    def _unseed(self):
+        Service.objects.filter(name__startswith=SEED_PREFIX).delete()
+        GalleryImage.objects.filter(title__startswith=SEED_PREFIX).delete()
+        Testimonial.objects.filter(client_name__startswith=SEED_PREFIX).delete()
+
+    def _measure(self, client, urls, repeat):
+        """Return (cold queries, cold ms, warm ms, bytes) for fetching every URL."""
+        for model in HOME_MODELS:
+            bump_version(model)
+        # Counted with a wrapper: the query log is reset at the start of every request
+        queries = []
+        with connection.execute_wrapper(lambda execute, sql, *args: queries.append(sql) or execute(sql, *args)):
+            started = time.perf_counter()
+            size = sum(len(client.get(url, HTTP_HOST='localhost').content) for url in urls)
+            cold = (time.perf_counter() - started) * 1000
+
+        started = time.perf_counter()
+        for _ in range(repeat):
+            for url in urls:
+                client.get(url, HTTP_HOST='localhost')
+        warm = (time.perf_counter() - started) * 1000 / repeat
+        return len(queries), cold, warm, size
+
+    def handle(self, *args, **options):
+        client = Client()
+        results = {}
+        if options['seed']:
+            self._seed(options['seed'])
+        try:
+            for label, urls in (('3 requests', SEPARATE), ('/api/home/', BUNDLE)):
+                results[label] = (len(urls),) + self._measure(client, urls, max(options['repeat'], 1))
+        finally:
+            if options['seed']:
+                self._unseed()
+                # bulk_create() bypassed post_save; drop responses cached with the seeded rows
+                for model in HOME_MODELS:
+                    bump_version(model)
+
+        rtt, bytes_per_ms = options['rtt'], options['kbps'] * 1000 / 8 / 1000
+        self.stdout.write(f"Slow-connection estimate: {rtt:.0f} ms RTT, {options['kbps']:.0f} kbit/s")
+        for label, (requests, queries, cold, warm, size) in results.items():
+            # TCP + TLS 1.3 handshake (2 round trips) and one request wave, plus transfer and server time
+            estimate = 3 * rtt + size / bytes_per_ms + warm
+            self.stdout.write(
+                f'   {label:<11} {requests} request(s)  {queries:3d} queries  {size / 1024:6.1f} KiB  '
+                f'server {cold:6.1f} ms cold / {warm:5.1f} ms warm  ~{estimate:5.0f} ms to first render'
+            )
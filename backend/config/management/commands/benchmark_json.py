@@ -0,0 +1,90 @@
+"""
+Django management command that compares DRF's stdlib JSON renderer and
+parser with the orjson ones (config.renderers, config.parsers).
+
+Usage:
+    python manage.py benchmark_json
+    python manage.py benchmark_json --rows 1000 --repeat 20
+
+Rows are seeded as in benchmark_serialization (and rolled back). Each list
+endpoint is measured twice: one 20-item page as the API returns it, and
+all rows serialized at once. The data is rendered with both renderers and
+the bytes must be identical, or the command fails. The rendered body is
+parsed back with both parsers and the results must be equal too.
+"""
+
+import io
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test import Client, override_settings
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from config.parsers import ORJSONParser
+from config.renderers import ORJSONRenderer
+from .benchmark_serialization import VIEWSETS, Command as SerializationBenchmark
+
+DUMMY_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}
+
+
+def _best(function, repeat):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best * 1000
+
+
+class Command(BaseCommand):
+    help = 'Benchmarks the orjson renderer and parser against the stdlib ones on the list endpoints'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1000, help='Rows to seed per model')
+        parser.add_argument('--repeat', type=int, default=20, help='Runs to take the best time of')
+
+    def _payloads(self, label, viewset_class, seeder):
+        """(description, data) for one page from the API and for every row."""
+        response = Client().get(f'/api/{label}/', HTTP_HOST='localhost')
+        request = Request(APIRequestFactory().get(f'/api/{label}/', HTTP_HOST='localhost'))
+        view = seeder._viewset(viewset_class, request)
+        queryset = view.filter_queryset(view.get_queryset())
+        data = view.get_serializer(queryset, many=True).data
+        return [(f'{label} page', response.data), (f'{label} x{len(data)}', data)]
+
+    def handle(self, *args, **options):
+        rows, repeat = max(options['rows'], 1), max(options['repeat'], 1)
+        stdlib_renderer, fast_renderer = JSONRenderer(), ORJSONRenderer()
+        stdlib_parser, fast_parser = JSONParser(), ORJSONParser()
+        mismatches = []
+        self.stdout.write(f"{'':<22} {'size':>9}  {'render: json':>12} {'orjson':>8}  {'parse: json':>11} {'orjson':>8}")
+        with override_settings(CACHES=DUMMY_CACHE), transaction.atomic():
+            seeder = SerializationBenchmark()
+            seeder._seed(rows)
+            for label, viewset_class in VIEWSETS:
+                for description, data in self._payloads(label, viewset_class, seeder):
+                    expected = stdlib_renderer.render(data)
+                    same = fast_renderer.render(data) == expected
+                    same = same and (
+                        fast_parser.parse(io.BytesIO(expected)) == stdlib_parser.parse(io.BytesIO(expected))
+                    )
+                    if not same:
+                        mismatches.append(description)
+
+                    render_json = _best(lambda: stdlib_renderer.render(data), repeat)
+                    render_orjson = _best(lambda: fast_renderer.render(data), repeat)
+                    parse_json = _best(lambda: stdlib_parser.parse(io.BytesIO(expected)), repeat)
+                    parse_orjson = _best(lambda: fast_parser.parse(io.BytesIO(expected)), repeat)
+                    self.stdout.write(
+                        f"{'✅' if same else '❌'} {description:<20} {len(expected) / 1024:7.1f} KiB  "
+                        f'{render_json:9.2f} ms {render_orjson:5.2f} ms  {parse_json:8.2f} ms {parse_orjson:5.2f} ms'
+                    )
+            transaction.set_rollback(True)
+
+        if mismatches:
+            raise CommandError(f"orjson output differs for: {', '.join(mismatches)}")
@@ -0,0 +1,149 @@
+"""
+Django management command that checks keyset pagination (config.pagination)
+and compares it with page numbers.
+
+Usage:
+    python manage.py benchmark_pagination
+    python manage.py benchmark_pagination --rows 20000 --repeat 5
+
+Bookings, contact messages and newsletter subscribers are seeded inside a
+transaction that is rolled back afterwards. bulk_create gives the rows of
+a batch (nearly) the same created_at, so the id tiebreak is exercised too.
+Each endpoint is walked forward through every 'next' link and back through
+every 'previous' link. Both walks must return every row exactly once, in
+order, or the command fails. Then the first, middle and last page of the
+booking list are timed with PageNumberPagination and KeysetPagination.
+"""
+
+import time
+from datetime import timedelta
+from urllib.parse import parse_qs, urlparse
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test import Client, override_settings
+from django.utils import timezone
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from apps.booking.models import BookingRequest
+from apps.booking.views import BookingRequestViewSet
+from apps.contact.models import ContactMessage, NewsletterSubscriber
+from apps.contact.views import SubscriberPagination
+from apps.services.models import Service
+from config.pagination import KeysetPagination
+
+DUMMY_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}
+
+
+class Command(BaseCommand):
+    help = 'Walks the keyset-paginated endpoints and times deep pages against page numbers'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=5000, help='Rows to seed per model')
+        parser.add_argument('--repeat', type=int, default=5, help='Runs to take the best time of')
+
+    def _seed(self, rows):
+        service = Service.objects.create(
+            name='Benchmark service', category='nails', description='Benchmark', price=35, duration_minutes=30,
+        )
+        day = timezone.localdate() + timedelta(days=365)
+        BookingRequest.objects.bulk_create(
+            (
+                BookingRequest(
+                    customer_name=f'Benchmark customer {index}', customer_email=f'bench{index}@example.com',
+                    customer_phone='+2348000000000', service=service,
+                    preferred_date=day + timedelta(days=index % 60),
+                    preferred_time=BookingRequest.TIME_SLOTS[index % len(BookingRequest.TIME_SLOTS)][0],
+                )
+                for index in range(rows)
+            ),
+            batch_size=500,
+        )
+        ContactMessage.objects.bulk_create(
+            (
+                ContactMessage(
+                    name=f'Benchmark contact {index}', email=f'bench{index}@example.com',
+                    subject='Benchmark', message='Benchmark',
+                )
+                for index in range(rows)
+            ),
+            batch_size=500,
+        )
+        NewsletterSubscriber.objects.bulk_create(
+            (NewsletterSubscriber(email=f'bench{index}@example.com') for index in range(rows)),
+            batch_size=500,
+        )
+
+    def _walk(self, client, url, link):
+        """Ids of every row reached by following `link` ('next' or 'previous'), and the URLs requested."""
+        ids, urls = [], []
+        while url:
+            data = client.get(url, HTTP_HOST='localhost').json()
+            page = [row['id'] for row in data['results']]
+            ids.extend(page if link == 'next' else reversed(page))
+            urls.append(url)
+            url = data[link]
+        return ids, urls
+
+    def _check(self, label, queryset, ordering):
+        """Whether both walks return every row once and in order, and the forward page URLs."""
+        client = Client()
+        expected = list(queryset.order_by(*ordering).values_list('id', flat=True))
+        forward, urls = self._walk(client, f'http://localhost/api/{label}/', 'next')
+        # The last page's 'previous' chain leads back to the first row
+        backward, _ = self._walk(client, urls[-1], 'previous')
+        backward.reverse()
+        ok = forward == expected and backward == expected
+        self.stdout.write(
+            f"{'✅' if ok else '❌'} {label:<11} {len(expected):6d} rows  "
+            f'forward {len(forward):6d}  backward {len(backward):6d}'
+        )
+        return ok, urls
+
+    def _best(self, function, repeat):
+        best = None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            function()
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        return best * 1000
+
+    def _time(self, urls, repeat):
+        """Time the first, middle and last booking page with both paginators."""
+        factory = APIRequestFactory()
+        queryset = BookingRequestViewSet.queryset.all()
+        for name, index in (('first', 0), ('middle', len(urls) // 2), ('last', len(urls) - 1)):
+            numbered = Request(factory.get('/api/booking/', {'page': index + 1}, HTTP_HOST='localhost'))
+            cursor = parse_qs(urlparse(urls[index]).query).get('cursor')
+            keyed = Request(
+                factory.get('/api/booking/', {'cursor': cursor[0]} if cursor else {}, HTTP_HOST='localhost')
+            )
+
+            page_number = self._best(lambda: PageNumberPagination().paginate_queryset(queryset, numbered), repeat)
+            keyset = self._best(lambda: KeysetPagination().paginate_queryset(queryset, keyed), repeat)
+            self.stdout.write(
+                f'   booking {name:<6} page {index + 1:5d}  page number {page_number:7.2f} ms  keyset {keyset:6.2f} ms'
+            )
+
+    def handle(self, *args, **options):
+        rows, repeat = max(options['rows'], 1), max(options['repeat'], 1)
+        failures, walked = [], {}
+        with override_settings(CACHES=DUMMY_CACHE, QUERY_BUDGET_STRICT=False), transaction.atomic():
+            self._seed(rows)
+            checks = [
+                ('booking', BookingRequest.objects.all(), KeysetPagination.ordering),
+                ('contact', ContactMessage.objects.all(), KeysetPagination.ordering),
+                ('newsletter', NewsletterSubscriber.objects.filter(is_active=True), SubscriberPagination.ordering),
+            ]
+            for label, queryset, ordering in checks:
+                ok, walked[label] = self._check(label, queryset, ordering)
+                if not ok:
+                    failures.append(label)
+            self._time(walked['booking'], repeat)
+            transaction.set_rollback(True)
+
+        if failures:
+            raise CommandError(f"Keyset pagination skipped or repeated rows for: {', '.join(failures)}")
@@ -0,0 +1,162 @@
+"""
+Django management command that compares the fast list path (config.fastlist)
+with the DRF serializers, for output and speed.
+
+Usage:
+    python manage.py benchmark_serialization
+    python manage.py benchmark_serialization --rows 1000 --repeat 5
+
+Rows are seeded for services, gallery images, testimonials and bookings
+inside a transaction that is rolled back afterwards. For each list endpoint
+the same filtered, ordered queryset is serialized both ways: model
+instances through the viewset's serializer, and .values_list() rows
+through its ValuesPlan. The rendered JSON must be byte-for-byte identical,
+or the command fails. Each list is checked again with a ?fields= sparse
+fieldset, whose queryset loads only the selected columns. Times cover the
+query and the serialization, per 1,000 rows.
+"""
+
+import time
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from apps.booking.models import BookingRequest
+from apps.booking.views import BookingRequestViewSet
+from apps.gallery.models import GalleryImage
+from apps.gallery.views import GalleryImageViewSet
+from apps.services.models import Service
+from apps.services.views import ServiceViewSet
+from apps.testimonials.models import Testimonial
+from apps.testimonials.views import TestimonialViewSet
+from config.fastlist import get_plan
+
+VIEWSETS = [
+    ('services', ServiceViewSet),
+    ('gallery', GalleryImageViewSet),
+    ('testimonials', TestimonialViewSet),
+    ('booking', BookingRequestViewSet),
+]
+
+# Each list is also checked with a sparse fieldset (config.fieldsets)
+SPARSE_FIELDS = {
+    'services': 'id,name,price,image',
+    'gallery': 'id,title,srcsets',
+    'testimonials': 'id,client_name,rating,stars_display',
+    'booking': 'id,customer_name,preferred_date,preferred_time,service.name',
+}
+
+
+def _manifest(field, name):
+    return {field: {'source': name, 'width': 2000, 'height': 1500, 'formats': {
+        image_format: [
+            {'width': width, 'height': width * 3 // 4, 'name': f'renditions/bench/{name}-{width}.{image_format}'}
+            for width in (480, 960)
+        ]
+        for image_format in ('avif', 'webp')
+    }}}
+
+
+class Command(BaseCommand):
+    help = 'Checks the fast list path against the DRF serializers and times both'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1000, help='Rows to seed per model')
+        parser.add_argument('--repeat', type=int, default=3, help='Runs to take the best time of')
+
+    def _seed(self, rows):
+        services = Service.objects.bulk_create(
+            Service(
+                name=f'Benchmark service {index}', category=('nails', 'lashes', 'both')[index % 3],
+                description='Benchmark ' * 10, price=Decimal('35.5') + index, duration_minutes=30 + index % 4 * 45,
+                image=f'services/bench-{index}.jpg' if index % 2 else None,
+                second_image=f'services/bench-{index}-b.jpg' if index % 3 == 2 else None,
+                renditions=_manifest('image', f'services/bench-{index}.jpg') if index % 4 == 1 else {},
+                processing_status='skipped',
+            )
+            for index in range(rows)
+        )
+        GalleryImage.objects.bulk_create(
+            GalleryImage(
+                title=f'Benchmark image {index}', category=('nails', 'lashes', 'before_after')[index % 3],
+                image=f'gallery/bench-{index}.jpg',
+                comparison_image=f'gallery/bench-{index}-after.jpg' if index % 3 == 2 else '',
+                thumbnail=f'gallery/thumbnails/bench-{index}.jpg' if index % 2 else '',
+                renditions=_manifest('image', f'gallery/bench-{index}.jpg') if index % 2 else {},
+                sort_order=index % 5, is_featured=index % 7 == 0, processing_status='skipped',
+            )
+            for index in range(rows)
+        )
+        Testimonial.objects.bulk_create(
+            Testimonial(
+                client_name=f'Benchmark client {index}', service_category=('nails', 'lashes', 'both')[index % 3],
+                rating=index % 5 + 1, review_text='Benchmark ' * 15,
+                client_photo=f'testimonials/bench-{index}.jpg' if index % 4 == 0 else None,
+            )
+            for index in range(rows)
+        )
+        day = timezone.localdate() + timedelta(days=365)
+        BookingRequest.objects.bulk_create(
+            BookingRequest(
+                customer_name=f'Benchmark customer {index}', customer_email=f'bench{index}@example.com',
+                customer_phone='+2348000000000', service=services[index % len(services)],
+                preferred_date=day + timedelta(days=index % 60),
+                preferred_time=BookingRequest.TIME_SLOTS[index % len(BookingRequest.TIME_SLOTS)][0],
+            )
+            for index in range(rows)
+        )
+
+    def _viewset(self, viewset_class, request):
+        view = viewset_class(request=request, format_kwarg=None, action='list', args=(), kwargs={})
+        view.headers = {}
+        return view
+
+    def _best(self, function, repeat):
+        best, result = None, None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            result = function()
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        return best, result
+
+    def handle(self, *args, **options):
+        rows, repeat = max(options['rows'], 1), max(options['repeat'], 1)
+        renderer = JSONRenderer()
+        mismatches = []
+        with transaction.atomic():
+            self._seed(rows)
+            for label, viewset_class in VIEWSETS:
+                for params in ({}, {'fields': SPARSE_FIELDS[label]}):
+                    name = f'{label} ?fields=' if params else label
+                    request = Request(APIRequestFactory().get(f'/api/{label}/', params, HTTP_HOST='localhost'))
+                    view = self._viewset(viewset_class, request)
+                    queryset = view.filter_queryset(view.get_queryset())
+                    plan = get_plan(view.get_serializer())
+                    if plan is None:
+                        self.stdout.write(f'⚠️  {name}: serializer has no fast plan')
+                        continue
+
+                    slow, expected = self._best(lambda: view.get_serializer(queryset.all(), many=True).data, repeat)
+                    fast, actual = self._best(
+                        lambda: plan.serialize(queryset.values_list(*plan.columns), request), repeat
+                    )
+                    count = len(expected)
+                    same = renderer.render(expected) == renderer.render(actual)
+                    if not same:
+                        mismatches.append(name)
+                    self.stdout.write(
+                        f"{'✅' if same else '❌'} {name:<22} {count:6d} rows  "
+                        f'serializer {slow * 1000 / count * 1000:7.1f} ms  fast {fast * 1000 / count * 1000:7.1f} ms'
+                        f'  per 1,000 rows  ({slow / fast:.1f}x)'
+                    )
+            transaction.set_rollback(True)
+
+        if mismatches:
+            raise CommandError(f"Fast list output differs for: {', '.join(mismatches)}")
@@ -0,0 +1,130 @@
+"""
+Django management command that fires parallel booking requests at one slot
+and checks exactly one of them wins.
+
+Usage:
+    python manage.py check_booking_concurrency
+    python manage.py check_booking_concurrency --threads 40
+
+Needs PostgreSQL: the check proves the BookingDay row lock taken by
+apps.booking.availability.lock_day, and select_for_update() is a no-op on
+SQLite, so the command refuses to run anywhere else.
+
+The threads share one barrier and POST /api/booking/ at the same moment,
+each on its own database connection. Two rounds run on free days about ten
+years out: every thread on the same slot, then threads split between two
+slots whose appointments overlap. Each round must return one 201 and 409s
+for the rest, and leave one booking in the database. The notification
+emails of the winners are not queued. The service, bookings and day rows
+created are deleted afterwards, so point it at a development database.
+"""
+
+import threading
+from datetime import timedelta
+from unittest import mock
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.test import Client, override_settings
+from django.utils import timezone
+
+from apps.booking import views
+from apps.booking.models import BookingDay, BookingRequest
+from apps.services.models import Service
+
+DUMMY_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}
+# Far enough out that real bookings won't be there
+DAYS_AHEAD = 3650
+
+
+class Command(BaseCommand):
+    help = 'Checks that parallel bookings for one slot (PostgreSQL only) give exactly one 201 and 409s for the rest'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=20, help='Parallel requests per round')
+
+    def _free_days(self, count):
+        """The first `count` days from DAYS_AHEAD on with no bookings and no lock row."""
+        days, day = [], timezone.localdate() + timedelta(days=DAYS_AHEAD)
+        while len(days) < count:
+            if not BookingRequest.objects.filter(preferred_date=day).exists() and \
+                    not BookingDay.objects.filter(date=day).exists():
+                days.append(day)
+            day += timedelta(days=1)
+        return days
+
+    def _fire(self, service, day, slots, threads):
+        """POST one booking per thread, all at once; return the response status codes."""
+        barrier = threading.Barrier(threads)
+        statuses = [None] * threads
+
+        def post(index):
+            try:
+                # Errors come back as 500s instead of being raised in the thread
+                client = Client(raise_request_exception=False)
+                barrier.wait()
+                response = client.post(
+                    '/api/booking/',
+                    {
+                        'customer_name': f'Concurrency check {index}',
+                        'customer_email': f'concurrency{index}@example.com',
+                        'customer_phone': '+2348000000000',
+                        'service_id': service.pk,
+                        'preferred_date': day.isoformat(),
+                        'preferred_time': slots[index % len(slots)],
+                    },
+                    content_type='application/json',
+                    HTTP_HOST='localhost',
+                )
+                statuses[index] = response.status_code
+            except Exception as e:
+                statuses[index] = type(e).__name__
+            finally:
+                # Each thread opened its own connection
+                connections.close_all()
+
+        workers = [threading.Thread(target=post, args=(index,)) for index in range(threads)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        return statuses
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError(
+                f'select_for_update() is a no-op on {connection.vendor}, so this check would prove nothing; '
+                'run it against PostgreSQL.'
+            )
+        threads = max(options['threads'], 2)
+        first, second = BookingRequest.TIME_SLOTS[0][0], BookingRequest.TIME_SLOTS[1][0]
+        # Long enough that an appointment at the first slot runs into the second
+        service = Service.objects.create(
+            name='Concurrency check', category='nails', description='Concurrency check', price=35,
+            duration_minutes=90,
+        )
+        days = self._free_days(2)
+        rounds = [('same slot', days[0], [first]), ('overlapping', days[1], [first, second])]
+        failures = []
+        try:
+            with override_settings(CACHES=DUMMY_CACHE, QUERY_BUDGET_STRICT=False), \
+                    mock.patch.object(views, 'queue_booking_notification'):
+                for label, day, slots in rounds:
+                    statuses = self._fire(service, day, slots, threads)
+                    created = BookingRequest.objects.filter(service=service, preferred_date=day).count()
+                    won, conflicts = statuses.count(201), statuses.count(409)
+                    ok = won == 1 and conflicts == threads - 1 and created == 1
+                    others = sorted({code for code in statuses if code not in (201, 409)}, key=str)
+                    self.stdout.write(
+                        f"{'✅' if ok else '❌'} {label:<12} {threads:3d} requests  {won:3d} × 201  "
+                        f"{conflicts:3d} × 409  {created:3d} booked" + (f'  other: {others}' if others else '')
+                    )
+                    if not ok:
+                        failures.append(label)
+        finally:
+            BookingRequest.objects.filter(service=service).delete()
+            service.delete()
+            BookingDay.objects.filter(date__in=days).delete()
+
+        if failures:
+            raise CommandError(f"Parallel bookings didn't serialize: {', '.join(failures)}")
@@ -0,0 +1,171 @@
+"""
+Django management command that checks ResendEmailBackend's batch sending
+against a local stand-in for the Resend API (config.resend_stub).
+
+Usage:
+    python manage.py check_email_batching
+    python manage.py check_email_batching --messages 1000
+
+Each scenario sends through a fresh opened backend and checks what the stub
+received and what was recorded on each message:
+
+    batching     emails without attachments go to /emails/batch, at most
+                 BATCH_SIZE per request; emails with attachments are sent
+                 on their own to /emails
+    ids          every message gets back the id of its own email, in
+                 request order
+    fallback     a batch rejected with a 4xx outside REQUEST_ERRORS is sent
+                 one email at a time, so only the bad email fails
+    request      a batch rejected with a REQUEST_ERRORS status (429) fails
+                 every email without retrying them one by one
+    short        a batch answer with fewer results than emails marks every
+                 email failed
+"""
+
+import logging
+
+from django.core.mail import EmailMessage
+from django.core.management.base import BaseCommand, CommandError
+
+from config.email_backends import BATCH_SIZE, REQUEST_ERRORS, ResendEmailBackend
+from config.resend_stub import StubResendServer, default_response, message_id
+
+BAD_RECIPIENT = 'bad@example.com'
+
+
+def _messages(count, attachments=0, bad=False):
+    messages = [
+        EmailMessage('Batch check', 'Body', 'noreply@example.com', [f'client{index}@example.com'])
+        for index in range(count)
+    ]
+    for index in range(attachments):
+        message = EmailMessage('Batch check', 'Body', 'noreply@example.com', [f'attached{index}@example.com'])
+        message.attach('note.txt', 'Attachment', 'text/plain')
+        messages.append(message)
+    if bad:
+        messages.insert(len(messages) // 2, EmailMessage('Batch check', 'Body', 'noreply@example.com', [BAD_RECIPIENT]))
+    return messages
+
+
+def _reject_batches(status):
+    def respond(path, payload):
+        if path == '/emails/batch':
+            return status, {'message': 'Rejected'}
+        if payload['to'] == [BAD_RECIPIENT]:
+            return 422, {'message': f'Invalid `to` field: {BAD_RECIPIENT}'}
+        return default_response(path, payload)
+    return respond
+
+
+def _short_batches(path, payload):
+    status, result = default_response(path, payload)
+    if path == '/emails/batch':
+        result['data'] = result['data'][:-1]
+    return status, result
+
+
+def _sent_ids(messages):
+    return [getattr(message, 'resend_id', None) for message in messages]
+
+
+class Command(BaseCommand):
+    help = 'Checks ResendEmailBackend batch grouping, id mapping and error fallbacks against a stub server'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--messages', type=int, default=250, help='Emails without attachments in the batching run')
+
+    def _run(self, stub, messages, responder=None, fail_silently=True):
+        """Send `messages` through a fresh opened backend; return (sent, error)."""
+        stub.reset(responder)
+        backend = ResendEmailBackend(api_key='test', api_url=stub.url, fail_silently=fail_silently)
+        with backend:
+            try:
+                return backend.send_messages(messages), None
+            except Exception as e:
+                return 0, e
+
+    def _batching(self, stub, count):
+        attachments = 2
+        messages = _messages(count, attachments=attachments)
+        sent, _error = self._run(stub, messages)
+        sizes = [len(payload) for path, payload in stub.requests if path == '/emails/batch']
+        singles = [payload for path, payload in stub.requests if path == '/emails']
+        expected = [min(BATCH_SIZE, count - start) for start in range(0, count, BATCH_SIZE)]
+        ok = (
+            sent == count + attachments and sizes == expected
+            and len(singles) == attachments and all('attachments' in payload for payload in singles)
+            and all('attachments' not in email for path, payload in stub.requests if path == '/emails/batch'
+                    for email in payload)
+        )
+        return ok, f'{sent} sent, batches {sizes}, {len(singles)} sent alone'
+
+    def _ids(self, stub, count):
+        messages = _messages(count, attachments=1)
+        self._run(stub, messages)
+        expected = [message_id({'to': message.to}) for message in messages]
+        return _sent_ids(messages) == expected, f'{sum(1 for id in _sent_ids(messages) if id)} ids mapped'
+
+    def _fallback(self, stub):
+        status = 422
+        messages = _messages(5, bad=True)
+        sent, _error = self._run(stub, messages, _reject_batches(status))
+        bad = [message for message in messages if message.to == [BAD_RECIPIENT]]
+        good = [message for message in messages if message.to != [BAD_RECIPIENT]]
+        ok = (
+            sent == len(good) and stub.paths() == ['/emails/batch'] + ['/emails'] * len(messages)
+            and all(getattr(message, 'resend_id', None) for message in good)
+            and not getattr(bad[0], 'resend_id', None) and getattr(bad[0], 'send_error', None) is not None
+        )
+        # Without fail_silently the good emails still go out before the failure is raised
+        messages = _messages(5, bad=True)
+        _sent, error = self._run(stub, messages, _reject_batches(status), fail_silently=False)
+        ok = ok and error is not None and sum(1 for id in _sent_ids(messages) if id) == len(good)
+        return ok, f'{status}: {sent} of {len(messages)} sent one by one'
+
+    def _request_error(self, stub):
+        status = REQUEST_ERRORS[-1]
+        messages = _messages(5)
+        sent, _error = self._run(stub, messages, _reject_batches(status))
+        ok = (
+            sent == 0 and stub.paths() == ['/emails/batch']
+            and not any(_sent_ids(messages))
+            and all(getattr(message, 'send_error', None) is not None for message in messages)
+        )
+        return ok, f'{status}: {sent} sent, requests {stub.paths()}'
+
+    def _short(self, stub):
+        messages = _messages(5)
+        sent, _error = self._run(stub, messages, _short_batches)
+        ok = (
+            sent == 0 and not any(_sent_ids(messages))
+            and all(getattr(message, 'send_error', None) is not None for message in messages)
+        )
+        return ok, f'{len(messages) - 1} results for {len(messages)} emails: {sent} sent'
+
+    def handle(self, *args, **options):
+        count = max(options['messages'], 2)
+        failures = []
+        logger = logging.getLogger('config.email_backends')
+        level = logger.level
+        if options['verbosity'] < 2:
+            # The error scenarios log every failure with a traceback
+            logger.setLevel(logging.CRITICAL)
+        try:
+            with StubResendServer() as stub:
+                scenarios = [
+                    ('batching', lambda: self._batching(stub, count)),
+                    ('ids', lambda: self._ids(stub, count)),
+                    ('fallback', lambda: self._fallback(stub)),
+                    ('request', lambda: self._request_error(stub)),
+                    ('short', lambda: self._short(stub)),
+                ]
+                for label, scenario in scenarios:
+                    ok, detail = scenario()
+                    self.stdout.write(f"{'✅' if ok else '❌'} {label:<9} {detail}")
+                    if not ok:
+                        failures.append(label)
+        finally:
+            logger.setLevel(level)
+
+        if failures:
+            raise CommandError(f"Batch sending misbehaved in: {', '.join(failures)}")
@@ -0,0 +1,78 @@
+"""
+Django management command that checks ResendEmailBackend keeps one
+keep-alive connection open for its lifetime.
+
+Usage:
+    python manage.py check_email_connections
+    python manage.py check_email_connections --messages 50
+
+Sends go to a local stand-in for the Resend API (config.resend_stub) that
+counts the TCP connections it accepts. --messages single-message
+send_messages() calls through one opened backend must arrive over exactly
+one connection. The same calls through a backend that isn't opened first
+open and close a session per call, so they use one connection each; that
+run shows the checker would notice a connection per email.
+"""
+
+import logging
+
+from django.core.mail import EmailMessage
+from django.core.management.base import BaseCommand, CommandError
+
+from config.email_backends import ResendEmailBackend
+from config.resend_stub import StubResendServer
+
+
+class Command(BaseCommand):
+    help = 'Checks that ResendEmailBackend reuses one keep-alive connection between open() and close()'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--messages', type=int, default=20, help='Emails to send per run')
+
+    def _send(self, backend, count):
+        sent = 0
+        for index in range(count):
+            message = EmailMessage(
+                'Connection check', 'Body', 'noreply@example.com', [f'client{index}@example.com'],
+            )
+            sent += backend.send_messages([message])
+        return sent
+
+    def _report(self, label, ok, stub, sent, expected_connections):
+        self.stdout.write(
+            f"{'✅' if ok else '❌'} {label:<16} {sent:4d} sent  {len(stub.requests):4d} requests  "
+            f'{stub.connections:4d} connections (expected {expected_connections})'
+        )
+        return ok
+
+    def handle(self, *args, **options):
+        count = max(options['messages'], 2)
+        failures = []
+        logger = logging.getLogger('config.email_backends')
+        level = logger.level
+        if options['verbosity'] < 2:
+            logger.setLevel(logging.WARNING)
+        try:
+            with StubResendServer() as stub:
+                backend = ResendEmailBackend(api_key='test', api_url=stub.url)
+                opened = backend.open()
+                reopened = backend.open()
+                try:
+                    sent = self._send(backend, count)
+                finally:
+                    backend.close()
+                ok = opened and not reopened and backend.session is None
+                ok = ok and sent == count and len(stub.requests) == count and stub.connections == 1
+                if not self._report('open()/close()', ok, stub, sent, 1):
+                    failures.append('open()/close()')
+
+                stub.reset()
+                sent = self._send(ResendEmailBackend(api_key='test', api_url=stub.url), count)
+                ok = sent == count and stub.connections == count
+                if not self._report('not opened', ok, stub, sent, count):
+                    failures.append('not opened')
+        finally:
+            logger.setLevel(level)
+
+        if failures:
+            raise CommandError(f"Unexpected connection use: {', '.join(failures)}")
@@ -0,0 +1,148 @@
+"""
+Django management command that checks every API endpoint against its query budget.
+
+Usage:
+    python manage.py check_query_budgets             # 25 seeded rows per model
+    python manage.py check_query_budgets --rows 50
+
+Rows for all five apps are seeded inside a transaction that is rolled back
+afterwards. Each endpoint is then requested once with response caching
+off, so the numbers are those of a cache miss. An endpoint fails when it
+runs more queries than its view's query_budget, or repeats one statement
+QUERY_BUDGET_DUPLICATE_THRESHOLD times (an N+1 loop grows with --rows,
+a budget doesn't). Endpoints without a budget are reported but never fail.
+"""
+
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test import Client, override_settings
+from django.urls import resolve
+from django.utils import timezone
+
+from apps.booking.models import BookingRequest
+from apps.contact.models import ContactMessage, NewsletterSubscriber
+from apps.gallery.models import GalleryImage
+from apps.services.models import Service
+from apps.testimonials.models import Testimonial
+from config.querybudget import QueryStats, get_budget
+
+DUMMY_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}
+
+
+class Command(BaseCommand):
+    help = 'Requests every API endpoint with seeded data and checks it against its query budget'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=25, help='Rows to seed per model')
+
+    def _seed(self, rows):
+        services = Service.objects.bulk_create(
+            Service(
+                name=f'Budget service {index}', category='nails', description='Budget check',
+                price=Decimal('35.00'), duration_minutes=30, is_featured=index % 2 == 0,
+            )
+            for index in range(rows)
+        )
+        GalleryImage.objects.bulk_create(
+            GalleryImage(
+                title=f'Budget image {index}', category='nails', image=f'gallery/budget-{index}.jpg',
+                is_featured=index % 2 == 0, processing_status='skipped',
+            )
+            for index in range(rows)
+        )
+        Testimonial.objects.bulk_create(
+            Testimonial(
+                client_name=f'Budget client {index}', service_category='nails', rating=5,
+                review_text='Budget check', is_approved=True,
+            )
+            for index in range(rows)
+        )
+        # Far enough ahead that the seeded bookings never clash with real ones
+        day = timezone.localdate() + timedelta(days=365)
+        BookingRequest.objects.bulk_create(
+            BookingRequest(
+                customer_name=f'Budget customer {index}', customer_email=f'budget{index}@example.com',
+                customer_phone='+2348000000000', service=services[index % len(services)],
+                preferred_date=day + timedelta(days=index), preferred_time='10:00',
+            )
+            for index in range(rows)
+        )
+        ContactMessage.objects.bulk_create(
+            ContactMessage(
+                name=f'Budget contact {index}', email=f'budget{index}@example.com',
+                subject='Budget check', message='Budget check',
+            )
+            for index in range(rows)
+        )
+        NewsletterSubscriber.objects.bulk_create(
+            NewsletterSubscriber(email=f'budget{index}@example.com') for index in range(rows)
+        )
+        return services[0], day
+
+    def _requests(self, service, day):
+        """(method, path, data) for each endpoint."""
+        service_id = service.pk
+        return [
+            ('get', '/api/home/', None),
+            ('get', '/api/services/', None),
+            ('get', '/api/services/?fields=id,name,price,image', None),
+            ('get', f'/api/services/{service_id}/', None),
+            ('get', '/api/gallery/', None),
+            ('get', f'/api/gallery/{GalleryImage.objects.values_list("pk", flat=True).first()}/', None),
+            ('get', '/api/testimonials/', None),
+            ('post', '/api/testimonials/', {
+                'client_name': 'Budget client', 'service_category': 'nails', 'rating': 5, 'review_text': 'Budget check',
+            }),
+            ('get', '/api/booking/', None),
+            ('get', '/api/booking/?fields=id,preferred_date,service.name', None),
+            ('get', f'/api/booking/{BookingRequest.objects.values_list("pk", flat=True).first()}/', None),
+            ('get', f'/api/booking/availability/?service_id={service_id}&start={day.isoformat()}', None),
+            ('post', '/api/booking/', {
+                'customer_name': 'Budget customer', 'customer_email': 'budget@example.com',
+                'customer_phone': '+2348000000000', 'service_id': service_id,
+                'preferred_date': (day - timedelta(days=1)).isoformat(), 'preferred_time': '10:00',
+            }),
+            ('get', '/api/contact/', None),
+            ('post', '/api/contact/', {
+                'name': 'Budget contact', 'email': 'budget@example.com', 'subject': 'Budget check',
+                'message': 'Budget check',
+            }),
+            ('get', '/api/newsletter/', None),
+            ('post', '/api/newsletter/', {'email': 'budget-new@example.com'}),
+        ]
+
+    def handle(self, *args, **options):
+        rows = max(options['rows'], 1)
+        client = Client()
+        failures = []
+        with override_settings(CACHES=DUMMY_CACHE, QUERY_BUDGET_STRICT=False), transaction.atomic():
+            service, day = self._seed(rows)
+            for method, path, data in self._requests(service, day):
+                budget = get_budget(resolve(path.split('?')[0]).func, method)
+                stats = QueryStats()
+                with stats.record():
+                    if data is None:
+                        response = getattr(client, method)(path, HTTP_HOST='localhost')
+                    else:
+                        response = getattr(client, method)(
+                            path, data, content_type='application/json', HTTP_HOST='localhost',
+                        )
+                duplicates = stats.duplicates()
+                ok = response.status_code < 400 and not duplicates and (budget is None or stats.count <= budget)
+                if not ok and budget is not None:
+                    failures.append(f'{method.upper()} {path}')
+                icon = '✅' if ok else ('⚠️ ' if budget is None else '❌')
+                self.stdout.write(
+                    f"{icon} {method.upper():<4} {path:<60} {response.status_code}  "
+                    f"{stats.count:3d} queries (budget {budget if budget is not None else '-'})"
+                    f"  {stats.duration * 1000:6.1f} ms"
+                )
+                for sql, count in duplicates.items():
+                    self.stdout.write(f'       {count}x {sql[:200]}')
+            transaction.set_rollback(True)
+
+        if failures:
+            raise CommandError(f"{len(failures)} endpoints over budget: {', '.join(failures)}")
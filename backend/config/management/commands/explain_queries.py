@@ -0,0 +1,93 @@
+"""
+Django management command that checks the API's hot queries use their indexes.
+
+Usage:
+    python manage.py explain_queries             # one line per query
+    python manage.py explain_queries --verbose   # also print each plan
+
+Each query is built the way its view builds it and run through EXPLAIN.
+The command fails when a plan doesn't name the index the query was given,
+so it can run after migrations in CI. On PostgreSQL sequential scans are
+disabled for the check: with a handful of rows the planner rightly prefers
+them, and the question here is whether the index can serve the query.
+"""
+
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from apps.booking.models import BookingRequest
+from apps.contact.models import ContactMessage, NewsletterSubscriber
+from apps.gallery.models import GalleryImage
+from apps.services.models import Service
+from apps.testimonials.models import Testimonial
+from config.pagination import keyset_filter
+
+
+def hot_queries():
+    """(label, queryset, expected index) for each query the public pages and admin run most."""
+    today = timezone.localdate()
+    services = Service.objects.filter(is_active=True)
+    gallery = GalleryImage.objects.filter(is_active=True).order_by('-sort_order', '-is_featured', '-created_at')
+    testimonials = Testimonial.objects.filter(is_approved=True).order_by('-is_featured', '-rating', '-created_at')
+    # A keyset page past the first, as KeysetPagination filters it
+    key = ('-created_at', '-id')
+    after = keyset_filter(key, (timezone.now(), 1))
+    subscribers = NewsletterSubscriber.objects.filter(is_active=True).order_by('-subscribed_at', '-id')
+    return [
+        ('services', services.order_by('category', 'name'), 'service_active_idx'),
+        ('services ?category=', services.filter(category='nails').order_by('category', 'name'), 'service_active_idx'),
+        ('services featured', services.filter(is_featured=True).order_by('category', 'name'), 'service_featured_idx'),
+        ('gallery', gallery, 'gallery_active_idx'),
+        ('gallery ?category=', gallery.filter(category='nails'), 'gallery_category_idx'),
+        ('gallery featured', gallery.filter(is_featured=True), 'gallery_featured_idx'),
+        ('testimonials', testimonials, 'testimonial_approved_idx'),
+        ('testimonials ?service_category=', testimonials.filter(service_category='nails'), 'testimonial_category_idx'),
+        ('testimonials featured', testimonials.filter(is_featured=True), 'testimonial_approved_idx'),
+        (
+            'booking availability',
+            BookingRequest.objects.filter(
+                preferred_date__in=[today + timedelta(days=offset) for offset in range(7)],
+                status__in=BookingRequest.ACTIVE_STATUSES,
+            ).order_by().values_list('preferred_date', 'preferred_time', 'service__duration_minutes'),
+            'booking_slot_idx',
+        ),
+        ('bookings', BookingRequest.objects.order_by(*key)[:21], 'booking_keyset_idx'),
+        ('bookings ?cursor=', BookingRequest.objects.filter(after).order_by(*key)[:21], 'booking_keyset_idx'),
+        ('contact messages', ContactMessage.objects.order_by(*key)[:21], 'contact_keyset_idx'),
+        ('contact messages ?cursor=', ContactMessage.objects.filter(after).order_by(*key)[:21], 'contact_keyset_idx'),
+        ('subscribers', subscribers[:21], 'subscriber_keyset_idx'),
+        (
+            'subscribers ?cursor=',
+            subscribers.filter(keyset_filter(('-subscribed_at', '-id'), (timezone.now(), 1)))[:21],
+            'subscriber_keyset_idx',
+        ),
+        ('unread messages', ContactMessage.objects.filter(is_read=False).order_by('-created_at')[:20], 'contact_unread_idx'),
+    ]
+
+
+class Command(BaseCommand):
+    help = 'Runs EXPLAIN on the hot API queries and fails if one does not use its index'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--verbose', action='store_true', help='Print each query plan')
+
+    def handle(self, *args, **options):
+        failures = []
+        with transaction.atomic():
+            if connection.vendor == 'postgresql':
+                with connection.cursor() as cursor:
+                    cursor.execute('SET LOCAL enable_seqscan = off')
+            for label, queryset, index in hot_queries():
+                plan = queryset.explain()
+                used = index in plan
+                if not used:
+                    failures.append(label)
+                self.stdout.write(f"{'✅' if used else '❌'} {label:<32} {index}")
+                if options['verbose']:
+                    self.stdout.write('    ' + plan.replace('\n', '\n    '))
+
+        if failures:
+            raise CommandError(f"{len(failures)} queries don't use their index: {', '.join(failures)}")
@@ -0,0 +1,182 @@
+"""
+Production serving of locally stored media (used when Cloudinary isn't configured).
+
+Compared with django.views.static.serve:
+
+- Content-hashed names (see config.storage) are sent with a one-year
+  `Cache-Control: public, immutable`, so browsers and CDNs never revalidate
+  them. Older unhashed names get MEDIA_CACHE_MAX_AGE and revalidate with
+  ETag/Last-Modified (304).
+- Single byte ranges (`Range: bytes=...`, honouring If-Range) get a 206.
+- Bodies are FileResponses: gunicorn hands them to sendfile() instead of
+  copying the file through Python.
+- With MEDIA_ACCEL_REDIRECT_PREFIX set, the view only answers with an
+  `X-Accel-Redirect` header and nginx sends the file (including ranges and
+  conditional requests) without holding a gunicorn thread:
+
+      location /protected-media/ {
+          internal;
+          alias /app/media/;
+      }
+"""
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, parse_http_date_safe
+from django.views.decorators.http import require_safe
+
+from .storage import is_hashed_name
+
+IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+# Not in every system's mime.types
+mimetypes.add_type('image/avif', '.avif')
+mimetypes.add_type('image/webp', '.webp')
+
+
+def parse_range(header, size):
+    """
+    Return (start, end) (inclusive) for a single-range `Range` header.
+
+    Returns None when the header should be ignored and the whole file sent
+    (missing, malformed or multi-range), and raises ValueError when the
+    range can't be satisfied.
+    """
+    match = RANGE_RE.match(header.strip()) if header else None
+    if not match or match.groups() == ('', ''):
+        return None
+    first, last = match.groups()
+    if first:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+        if last and int(last) < start:
+            return None
+    else:
+        # Suffix range: the last N bytes
+        start, end = max(size - int(last), 0), size - 1
+        if int(last) == 0:
+            raise ValueError('Empty suffix range')
+    if start >= size:
+        raise ValueError('Range starts past the end of the file')
+    return start, end
+
+
+class RangeFile:
+    """
+    Read at most `length` bytes of an open file from its current position.
+
+    fileno() is exposed so gunicorn can still sendfile() the range (it
+    starts at the file's position and stops at Content-Length).
+    """
+
+    def __init__(self, file, length):
+        self.file = file
+        self.remaining = length
+
+    def read(self, size=-1):
+        if size is None or size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size) if size else b''
+        self.remaining -= len(data)
+        return data
+
+    def fileno(self):
+        return self.file.fileno()
+
+    def close(self):
+        self.file.close()
+
+
+def _if_range_matches(request, etag, mtime):
+    """True when a Range request may be honoured (no If-Range, or it names the current file)."""
+    if_range = request.META.get('HTTP_IF_RANGE')
+    if not if_range:
+        return True
+    if if_range.startswith('"') or if_range.startswith('W/'):
+        return if_range == etag
+    since = parse_http_date_safe(if_range)
+    return since is not None and int(mtime) <= since
+
+
+def _cache_headers(response, path):
+    if is_hashed_name(path):
+        patch_cache_control(response, public=True, max_age=IMMUTABLE_MAX_AGE, immutable=True)
+    else:
+        patch_cache_control(response, public=True, max_age=settings.MEDIA_CACHE_MAX_AGE)
+    return response
+
+
+def _accel_redirect(path, content_type):
+    response = HttpResponse(content_type=content_type)
+    response['X-Accel-Redirect'] = settings.MEDIA_ACCEL_REDIRECT_PREFIX.rstrip('/') + '/' + quote(path)
+    return _cache_headers(response, path)
+
+
+@require_safe
+def serve_media(request, path, document_root=None):
+    """Serve a file from MEDIA_ROOT with immutable caching, Range support and optional nginx offload."""
+    document_root = document_root or settings.MEDIA_ROOT
+    path = path.lstrip('/')
+    try:
+        fullpath = safe_join(document_root, path)
+    except SuspiciousFileOperation:
+        raise Http404('Invalid path')
+
+    content_type, encoding = mimetypes.guess_type(fullpath)
+    content_type = content_type or 'application/octet-stream'
+    if settings.MEDIA_ACCEL_REDIRECT_PREFIX:
+        return _accel_redirect(path, content_type)
+
+    try:
+        stat = os.stat(fullpath)
+    except (FileNotFoundError, NotADirectoryError):
+        raise Http404('File not found')
+    if not os.path.isfile(fullpath):
+        raise Http404('File not found')
+
+    size = stat.st_size
+    etag = f'"{int(stat.st_mtime):x}-{size:x}"'
+    response = get_conditional_response(request, etag=etag, last_modified=int(stat.st_mtime))
+    if response is not None:
+        return _cache_headers(response, path)
+
+    byte_range = None
+    if _if_range_matches(request, etag, stat.st_mtime):
+        try:
+            byte_range = parse_range(request.META.get('HTTP_RANGE'), size)
+        except ValueError:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{size}'
+            return response
+
+    if request.method == 'HEAD':
+        response = HttpResponse(content_type=content_type)
+    elif byte_range:
+        start, end = byte_range
+        file = open(fullpath, 'rb')
+        file.seek(start)
+        response = FileResponse(RangeFile(file, end - start + 1), content_type=content_type)
+    else:
+        response = FileResponse(open(fullpath, 'rb'), content_type=content_type)
+
+    if byte_range:
+        start, end = byte_range
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+        response['Content-Length'] = end - start + 1
+        response.status_code = 206
+    else:
+        response['Content-Length'] = size
+    if encoding:
+        response['Content-Encoding'] = encoding
+    response['Accept-Ranges'] = 'bytes'
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(stat.st_mtime)
+    return _cache_headers(response, path)
@@ -0,0 +1,132 @@
+"""
+Keyset pagination for the tables that only grow.
+
+PageNumberPagination runs a COUNT(*) and then skips OFFSET rows on every
+page, so both get slower as bookings, messages and subscribers pile up.
+KeysetPagination orders by a unique key, (created_at, id) by default, and
+turns the cursor into a WHERE on that key. Every page is then one indexed
+range read of page_size + 1 rows, however deep it is. There is no count:
+responses carry only 'next', 'previous' and 'results'.
+
+Cursors are DRF's opaque base64 tokens, holding the key of the last row of
+the page they came from (the first row, for 'previous' links). Rows added
+or deleted while a client pages never shift the pages it hasn't read yet.
+"""
+from base64 import b64decode
+from urllib import parse
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import Cursor, CursorPagination
+from rest_framework.utils.urls import remove_query_param
+
+
+def _reverse(ordering):
+    return tuple(order[1:] if order.startswith('-') else f'-{order}' for order in ordering)
+
+
+def keyset_filter(ordering, position):
+    """
+    Q for the rows after `position` in `ordering`, e.g. for ('-created_at', '-id'):
+    created_at <= c AND (created_at < c OR (created_at = c AND id < i)).
+    """
+    condition, equal = Q(), {}
+    for order, value in zip(ordering, position):
+        name = order.lstrip('-')
+        condition |= Q(**equal, **{f"{name}__{'lt' if order.startswith('-') else 'gt'}": value})
+        equal[name] = value
+    # The bound on the leading column alone is what the index range scan uses
+    first = ordering[0]
+    return Q(**{f"{first.lstrip('-')}__{'lte' if first.startswith('-') else 'gte'}": position[0]}) & condition
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Cursor pagination on a unique key, without offsets or a count.
+
+    `ordering` must end with a unique field, and should match an index.
+    """
+
+    ordering = ('-created_at', '-id')
+
+    @property
+    def key_fields(self):
+        """The key's field names. FastListMixin appends them to its .values_list() columns."""
+        return tuple(order.lstrip('-') for order in self.ordering)
+
+    def get_ordering(self, request, queryset, view):
+        # The key has to stay unique, so ?ordering= filters don't apply
+        return tuple(self.ordering)
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+        try:
+            tokens = parse.parse_qs(b64decode(encoded.encode('ascii')).decode('ascii'), keep_blank_values=True)
+            reverse = bool(int(tokens.get('r', ['0'])[0]))
+            position = tokens['p']
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+        if len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return Cursor(offset=0, reverse=reverse, position=position)
+
+    def _position(self, item):
+        if isinstance(item, tuple):
+            # .values_list() rows from FastListMixin end with the key columns
+            values = item[-len(self.ordering):]
+        else:
+            values = [getattr(item, name) for name in self.key_fields]
+        return [str(value) for value in values]
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+        reverse = self.cursor is not None and self.cursor.reverse
+        ordering = _reverse(self.ordering) if reverse else self.ordering
+
+        queryset = queryset.order_by(*ordering)
+        if self.cursor is not None:
+            try:
+                position = [
+                    queryset.model._meta.get_field(name).to_python(value)
+                    for name, value in zip(self.key_fields, self.cursor.position)
+                ]
+            except ValidationError:
+                raise NotFound(self.invalid_cursor_message)
+            queryset = queryset.filter(keyset_filter(ordering, position))
+
+        # One extra row tells whether there is a page beyond this one
+        results = list(queryset[:self.page_size + 1])
+        self.page = results[:self.page_size]
+        has_more = len(results) > self.page_size
+        if reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, self.cursor is not None
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        if not self.page:
+            # Paged back past the first row: start over from the top
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(Cursor(offset=0, reverse=False, position=self._position(self.page[-1])))
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        position = self._position(self.page[0]) if self.page else self.cursor.position
+        return self.encode_cursor(Cursor(offset=0, reverse=True, position=position))
@@ -0,0 +1,36 @@
+"""
+orjson-backed JSON parser for DRF (see config.renderers).
+
+Bodies orjson rejects are handed to rest_framework's JSONParser. That
+covers NaN/Infinity when STRICT_JSON is off, and gives invalid JSON the
+same ParseError message as before.
+
+One difference remains: orjson reads integers that don't fit in 64 bits as
+floats where the stdlib keeps them exact. The API's request bodies are
+small forms with no such numbers, and scanning every body for long digit
+runs would cost more than the parse itself.
+"""
+import io
+
+import orjson
+from rest_framework.parsers import JSONParser
+
+from .renderers import ORJSONRenderer
+
+
+class ORJSONParser(JSONParser):
+    """Drop-in JSONParser using orjson for UTF-8 bodies."""
+
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', 'utf-8')
+        if encoding.lower().replace('_', '-') not in ('utf-8', 'utf8'):
+            return super().parse(stream, media_type, parser_context)
+
+        body = stream.read()
+        try:
+            return orjson.loads(body)
+        except orjson.JSONDecodeError:
+            return super().parse(io.BytesIO(body), media_type, parser_context)
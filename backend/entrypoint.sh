@@ -48,6 +48,10 @@ fi
 echo "🔄 Running migrations..."
 python manage.py migrate --noinput
 
+# Create the database cache table (no-op for other cache backends)
+echo "🗄️  Creating cache table..."
+python manage.py createcachetable
+
 # Collect static files (in case buildCommand didn't work)
 echo "📦 Collecting static files..."
 python manage.py collectstatic --noinput || echo "⚠️  Static files collection failed (may not be critical)"
@@ -57,6 +61,20 @@ python manage.py collectstatic --noinput || echo "⚠️  Static files collectio
 echo "👤 Checking for superuser creation..."
 python manage.py create_superuser_from_env || echo "⚠️  Superuser creation skipped (env vars not set or already exists)"
 
+# Start the email outbox worker alongside the web process
+# Set RUN_OUTBOX_WORKER=false when the worker runs as a separate service
+if [ "${RUN_OUTBOX_WORKER:-true}" = "true" ]; then
+  echo "📬 Starting email outbox worker..."
+  python manage.py process_outbox &
+fi
+
+# Start the gallery image worker (thumbnails are generated off the request path)
+# Set RUN_IMAGE_WORKER=false when the worker runs as a separate service
+if [ "${RUN_IMAGE_WORKER:-true}" = "true" ]; then
+  echo "🖼️  Starting gallery image worker..."
+  python manage.py process_gallery_images &
+fi
+
 echo "🎯 Starting Gunicorn..."
 exec "$@"
 
@@ -27,7 +27,9 @@ const Booking = () => {
   useEffect(() => {
     const fetchServices = async () => {
       try {
-        const response = await servicesAPI.getAll();
+        const response = await servicesAPI.getFields([
+          'id', 'name', 'category', 'price', 'duration_minutes', 'image', 'second_image',
+        ]);
         setServices(response.data.results || response.data);
       } catch (error) {
         console.error('Error fetching services:', error);
@@ -141,7 +141,25 @@ const Gallery = () => {
                 <div key={image.id} className="masonry-item slide-up" style={{ animationDelay: `${index * 50}ms` }}>
                   <div className="card overflow-hidden group cursor-pointer hover:shadow-xl transition-all duration-300" onClick={() => openLightbox(index)}>
                     <div className="aspect-w-4 aspect-h-5 bg-gray-200">
-                      {image.category === 'before_after' && image.comparison_image ? (
+                      {image.category === 'before_after' && image.composite ? (
+                        // Before & After: one pre-rendered side-by-side image
+                        <div className="relative h-64">
+                          <div className="absolute top-2 left-2 z-10 bg-black bg-opacity-50 text-white px-2 py-1 rounded text-xs font-semibold">Before</div>
+                          <div className="absolute top-2 right-2 z-10 bg-black bg-opacity-50 text-white px-2 py-1 rounded text-xs font-semibold">After</div>
+                          <img
+                            src={image.composite}
+                            srcSet={image.srcsets?.composite?.webp}
+                            sizes="(min-width: 768px) 33vw, 100vw"
+                            alt={`${image.title} - Before and After`}
+                            loading="lazy"
+                            className="w-full h-full object-cover group-hover:scale-105 transition-transform duration-300"
+                            onError={(e) => {
+                              e.target.srcset = '';
+                              e.target.src = image.image || '/api/placeholder/400/500';
+                            }}
+                          />
+                        </div>
+                      ) : image.category === 'before_after' && image.comparison_image ? (
                         // Before & After: Show both images side by side
                         <div className="flex h-64">
                           <div className="flex-1 relative">
@@ -1,7 +1,7 @@
 import React, { useState, useEffect } from 'react';
 import { Link } from 'react-router-dom';
 import { FaArrowRight, FaStar, FaQuoteLeft, FaInstagram, FaTiktok, FaWhatsapp } from 'react-icons/fa';
-import { servicesAPI, testimonialsAPI, galleryAPI } from '../services/apiClient';
+import { homeAPI } from '../services/apiClient';
 import NewsletterSignup from '../components/NewsletterSignup';
 
 const Home = () => {
@@ -14,15 +14,11 @@ const Home = () => {
   useEffect(() => {
     const fetchData = async () => {
       try {
-        const [servicesRes, testimonialsRes, galleryRes] = await Promise.all([
-          servicesAPI.getFeatured(),
-          testimonialsAPI.getFeatured(),
-          galleryAPI.getFeatured()
-        ]);
+        const { data } = await homeAPI.get();
 
-        setFeaturedServices(servicesRes.data.results || servicesRes.data);
-        setFeaturedTestimonials(testimonialsRes.data.results || testimonialsRes.data);
-        setFeaturedGallery(galleryRes.data.results || galleryRes.data);
+        setFeaturedServices(data.services);
+        setFeaturedTestimonials(data.testimonials);
+        setFeaturedGallery(data.gallery);
       } catch (error) {
         console.error('Error fetching data:', error);
         // Set mock data for development
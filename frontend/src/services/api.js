@@ -16,6 +16,9 @@ export const API_ENDPOINTS = {
   
   // Gallery
   GALLERY: `${API_BASE_URL}/gallery/`,
+
+  // Home page bundle
+  HOME: `${API_BASE_URL}/home/`,
 };
 
 export default API_ENDPOINTS;
@@ -40,6 +40,8 @@ export const servicesAPI = {
   getAll: () => api.get(API_ENDPOINTS.SERVICES),
   getByCategory: (category) => api.get(`${API_ENDPOINTS.SERVICES}?category=${category}`),
   getFeatured: () => api.get(`${API_ENDPOINTS.SERVICES}?is_featured=true`),
+  // Sparse fieldset: only these keys are sent (and loaded)
+  getFields: (fields) => api.get(`${API_ENDPOINTS.SERVICES}?fields=${fields.join(',')}`),
 };
 
 // Booking API
@@ -71,4 +73,9 @@ export const galleryAPI = {
   getFeatured: () => api.get(`${API_ENDPOINTS.GALLERY}?is_featured=true`),
 };
 
+// Home page API: featured services, testimonials and gallery in one request
+export const homeAPI = {
+  get: () => api.get(API_ENDPOINTS.HOME),
+};
+
 export default api;